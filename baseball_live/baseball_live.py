@@ -1,46 +1,262 @@
 #!/usr/bin/env python3
+# statsapi, arrow and tabulate are imported where they are used: together
+# they take longer to import than the rest of the program needs to start.
 from dataclasses import dataclass
-import statsapi
-import arrow
-from tabulate import tabulate
-from dataclasses import dataclass
-from typing import Union, Tuple, Dict
+from typing import Union, Tuple, Dict, List, Sequence, Callable, Any
 from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect, bisect_left
+import datetime
+
+from baseball_live.metrics import METRICS
+
+REQUEST_TIMEOUT = 10  # seconds
+SCHEDULE_HYDRATE = "probablePitcher,linescore"
+# strike zone edges (ft): the plate is 17 in wide, the ball 0.12 ft in radius
+# and calls within 0.08 ft of an edge are a margin of error (MOE)
+PLATE_HALF_WIDTH = 0.75
+PLATE_EDGE = 0.91
+ZONE_EDGE = 0.12 + 0.08
+# detailedState prefixes of games that haven't started / are over
+PREVIEW_STATES = ("Scheduled", "Pre-Game", "Delayed Start")
+FINAL_STATES = (
+    "Final",
+    "Game Over",
+    "Completed Early",
+    "Postponed",
+    "Cancelled",
+    "Suspended",
+)
+
+
+def api_get(endpoint: str, params: dict) -> Union[dict, list]:
+    """Calls a StatsAPI endpoint like statsapi.get, through the pooled,
+    compressed and retrying HttpTransport shared by the whole process.
+
+    Args:
+        endpoint (str): StatsAPI endpoint name, e.g. "game" or "game_diff".
+        params (dict): Path and query parameters for the endpoint.
+    """
+    from baseball_live.transport import shared_transport
+
+    return shared_transport().get(endpoint, params)
+
+
+def schedule_game_state(status: str) -> str:
+    """Maps a schedule entry's detailed status to a game state.
+
+    Args:
+        status (str): The "status" of a statsapi.schedule entry.
+
+    Returns:
+        'Preview', 'In progress' or 'Final' like
+        BaseballSchedule.check_game_state.
+    """
+    if status.startswith(PREVIEW_STATES):
+        return "Preview"
+    elif status.startswith(FINAL_STATES):
+        return "Final"
+    else:
+        return "In progress"
+
+
+def first_pitch_time(game: dict) -> float:
+    """Scheduled start of a schedule entry, as a POSIX timestamp.
+
+    Args:
+        game (dict): A game as returned by schedule_games.
+    """
+    start = datetime.datetime.strptime(game["game_datetime"], "%Y-%m-%dT%H:%M:%SZ")
+    return start.replace(tzinfo=datetime.timezone.utc).timestamp()
+
+
+def stats_hydrate(group: str, season: Union[int, None] = None) -> str:
+    """The "hydrate" parameter adding a player's season stats of group
+    (e.g. "hitting" or "hitting,pitching") and current team.
+    """
+    season_param = f",season={season}" if season else ""
+    return f"stats(group=[{group}],type=season{season_param},sportId=1),currentTeam"
+
+
+def schedule_games(schedule: dict) -> List[dict]:
+    """Flattens a "schedule" endpoint response into one dict per game.
+
+    The keys are the ones statsapi.schedule uses, so schedules fetched
+    through any get function look the same as before.
+
+    Args:
+        schedule (dict): Response of the "schedule" endpoint.
+    """
+    games = []
+    for date in schedule.get("dates", []):
+        for game in date.get("games", []):
+            away = game["teams"]["away"]
+            home = game["teams"]["home"]
+            linescore = game.get("linescore", {})
+            pitcher = linescore.get("defense", {}).get("pitcher", {})
+            games.append(
+                {
+                    "game_id": game["gamePk"],
+                    "game_datetime": game["gameDate"],
+                    "game_date": date["date"],
+                    "game_type": game.get("gameType"),
+                    "status": game["status"]["detailedState"],
+                    "away_name": away["team"].get("name", "???"),
+                    "home_name": home["team"].get("name", "???"),
+                    "away_id": away["team"]["id"],
+                    "home_id": home["team"]["id"],
+                    "away_probable_pitcher": away.get("probablePitcher", {}).get(
+                        "fullName", ""
+                    ),
+                    "home_probable_pitcher": home.get("probablePitcher", {}).get(
+                        "fullName", ""
+                    ),
+                    "away_score": away.get("score", 0),
+                    "home_score": home.get("score", 0),
+                    "current_inning": linescore.get("currentInning", ""),
+                    "inning_state": linescore.get("inningState", ""),
+                    "outs": linescore.get("outs", 0),
+                    "current_pitcher": pitcher.get("fullName", ""),
+                }
+            )
+    return games
+
+
+def player_stat_data(person: dict) -> dict:
+    """Flattens a "person" endpoint response hydrated with stats.
+
+    Same layout as statsapi.player_stat_data: the player's names and a
+    "stats" list with one entry per type, group and season.
+
+    Args:
+        person (dict): Response of the "person" endpoint.
+    """
+    p = person["people"][0]
+    stats = [
+        {
+            "type": s["type"]["displayName"],
+            "group": s["group"]["displayName"],
+            "season": split.get("season"),
+            "stats": split["stat"],
+        }
+        for s in p.get("stats", [])
+        for split in s["splits"]
+    ]
+    return {
+        "id": p["id"],
+        "first_name": p.get("useName", p.get("firstName", "")),
+        "last_name": p.get("lastName", ""),
+        "current_team": p.get("currentTeam", {}).get("name"),
+        "position": p.get("primaryPosition", {}).get("abbreviation"),
+        "stats": stats,
+    }
 
 
 class BaseballSchedule:
     """Class for baseball schedule today.
 
     Attributes:
-        schedule (dict): Schedule returned by statsapi.schedule method.
+        schedule (list): Games of the day, see schedule_games.
+        response (dict): The "schedule" response the games come from.
         timezone (str): Optional argument to set timezone
         (default: "US/Eastern").
     """
 
-    def __init__(self, timezone="US/Eastern"):
-        """Initialization for BaseballSchedule with optional timezone argument."""
-        self.schedule = statsapi.schedule()
+    def __init__(
+        self,
+        timezone="US/Eastern",
+        get: Callable[[str, dict], Any] = api_get,
+        response: Union[dict, None] = None,
+    ):
+        """Initialization for BaseballSchedule with optional timezone argument
+        and StatsAPI get function. The schedule is fetched unless an already
+        downloaded response is given.
+        """
+        if response is None:
+            response = get("schedule", {"sportId": 1, "hydrate": SCHEDULE_HYDRATE})
+        self.response = response
+        self.schedule = schedule_games(response)
         self.timezone = timezone
 
     def games_today(self) -> str:
         """Generates a tabulated string of baseball games today."""
+        from tabulate import tabulate
+
         table = [["ID", "Away", "Home", "Time"]]
         for i, game in enumerate(self.schedule):
-            date = arrow.get(game["game_datetime"])
-            date_local = date.to(self.timezone)
-            time = date_local.datetime.strftime("%H:%M")
+            time = self._local_time(game)
             table.append([i + 1, game["away_name"], game["home_name"], time])
 
         return tabulate(table, headers="firstrow")
 
-    def boxscore(self, gamePk: int) -> str:
-        return statsapi.boxscore(gamePk=gamePk)
+    def scoreboard(self) -> str:
+        """Generates a tabulated scoreboard of baseball games today.
+
+        Like games_today, with the score, inning and outs of games in
+        progress and who is pitching, all read from the schedule's
+        linescores, so a whole slate takes a single request to refresh.
+        """
+        from tabulate import tabulate
+
+        table = [["ID", "Away", "R", "Home", "R", "Status", "Pitching"]]
+        for i, game in enumerate(self.schedule):
+            state = schedule_game_state(game["status"])
+            score = ["", ""]
+            if state == "Preview":
+                status = self._local_time(game)
+                pitching = " - ".join(
+                    filter(
+                        None,
+                        (game["away_probable_pitcher"], game["home_probable_pitcher"]),
+                    )
+                )
+            else:
+                score = [game["away_score"], game["home_score"]]
+                if state == "Final":
+                    status, pitching = game["status"], ""
+                else:
+                    status = (
+                        f"{game['inning_state']} {game['current_inning']}"
+                        f", {game['outs']} out"
+                    )
+                    pitching = game["current_pitcher"]
+            table.append(
+                [i + 1, game["away_name"], score[0], game["home_name"], score[1]]
+                + [status, pitching]
+            )
+
+        return tabulate(table, headers="firstrow")
+
+    def _local_time(self, game: dict) -> str:
+        import arrow
+
+        date = arrow.get(game["game_datetime"])
+        return date.to(self.timezone).datetime.strftime("%H:%M")
+
+    def games_in_progress(self) -> List[dict]:
+        """Games from the schedule that are currently being played."""
+        return [
+            game
+            for game in self.schedule
+            if schedule_game_state(game["status"]) == "In progress"
+        ]
 
     def input_to_id(self) -> str:
         """A user defined input to choose game ID from games_today."""
         gameid = input("Choose game ID:")
         return gameid
 
+    def id_to_game(self, game_id: str) -> dict:
+        """Converts game ID to its schedule entry.
+
+        Args:
+            game_id (str or int): Game ID relative to games_today.
+
+        Returns:
+            The game, see schedule_games.
+        """
+        return self.schedule[(int(game_id) - 1)]
+
     def id_to_gamepk(self, game_id: str) -> int:
         """Converts game ID to gamePk.
 
@@ -50,29 +266,31 @@ class BaseballSchedule:
         Returns:
             The gamePk.
         """
-        gamePk = self.schedule[(int(game_id) - 1)]["game_id"]
+        gamePk = self.id_to_game(game_id)["game_id"]
         return gamePk
 
     @staticmethod
-    def check_game_state(gamePk: int) -> str:
+    def check_game_state(gamePk: int, get: Callable[[str, dict], Any] = api_get) -> str:
         """Checks the current game state to see if the game has started,
         in progress, or finished.
 
+        Only the game's schedule entry is requested, not its live feed.
+
         Args:
             gamePk (int): The gamePk to check the current game state.
+            get (callable): StatsAPI get function (default: api_get).
 
         Returns:
             'Preview' if game did not start yet, 'In progress' if the game is
             in progress, or 'Final' if the game finished.
+
+        Raises:
+            LookupError: If the game is not scheduled.
         """
-        game = statsapi.get("game", {"gamePk": gamePk})
-        status = game["gameData"]["status"]
-        if status["abstractGameState"] == "Preview":
-            return "Preview"
-        elif status["abstractGameState"] == "Final":
-            return "Final"
-        else:
-            return "In progress"
+        games = schedule_games(get("schedule", {"gamePk": gamePk}))
+        if not games:
+            raise LookupError(f"Game {gamePk} is not scheduled")
+        return schedule_game_state(games[0]["status"])
 
 
 @dataclass
@@ -83,224 +301,624 @@ class BaseballPitchData:
         The __len__ retrieves the number of pitches within the dataclass.
 
     Attributes:
-        pitch_speed (list): Pitch speeds (mph).
-        sz_top (list): Top of strike zone (ft).
-        sz_bottom (list): Bottom of strike zone (ft).
-        px (list): Horizontal location of pitch 0 is centre of plate (ft).
-        px (list): Vertical location of pitch 0 is ground (ft).
+        pitch_speed (array): Pitch speeds (mph).
+        sz_top (array): Top of strike zone (ft).
+        sz_bottom (array): Bottom of strike zone (ft).
+        px (array): Horizontal location of pitch 0 is centre of plate (ft).
+        px (array): Vertical location of pitch 0 is ground (ft).
         pitch_type (list): Pitch type given in two letter pitch code.
 
     """
 
-    pitch_speed: list
-    sz_top: list
-    sz_bottom: list
-    pX: list
-    pZ: list
-    pitch_type: list
+    pitch_speed: Sequence[float]
+    sz_top: Sequence[float]
+    sz_bottom: Sequence[float]
+    pX: Sequence[float]
+    pZ: Sequence[float]
+    pitch_type: Sequence[str]
+
+    def __len__(self):
+        return len(self.pitch_speed)
+
+
+class PitchStore:
+    """Append-only columnar store of every pitch seen in a game.
+
+    Each column is a typed array indexed by row, so consumers can read
+    contiguous buffers. A pitch is identified by (atBatIndex, pitchNumber)
+    and is only appended once, the first time it arrives with pitchData.
+    Rows are indexed by at-bat, pitcher, batter, inning and pitch type, each
+    index a list of rows in the order they were stored.
+
+    Attributes:
+        pitch_speed (array): Pitch speeds (mph).
+        sz_top (array): Top of strike zone (ft).
+        sz_bottom (array): Bottom of strike zone (ft).
+        pX (array): Horizontal location of pitch 0 is centre of plate (ft).
+        pZ (array): Vertical location of pitch 0 is ground (ft).
+        pitch_type_id (array): Index into type_codes.
+        at_bat_index (array): atBatIndex of the play the pitch belongs to.
+        pitch_number (array): pitchNumber within the at-bat.
+        pitcher_id (array): Id of the pitcher who threw the pitch.
+        batter_id (array): Id of the batter it was thrown to.
+        inning (array): Inning it was thrown in.
+        type_codes (list): Two letter pitch codes, indexed by pitch_type_id.
+    """
+
+    def __init__(self):
+        """Initialize an empty PitchStore."""
+        self.pitch_speed = array("d")
+        self.sz_top = array("d")
+        self.sz_bottom = array("d")
+        self.pX = array("d")
+        self.pZ = array("d")
+        self.pitch_type_id = array("H")
+        self.at_bat_index = array("l")
+        self.pitch_number = array("H")
+        self.pitcher_id = array("l")
+        self.batter_id = array("l")
+        self.inning = array("H")
+        self.type_codes: List[str] = []
+        self._type_ids: Dict[str, int] = {}
+        self._seen = set()
+        self._at_bat_rows: Dict[int, List[int]] = {}
+        self._pitcher_rows: Dict[int, List[int]] = {}
+        self._batter_rows: Dict[int, List[int]] = {}
+        self._inning_rows: Dict[int, List[int]] = {}
+        self._type_rows: Dict[int, List[int]] = {}
+        self._next_play = 0
 
     def __len__(self):
         return len(self.pitch_speed)
 
+    def type_id(self, code: str) -> int:
+        """The id for a pitch type code, registering new codes."""
+        type_id = self._type_ids.get(code)
+        if type_id is None:
+            type_id = len(self.type_codes)
+            self.type_codes.append(code)
+            self._type_ids[code] = type_id
+        return type_id
+
+    def add_plays(self, plays: Sequence[dict]) -> int:
+        """Appends the pitches of a game's plays that are not stored yet.
+
+        Plays are only read from the first one that was still in progress
+        at the previous call, so the cost depends on the new plays and
+        pitches, not on the length of the game.
+
+        Args:
+            plays (list): liveData.plays.allPlays.
+
+        Returns:
+            The number of pitches appended.
+        """
+        added = 0
+        for i in range(min(self._next_play, len(plays)), len(plays)):
+            play = plays[i]
+            added += self.add_play(play)
+            if i == self._next_play and play.get("about", {}).get("isComplete"):
+                self._next_play = i + 1
+        return added
+
+    def add_play(self, play: dict) -> int:
+        """Appends the pitches of a play that are not stored yet.
+
+        Args:
+            play (dict): A play from liveData.plays (e.g. currentPlay).
+
+        Returns:
+            The number of pitches appended.
+        """
+        about = play.get("about", {})
+        at_bat_index = about.get("atBatIndex")
+        if at_bat_index is None:
+            return 0
+        matchup = play.get("matchup", {})
+        pitcher_id = matchup.get("pitcher", {}).get("id", -1)
+        batter_id = matchup.get("batter", {}).get("id", -1)
+        inning = about.get("inning", 0)
+        added = 0
+        for event in play.get("playEvents", ()):
+            if not event.get("isPitch") or "pitchData" not in event:
+                continue
+            key = (at_bat_index, event.get("pitchNumber", event.get("index")))
+            if key in self._seen:
+                continue
+            pitch_data = event["pitchData"]
+            try:
+                row = (
+                    pitch_data["startSpeed"],
+                    pitch_data["strikeZoneTop"],
+                    pitch_data["strikeZoneBottom"],
+                    pitch_data["coordinates"]["pX"],
+                    pitch_data["coordinates"]["pZ"],
+                    event["details"]["type"]["code"],
+                )
+            except KeyError:
+                # incomplete pitches are picked up once their data arrives
+                continue
+            self._append(key, *row, pitcher_id, batter_id, inning)
+            added += 1
+        return added
+
+    def _append(
+        self,
+        key: Tuple[int, int],
+        pitch_speed: float,
+        sz_top: float,
+        sz_bottom: float,
+        pX: float,
+        pZ: float,
+        code: str,
+        pitcher_id: int,
+        batter_id: int,
+        inning: int,
+    ):
+        row = len(self.pitch_speed)
+        type_id = self.type_id(code)
+        self.pitch_speed.append(pitch_speed)
+        self.sz_top.append(sz_top)
+        self.sz_bottom.append(sz_bottom)
+        self.pX.append(pX)
+        self.pZ.append(pZ)
+        self.pitch_type_id.append(type_id)
+        self.at_bat_index.append(key[0])
+        self.pitch_number.append(key[1])
+        self.pitcher_id.append(pitcher_id)
+        self.batter_id.append(batter_id)
+        self.inning.append(inning)
+        self._seen.add(key)
+        # keep each at-bat's rows in pitch order
+        rows = self._at_bat_rows.setdefault(key[0], [])
+        numbers = [self.pitch_number[r] for r in rows]
+        rows.insert(bisect(numbers, key[1]), row)
+        self._pitcher_rows.setdefault(pitcher_id, []).append(row)
+        self._batter_rows.setdefault(batter_id, []).append(row)
+        self._inning_rows.setdefault(inning, []).append(row)
+        self._type_rows.setdefault(type_id, []).append(row)
+
+    def rows(
+        self,
+        pitcher_id: Union[int, None] = None,
+        batter_id: Union[int, None] = None,
+        inning: Union[int, None] = None,
+        pitch_type: Union[str, None] = None,
+        until: Union[int, None] = None,
+    ) -> List[int]:
+        """Rows of the pitches matching every key given, in stored order.
+
+        Args:
+            pitcher_id (int): Thrown by this pitcher.
+            batter_id (int): Thrown to this batter.
+            inning (int): Thrown in this inning.
+            pitch_type (str): Of this two letter pitch code.
+            until (int): Only rows below this one, e.g. len(store) back when
+            a snapshot was taken.
+        """
+        type_id = None
+        if pitch_type is not None:
+            type_id = self._type_ids.get(pitch_type, -1)
+        indexes = [
+            (index.get(key, []), column, key)
+            for index, column, key in (
+                (self._pitcher_rows, self.pitcher_id, pitcher_id),
+                (self._batter_rows, self.batter_id, batter_id),
+                (self._inning_rows, self.inning, inning),
+                (self._type_rows, self.pitch_type_id, type_id),
+            )
+            if key is not None
+        ]
+        if not indexes:
+            rows = range(len(self))
+        else:
+            # walk the shortest index, check the other keys on their columns
+            indexes.sort(key=lambda index: len(index[0]))
+            rows = indexes[0][0]
+            checks = [(column, key) for _, column, key in indexes[1:]]
+            if checks:
+                rows = [r for r in rows if all(col[r] == key for col, key in checks)]
+        if until is not None:
+            rows = rows[: bisect_left(rows, until)]
+        return list(rows)
+
+    def pitches(self, rows: List[int]) -> Union[BaseballPitchData, None]:
+        """Pitch data for the given rows, or None if there are none."""
+        if not rows:
+            return None
+        if rows == list(range(rows[0], rows[-1] + 1)):
+            window = slice(rows[0], rows[-1] + 1)
+            columns = [
+                column[window]
+                for column in (
+                    self.pitch_speed,
+                    self.sz_top,
+                    self.sz_bottom,
+                    self.pX,
+                    self.pZ,
+                )
+            ]
+        else:
+            columns = [
+                array("d", (column[r] for r in rows))
+                for column in (
+                    self.pitch_speed,
+                    self.sz_top,
+                    self.sz_bottom,
+                    self.pX,
+                    self.pZ,
+                )
+            ]
+        codes = [self.type_codes[self.pitch_type_id[r]] for r in rows]
+        return BaseballPitchData(*columns, codes)
+
+    def at_bat(self, at_bat_index: int) -> Union[BaseballPitchData, None]:
+        """Pitch data for one at-bat, or None if none of its pitches are stored."""
+        return self.pitches(self._at_bat_rows.get(at_bat_index))
+
+    def pitcher(
+        self, pitcher_id: int, until: Union[int, None] = None
+    ) -> Union[BaseballPitchData, None]:
+        """Every pitch a pitcher threw this game (below row until)."""
+        return self.pitches(self.rows(pitcher_id=pitcher_id, until=until))
+
+    def batter(
+        self, batter_id: int, until: Union[int, None] = None
+    ) -> Union[BaseballPitchData, None]:
+        """Every pitch thrown to a batter this game (below row until)."""
+        return self.pitches(self.rows(batter_id=batter_id, until=until))
+
+
+def _last_event(play: dict) -> Union[dict, None]:
+    events = play.get("playEvents")
+    if not events:
+        return None
+    return events[-1]
+
+
+def _expected_call(pitch: Union[dict, None]) -> Union[str, None]:
+    if pitch is None:
+        return None
+    try:
+        pX = pitch["coordinates"]["pX"]
+        pZ = pitch["coordinates"]["pZ"]
+        sz_top = pitch["strikeZoneTop"]
+        sz_bottom = pitch["strikeZoneBottom"]
+    except KeyError:
+        return None
+    return zone_call(pX, pZ, sz_top, sz_bottom)
+
+
+def zone_call(pX: float, pZ: float, sz_top: float, sz_bottom: float) -> str:
+    """Expected call of a pitch irrespective of the umpire's call.
+
+    Args:
+        pX (float): Horizontal location, 0 is centre of plate (ft).
+        pZ (float): Vertical location, 0 is ground (ft).
+        sz_top (float): Top of the batter's strike zone (ft).
+        sz_bottom (float): Bottom of the batter's strike zone (ft).
+
+    Returns:
+        'Strike', 'Ball', or 'MOE' when the ball is within the margin of
+        error of the zone's edge.
+    """
+    if abs(pX) <= PLATE_HALF_WIDTH:
+        X_strike = 1
+    elif abs(pX) <= PLATE_EDGE:
+        X_strike = 0.5
+    else:
+        return "Ball"
+
+    if pZ >= sz_bottom and pZ <= sz_top:
+        Y_strike = 1
+    elif pZ >= (sz_bottom - ZONE_EDGE) and pZ <= (sz_top + ZONE_EDGE):
+        Y_strike = 0.5
+    else:
+        return "Ball"
+
+    if (X_strike + Y_strike) == 2:
+        return "Strike"
+    else:
+        return "MOE"
+
+
+@dataclass(frozen=True)
+class LiveSnapshot:
+    """Immutable view of a live feed, derived once per fetch.
+
+    Note:
+        Only the current play is kept from the feed, so the rest of the
+        game document can be released as soon as the snapshot is built.
+
+    Attributes:
+        gamePk (int): The gamePk.
+        timecode (str): The feed's metaData.timeStamp.
+        game_state (str): abstractGameState (Preview, Live or Final).
+        detailed_state (str): detailedState, e.g. "In Progress" or "Delayed".
+        inning_state (str): linescore inningState, e.g. "Top" or "Middle".
+        current_play (dict): liveData.plays.currentPlay.
+        count (dict): Count after the most recent event.
+        batter (str): Current batter's full name.
+        batter_id (int): Current batter's id.
+        pitcher (str): Current pitcher's full name.
+        pitcher_id (int): Current pitcher's id.
+        pitch (dict): pitchData of the most recent pitch.
+        call (str): Description of the most recent call.
+        pitch_type (dict): Type of the most recent pitch.
+        expected_call (str): Strike, Ball or MOE for the most recent pitch.
+        atbat_result (str): Description of the at-bat result.
+        pitch_data (BaseballPitchData): Pitches of the current at-bat.
+        inning (str): Current inning and half.
+        score (tuple): Current score (away-home).
+        pitch_rows (int): Pitches in the store when the snapshot was taken,
+        the until for its lookups.
+        upcoming_batter_ids (tuple): Ids of the batters on deck and in the
+        hole, then of the first two due up in the next half inning (the
+        fielding team's, read from linescore defense). Hitters only, the
+        feed doesn't say which reliever is warming up.
+    """
+
+    __slots__ = (
+        "gamePk",
+        "timecode",
+        "game_state",
+        "detailed_state",
+        "inning_state",
+        "current_play",
+        "count",
+        "batter",
+        "batter_id",
+        "pitcher",
+        "pitcher_id",
+        "pitch",
+        "call",
+        "pitch_type",
+        "expected_call",
+        "atbat_result",
+        "pitch_data",
+        "inning",
+        "score",
+        "pitch_rows",
+        "upcoming_batter_ids",
+    )
+
+    gamePk: int
+    timecode: Union[str, None]
+    game_state: Union[str, None]
+    detailed_state: Union[str, None]
+    inning_state: Union[str, None]
+    current_play: dict
+    count: Union[dict, None]
+    batter: Union[str, None]
+    batter_id: Union[int, None]
+    pitcher: Union[str, None]
+    pitcher_id: Union[int, None]
+    pitch: Union[dict, None]
+    call: Union[str, None]
+    pitch_type: Union[dict, None]
+    expected_call: Union[str, None]
+    atbat_result: Union[str, None]
+    pitch_data: Union[BaseballPitchData, None]
+    inning: Union[str, None]
+    score: Tuple[int, int]
+    pitch_rows: int
+    upcoming_batter_ids: Tuple[int, ...]
+
+    @classmethod
+    def from_game(
+        cls, gamePk: int, game: dict, store: Union[PitchStore, None] = None
+    ) -> "LiveSnapshot":
+        """Derives a snapshot from a game feed returned by the game endpoint.
+
+        Args:
+            gamePk (int): The gamePk.
+            game (dict): The game feed.
+            store (PitchStore): Optional store kept across fetches, the new
+            pitches of all the game's plays are appended to it. Without one
+            only the current play's pitches are read.
+        """
+        status = game.get("gameData", {}).get("status", {})
+        live_data = game.get("liveData", {})
+        play = live_data.get("plays", {}).get("currentPlay") or {}
+        linescore = live_data.get("linescore", {})
+        matchup = play.get("matchup", {})
+        batter = matchup.get("batter", {})
+        pitcher = matchup.get("pitcher", {})
+
+        last = _last_event(play)
+        count = pitch = call = pitch_type = None
+        if last is not None:
+            count = last.get("count")
+            pitch = last.get("pitchData")
+            if "details" in last:
+                call = last["details"].get("description")
+                pitch_type = last["details"].get("type")
+
+        if store is None:
+            store = PitchStore()
+        else:
+            store.add_plays(live_data.get("plays", {}).get("allPlays", ()))
+        store.add_play(play)
+        pitch_data = store.at_bat(play.get("about", {}).get("atBatIndex"))
+
+        result = play.get("result", {})
+        atbat_result = result.get("description") if "event" in result else None
+
+        inning = None
+        if "currentInning" in linescore:
+            inning = f"{linescore['currentInning']} {linescore.get('inningHalf')}"
+        teams = linescore.get("teams", {})
+        score = (
+            teams.get("away", {}).get("runs", 0),
+            teams.get("home", {}).get("runs", 0),
+        )
+        offense = linescore.get("offense", {})
+        defense = linescore.get("defense", {})
+        upcoming = (
+            offense.get("onDeck"),
+            offense.get("inHole"),
+            defense.get("batter"),
+            defense.get("onDeck"),
+        )
+
+        return cls(
+            gamePk=gamePk,
+            timecode=game.get("metaData", {}).get("timeStamp"),
+            game_state=status.get("abstractGameState"),
+            detailed_state=status.get("detailedState"),
+            inning_state=linescore.get("inningState"),
+            current_play=play,
+            count=count,
+            batter=batter.get("fullName"),
+            batter_id=batter.get("id"),
+            pitcher=pitcher.get("fullName"),
+            pitcher_id=pitcher.get("id"),
+            pitch=pitch,
+            call=call,
+            pitch_type=pitch_type,
+            expected_call=_expected_call(pitch),
+            atbat_result=atbat_result,
+            pitch_data=pitch_data,
+            inning=inning,
+            score=score,
+            pitch_rows=len(store),
+            upcoming_batter_ids=tuple(p["id"] for p in upcoming if p and "id" in p),
+        )
+
 
 class BaseballLive:
-    """Class for baseball data using MLBStats-API."""
+    """Class for baseball data using MLBStats-API.
 
-    def __init__(self, gamePk: int):
-        """Initialize BaseballLive with gamePk."""
+    Attributes:
+        gamePk (int): The gamePk.
+        snapshot (LiveSnapshot): Everything derived from the fetched feed.
+        datetime (arrow.Arrow): When the feed was fetched.
+    """
+
+    def __init__(
+        self,
+        gamePk: int,
+        game: Union[dict, None] = None,
+        store: Union[PitchStore, None] = None,
+        get: Callable[[str, dict], Any] = api_get,
+    ):
+        """Initialize BaseballLive with gamePk, fetching the live feed with
+        get unless an already downloaded game feed is given. Pitches are
+        appended to store when one is kept across fetches.
+        """
         self.gamePk = gamePk
-        self.game = statsapi.get("game", {"gamePk": self.gamePk})
+        if game is None:
+            game = get("game", {"gamePk": self.gamePk})
+        with METRICS.timer("derive_seconds"):
+            self.snapshot = LiveSnapshot.from_game(gamePk, game, store)
+        import arrow
+
         self.datetime = arrow.now()
 
     @property
     def current_play(self) -> dict:
-        """Retrieves current play data from BaseballLive.game."""
-        return self.game["liveData"]["plays"]["currentPlay"]
+        """Current play data from the live feed."""
+        return self.snapshot.current_play
 
     @property
     def count(self) -> Union[dict, None]:
         """Current count for at-bat."""
-        atbat = self.current_play["playEvents"]
-        if not atbat:
-            return None
-        else:
-            return atbat[-1]["count"]
+        return self.snapshot.count
 
     @property
     def batter(self) -> str:
         """The current batter."""
-        batter = self.current_play["matchup"]["batter"]["fullName"]
-        return batter
+        return self.snapshot.batter
 
     @property
     def batter_id(self) -> int:
         """The current batter."""
-        batter_id = self.current_play["matchup"]["batter"]["id"]
-        return batter_id
+        return self.snapshot.batter_id
 
     @property
     def pitcher(self) -> str:
         """The current pitcher."""
-        pitcher = self.current_play["matchup"]["pitcher"]["fullName"]
-        return pitcher
+        return self.snapshot.pitcher
 
     @property
     def pitcher_id(self) -> int:
         """The current pitcher."""
-        pitcher_id = self.current_play["matchup"]["pitcher"]["id"]
-        return pitcher_id
+        return self.snapshot.pitcher_id
 
     @property
     def pitch(self) -> Union[dict, None]:
         """Most recent pitch metrics."""
-        # returns current pitch metrics
-        atbat = self.current_play["playEvents"]
-        if not atbat:
-            return None
-        elif "pitchData" in atbat[-1]:
-            return atbat[-1]["pitchData"]
-        else:
-            return None
+        return self.snapshot.pitch
 
     @property
     def call(self) -> Union[str, None]:
         """Current pitch call."""
-        atbat = self.current_play["playEvents"]
-        if not atbat:
-            return None
-        elif "details" in atbat[-1]:
-            return atbat[-1]["details"]["description"]
-        else:
-            return None
+        return self.snapshot.call
 
     @property
     def pitch_data(self) -> Union[BaseballPitchData, None]:
         """Pitch data for current at-bat."""
-        atbat = self.current_play["playEvents"]
-        if not atbat:
-            return None
-
-        pitch_exists = False
-        for pitch in atbat:
-            if "pitchData" in pitch:
-                pitch_exists = True
-
-        if not pitch_exists:
-            return None
-
-        pitch_speed = []
-        sz_top = []
-        sz_bottom = []
-        pX = []
-        pZ = []
-        pitch_type = []
-
-        for pitch in atbat:
-            # append pitch type to pitchData
-            if "pitchData" in pitch:
-                try:
-                    pitch_type.append(pitch["details"]["type"]["code"])
-                    pitch_data = pitch["pitchData"]
-                except KeyError:
-                    continue
-            if pitch["isPitch"] == False:
-                continue
-
-            try:
-                pitch_speed.append(pitch_data["startSpeed"])
-            except KeyError:
-                continue
-            sz_top.append(pitch_data["strikeZoneTop"])
-            sz_bottom.append(pitch_data["strikeZoneBottom"])
-            pX.append(pitch_data["coordinates"]["pX"])
-            pZ.append(pitch_data["coordinates"]["pZ"])
-
-        bpd = BaseballPitchData(pitch_speed, sz_top, sz_bottom, pX, pZ, pitch_type)
-        return bpd
+        return self.snapshot.pitch_data
 
     @property
     def pitch_type(self) -> Union[dict, None]:
         """Current pitch type."""
-        atbat = self.current_play["playEvents"]
-        if not atbat:
-            return None
-        elif "details" in atbat[-1]:
-            if "type" in atbat[-1]["details"]:
-                return atbat[-1]["details"]["type"]
-            else:
-                return None
+        return self.snapshot.pitch_type
 
     @property
     def expected_call(self) -> Union[str, None]:
         """Determines the expected call from current pitch irrespective of
         the umpire's call.
         """
-
-        # pX is the horizontal coordinate of baseball relative to center (ft)
-        # pZ is the vertical coordinate of baseball relative to the ground (ft)
-        pitch = self.pitch
-        if pitch is None:
-            return None
-        pX = pitch["coordinates"]["pX"]
-        pZ = pitch["coordinates"]["pZ"]
-        sz_top = pitch["strikeZoneTop"]
-        sz_bottom = pitch["strikeZoneBottom"]
-        rad = 0.12  # radius of ball in ft
-        moe = 0.08  # margin of error
-        if abs(pX) <= 0.75:
-            X_strike = 1
-        elif abs(pX) <= 0.91 and abs(pX) >= 0.75:
-            X_strike = 0.5
-        else:
-            return "Ball"
-
-        if pZ >= sz_bottom and pZ <= sz_top:
-            Y_strike = 1
-        elif pZ >= (sz_bottom - rad - moe) and pZ <= (sz_top + rad + moe):
-            Y_strike = 0.5
-        else:
-            return "Ball"
-
-        if (X_strike + Y_strike) == 2:
-            return "Strike"
-        else:
-            return "MOE"
+        return self.snapshot.expected_call
 
     @property
     def atbat_result(self) -> Union[str, None]:
         """The result of the at-bat."""
-        atbat = self.current_play
-        if not "event" in atbat["result"]:
-            return None
-        else:
-            return atbat["result"]["description"]
+        return self.snapshot.atbat_result
 
     @property
     def inning(self) -> str:
         """The current inning."""
-        inning = self.game["liveData"]["linescore"]["currentInning"]
-        half = self.game["liveData"]["linescore"]["inningHalf"]
-        return f"{inning} {half}"
+        return self.snapshot.inning
 
     @property
     def score(self) -> Tuple[int, int]:
         """The current score (away-home)."""
-        box = self.game["liveData"]["linescore"]["teams"]
-        home = box["home"]["runs"]
-        away = box["away"]["runs"]
-        return away, home
+        return self.snapshot.score
 
 
 class BaseballStats(ABC):
-    def __init__(self, player_id: int):
+    group = "hitting,pitching,fielding"
+
+    def __init__(
+        self,
+        player_id: int,
+        season: Union[int, None] = None,
+        get: Callable[[str, dict], Any] = api_get,
+        person: Union[dict, None] = None,
+    ):
+        """Initialize BaseballStats with player_id, fetching the player's
+        season stats with get unless an already downloaded "person"
+        response hydrated with them is given.
+        """
         self.player_id = player_id
-        self.stats = statsapi.player_stat_data(self.player_id)
+        self.season = season
+        if person is None:
+            params = {
+                "personId": player_id,
+                "hydrate": stats_hydrate(self.group, season),
+            }
+            person = get("person", params)
+        self.stats = player_stat_data(person)
 
     @abstractmethod
     def get_stats(self) -> Dict[str, Union[int, float]]:
         pass
 
     def stats_table(self, **kwargs) -> str:
+        from tabulate import tabulate
+
         stats: dict = self.get_stats(**kwargs)
         table = list(stats.values())
         table_headers = list(stats.keys())
@@ -311,8 +929,16 @@ class BaseballStats(ABC):
 
 
 class BatterStats(BaseballStats):
-    def __init__(self, player_id: int):
-        super().__init__(player_id)
+    group = "hitting"
+
+    def __init__(
+        self,
+        player_id: int,
+        season: Union[int, None] = None,
+        get: Callable[[str, dict], Any] = api_get,
+        person: Union[dict, None] = None,
+    ):
+        super().__init__(player_id, season, get, person)
 
     def get_stats(self, full=False) -> Dict[str, Union[int, float]]:
         """The current batter's slash line (AVG/OBP/OPS)."""
@@ -343,8 +969,16 @@ class BatterStats(BaseballStats):
 
 
 class PitcherStats(BaseballStats):
-    def __init__(self, player_id: int):
-        super().__init__(player_id)
+    group = "pitching"
+
+    def __init__(
+        self,
+        player_id: int,
+        season: Union[int, None] = None,
+        get: Callable[[str, dict], Any] = api_get,
+        person: Union[dict, None] = None,
+    ):
+        super().__init__(player_id, season, get, person)
 
     def get_stats(self, full=False) -> Dict[str, Union[int, float]]:
         """The current pitcher's slash line (ERA/WHIP/K:BB)"""
@@ -372,3 +1006,39 @@ class PitcherStats(BaseballStats):
         s["KBB"] = pitching_stats["strikeoutWalkRatio"]
         s["HR9"] = pitching_stats["homeRunsPer9"]
         return s
+
+
+def roster_stats(
+    team_id: int,
+    season: Union[int, None] = None,
+    get: Callable[[str, dict], Any] = api_get,
+) -> List[BaseballStats]:
+    """Season stats of a team's active roster, bullpen included, fetched in
+    a single request.
+
+    Args:
+        team_id (int): The team.
+        season (int): Optional season (default: current season).
+        get (callable): StatsAPI get function (default: api_get).
+
+    Returns:
+        BatterStats of every player with hitting stats and PitcherStats of
+        every player with pitching stats, both for two-way players.
+    """
+    params = {
+        "teamId": team_id,
+        "rosterType": "active",
+        "hydrate": f"person({stats_hydrate('hitting,pitching', season)})",
+    }
+    if season:
+        params["season"] = season
+    stats = []
+    for player in get("team_roster", params).get("roster", []):
+        person = player["person"]
+        groups = {
+            s["group"]["displayName"] for s in person.get("stats", []) if s["splits"]
+        }
+        for cls in (BatterStats, PitcherStats):
+            if cls.group in groups:
+                stats.append(cls(person["id"], season, person={"people": [person]}))
+    return stats
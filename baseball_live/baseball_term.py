@@ -1,26 +1,81 @@
 #!/usr/bin/env python3
 import curses
-from curses.textpad import Textbox, rectangle
 from baseball_live.baseball_live import (
     BaseballSchedule,
-    BaseballLive,
     BaseballPitchData,
+    BaseballStats,
     BatterStats,
+    LiveSnapshot,
     PitcherStats,
+    PitchStore,
+    first_pitch_time,
+    schedule_game_state,
 )
+from baseball_live.cache import DiskCache, PlayerStatsCache, ScheduleCache
+from baseball_live.constants import (
+    BLOCK,
+    MAX_CONCURRENT_REQUESTS,
+    POLICIES,
+    QUEUE_SIZE,
+    SOCKET_PATH,
+)
+from baseball_live.feed import FEED_SUBTREES, GameFeed
+from baseball_live.fetcher import AsyncFetcher
+from baseball_live.metrics import EXPORT_INTERVAL, METRICS, MetricsExporter
+from baseball_live.scheduler import PREVIEW_INTERVAL, PollScheduler
+from baseball_live.timeshift import MAX_DELAY, TimeShiftBuffer
 import textwrap
-from typing import Union
+from typing import TYPE_CHECKING, Any, Callable, List, Tuple, Union
+import argparse
 import asyncio
+import dataclasses
+import functools
+from collections import Counter
+import os
+import signal
+import sys
+import threading
+import time
 
-screen = curses.initscr()
+# the dashboard, stream, daemon, zone and transport modules are imported
+# where they are used, and the transports opened by the first request, so
+# the game list paints before they are loaded
+if TYPE_CHECKING:
+    from baseball_live.dashboard import GameWatch, MultiGameWatcher
 
 LIVE_MODE = "live"
 STAT_MODE = "stat"
-API_UPDATE_INTERVAL = 5  # seconds
-UI_UPDATE_INTERVAL = 0.1  # seconds
+PITCHER_MODE = "pitcher"  # the current pitcher's pitches this game
+BATTER_MODE = "batter"  # the pitches thrown to the current batter this game
+HISTORY_LABELS = {
+    PITCHER_MODE: "Pitcher's pitches today (k: back)",
+    BATTER_MODE: "Pitches to batter today (k: back)",
+}
+MAX_SPEED_LABELS = 12  # pitches plotted with their speed
+HEATMAP_MIN_PITCHES = 40  # more pitches are shown as a density heatmap
+HEAT_COLORS = (21, 33, 49, 190, 208, 196)  # 256-color palette, low to high
+API_UPDATE_INTERVAL = 5  # seconds, while the game is live (see PollScheduler)
+UI_UPDATE_INTERVAL = 0.1  # seconds, only used when stdin can't be watched
+STATS_UPDATE_INTERVAL = 300  # seconds
+SCOREBOARD_INTERVAL = 30  # seconds between scoreboard refreshes
+PREGAME_LEAD = 300  # seconds before first pitch the live view opens
 MIN_HEIGHT = 25  # lines
 MIN_LENGTH = 60  # characters
 STATS_FULL_LENGTH = 106  # characters
+CARD_HEIGHT = 7  # lines
+CARD_WIDTH = 40  # characters
+HUD_WIDTH = 40  # characters
+HUD_INTERVAL = 1  # seconds between HUD refreshes
+TEXT_CACHE_SIZE = 64  # rendered text blocks kept, see text_lines
+HUD_ROWS = (
+    ("poll_seconds", "poll"),
+    ("fetch_seconds", "fetch"),
+    ("decode_seconds", "decode"),
+    ("derive_seconds", "derive"),
+    ("display_live_seconds", "live"),
+    ("display_stats_seconds", "stats"),
+    ("frame_seconds", "frame"),
+)
 
 
 class TerminalColorException(Exception):
@@ -37,24 +92,76 @@ def check_color_support():
         return False
 
 
-def display_games_today(stdscr: "curses._CursesWindow", gt: str, dims: tuple):
-    gt_split = gt.splitlines()
-    gt_split.append("")
+@functools.lru_cache(maxsize=TEXT_CACHE_SIZE)
+def text_lines(text: str) -> Tuple[Tuple[str, ...], int]:
+    """The lines of a text block (a table) followed by an empty line, and
+    the length of the longest, computed once per distinct text.
+    """
+    lines = tuple(text.splitlines()) + ("",)
+    return lines, len(max(lines, key=len))
+
+
+@functools.lru_cache(maxsize=TEXT_CACHE_SIZE)
+def wrapped_lines(text: str, width: int) -> Tuple[str, ...]:
+    """text wrapped to width, computed once per distinct text and width."""
+    return tuple(textwrap.fill(text, width=width).splitlines())
+
+
+@functools.lru_cache(maxsize=TEXT_CACHE_SIZE)
+def stats_table(stats: BaseballStats, full: bool) -> str:
+    """stats.stats_table(full=full), tabulated once per stats object.
+
+    Stats objects are never updated, PlayerStatsCache replaces them, so the
+    object stands for its content.
+    """
+    return stats.stats_table(full=full)
+
+
+def display_games_today(
+    stdscr: "curses._CursesWindow",
+    gt: str,
+    dims: tuple,
+    game_id: str = "",
+    note: str = "",
+):
+    gt_split, gt_length = text_lines(gt)
     gt_height = len(gt_split)
-    gt_length = len(max(gt_split, key=len))
     stdscr.erase()
     for i, j in enumerate(gt_split):
         ht = int(dims[0] / 2) - int(gt_height / 2) + i
         ln = int(dims[1] / 2) - int(gt_length / 2)
         stdscr.addstr(ht, ln, j)
 
-    # get user input on game id
-    win = curses.newwin(1, 3, ht, ln)
-    box = Textbox(win)
+    # the game id typed so far goes below the table
+    stdscr.addstr(ht, ln, game_id + "_")
+    if note:
+        stdscr.addstr(dims[0] - 1, 0, note[: dims[1] - 1])
+    stdscr.refresh()
+
+
+def format_countdown(seconds: float) -> str:
+    """Formats a duration as H:MM:SS."""
+    minutes, secs = divmod(max(int(seconds), 0), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}"
+
+
+def display_countdown(
+    stdscr: "curses._CursesWindow", game: dict, remaining: float, dims: tuple
+):
+    lines = [
+        f"{game['away_name']} @ {game['home_name']}",
+        "",
+        f"First pitch in {format_countdown(remaining)}",
+        "",
+        f"Following starts {PREGAME_LEAD // 60} minutes before (q: quit)",
+    ]
+    stdscr.erase()
+    for i, line in enumerate(lines):
+        line = line[: dims[1] - 1]
+        ht = int(dims[0] / 2) - int(len(lines) / 2) + i
+        stdscr.addstr(ht, max(int(dims[1] / 2) - int(len(line) / 2), 0), line)
     stdscr.refresh()
-    box.edit()
-    game_id = box.gather()
-    return game_id
 
 
 def pitch_book(pitch_code: str):
@@ -74,90 +181,259 @@ def pitch_book(pitch_code: str):
     return curses.color_pair(pitch_color_mapping.get(pitch_code, 9))
 
 
+_INVALID = object()  # panel key never equal to an update's
+
+
+class Panel:
+    """A sub-window of the screen that is only repainted when its inputs change.
+
+    Drawing uses absolute screen coordinates, text falling outside the panel
+    is clipped.
+
+    Attributes:
+        win (curses._CursesWindow): The sub-window.
+        y (int): Top row on screen.
+        x (int): Leftmost column on screen.
+        height (int): Number of rows.
+        width (int): Number of columns.
+        key: Inputs the panel was last drawn with.
+    """
+
+    def __init__(self, stdscr: "curses._CursesWindow", y: int, x: int, h: int, w: int):
+        """Initialize Panel covering h rows and w columns from (y, x)."""
+        self.y, self.x = y, x
+        self.height, self.width = max(h, 1), max(w, 1)
+        self.win = stdscr.derwin(self.height, self.width, y, x)
+        self.key = None
+
+    def addstr(self, y: int, x: int, text: str, attr: int = 0):
+        y, x = y - self.y, x - self.x
+        if not 0 <= y < self.height:
+            return
+        if x < 0:
+            text, x = text[-x:], 0
+        text = text[: self.width - x]
+        if not text:
+            return
+        try:
+            self.win.addstr(y, x, text, attr)
+        except curses.error:
+            # writing the bottom right cell moves the cursor off the window
+            pass
+
+    def addch(self, y: int, x: int, ch: int):
+        y, x = y - self.y, x - self.x
+        if 0 <= y < self.height and 0 <= x < self.width:
+            try:
+                self.win.addch(y, x, ch)
+            except curses.error:
+                pass
+
+    def rectangle(self, uly: int, ulx: int, lry: int, lrx: int):
+        """Clipped equivalent of curses.textpad.rectangle."""
+        for x in range(ulx + 1, lrx):
+            self.addch(uly, x, curses.ACS_HLINE)
+            self.addch(lry, x, curses.ACS_HLINE)
+        for y in range(uly + 1, lry):
+            self.addch(y, ulx, curses.ACS_VLINE)
+            self.addch(y, lrx, curses.ACS_VLINE)
+        self.addch(uly, ulx, curses.ACS_ULCORNER)
+        self.addch(uly, lrx, curses.ACS_URCORNER)
+        self.addch(lry, ulx, curses.ACS_LLCORNER)
+        self.addch(lry, lrx, curses.ACS_LRCORNER)
+
+    def invalidate(self):
+        """Makes the next update repaint the panel whatever its key."""
+        self.key = _INVALID
+
+    def update(self, key, draw: Callable[[], None]) -> bool:
+        """Repaints the panel with draw if key differs from the last paint.
+
+        A key of None leaves the panel blank. Changes are staged with
+        noutrefresh, curses.doupdate writes them to the terminal.
+
+        Returns:
+            True if the panel was repainted.
+        """
+        if key == self.key:
+            return False
+        self.win.erase()
+        if key is not None:
+            draw()
+        self.win.noutrefresh()
+        self.key = key
+        return True
+
+
 class GameDisplay:
+    """Geometry and panels of the live and stat screens.
+
+    Kept for the whole game: layout recomputes the geometry when the
+    terminal is resized, invalidate repaints the same layout (e.g. after a
+    mode change).
+    """
+
     def __init__(self, stdscr: "curses._CursesWindow"):
+        """Initialize GameDisplay laid out for stdscr's current size."""
         self.stdscr = stdscr
-        self.dims = stdscr.getmaxyx()
-        if self.dims[0] < MIN_HEIGHT:
+        self.layout()
+
+    def layout(self):
+        """Recomputes the geometry and panels for the current screen size.
+
+        Raises:
+            Exception: If the terminal is smaller than MIN_HEIGHT lines or
+            MIN_LENGTH characters.
+        """
+        stdscr = self.stdscr
+        dims = stdscr.getmaxyx()
+        if dims[0] < MIN_HEIGHT:
             raise Exception(
                 f"Terminal height must be at least {MIN_HEIGHT} lines tall."
             )
-        if self.dims[1] < MIN_LENGTH:
+        if dims[1] < MIN_LENGTH:
             raise Exception(
                 f"Terminal length must be at least {MIN_LENGTH} characters long."
             )
+        self.dims = dims
         self.midx = int(self.dims[1] / 2)
         self.midy = int(self.dims[0] / 2)
         self.widthx = int(self.dims[1] / 6)
         self.heighty = round(self.widthx / 1.5)
         self.ix = int(self.dims[1] * (1 / 8))  # for plottings innings, etc.
         self.iy = int(self.dims[0] * (1 / 4))
+        self.titley = int(self.dims[0] / 8)
+        self.resy = int(self.dims[0] * (6 / 7))
+        self.legx = int(self.dims[1] * (5 / 6))
+        # pitch scaling: bottom of the zone on screen, columns per foot
+        self.boty = self.midy + self.heighty / 2
+        self.xfactor = self.widthx / (17 / 12)  # denominator is plate width in ft
+
+        # panels never overlap: title band, then scoreboard | zone | legend,
+        # then the result band.
+        height, length = self.dims
+        bodyy = self.titley + 2
+        zonex = self.midx - self.widthx
+        self.status = Panel(stdscr, 0, 0, 1, length)
+        self.header = Panel(stdscr, 1, 0, bodyy - 1, length)
+        self.board = Panel(stdscr, bodyy, 0, self.resy - bodyy, zonex)
+        self.zone = Panel(stdscr, bodyy, zonex, self.resy - bodyy, self.legx - zonex)
+        self.legend = Panel(
+            stdscr, bodyy, self.legx, self.resy - bodyy, length - self.legx
+        )
+        self.footer = Panel(stdscr, self.resy, 0, height - self.resy, length)
+        self.stats = Panel(stdscr, 1, 0, height - 1, length)
+
+    @property
+    def panels(self) -> Tuple[Panel, ...]:
+        return (
+            self.status,
+            self.header,
+            self.board,
+            self.zone,
+            self.legend,
+            self.footer,
+            self.stats,
+        )
+
+    def invalidate(self):
+        """Makes the next frame repaint every panel."""
+        for panel in self.panels:
+            panel.invalidate()
 
     def strike_zone(self):
         ulx, uly = self.midx - int(self.widthx / 2), self.midy - int(self.heighty / 2)
         lrx, lry = self.midx + int(self.widthx / 2), self.midy + int(self.heighty / 2)
-        rectangle(self.stdscr, uly, ulx, lry, lrx)
-        self.stdscr.refresh()
+        self.zone.rectangle(uly, ulx, lry, lrx)
 
     def status_when_no_pitch(self, status: Union[str, None]):
-        desy = int(self.dims[0] * (6 / 7))
+        desy = self.resy
         desx = int(self.dims[1] / 2) - int(len(status) / 2)
-        self.stdscr.addstr(desy, desx, status)
-        self.stdscr.refresh()
+        self.footer.addstr(desy, desx, status)
 
     def pitches_plot(self, pitches: BaseballPitchData):
-        sz_top = pitches.sz_top[0]
-        sz_bottom = pitches.sz_bottom[0]
-        sz_height = sz_top - sz_bottom
-        # scale the pitch rectangle against the rectangle on screen.
+        # scale the pitch rectangle against the rectangle on screen, each
+        # pitch against its batter's strike zone.
         # pX is relative to the centre of home plate
         # pZ starts from ground
-        sz_top = pitches.sz_top[0]
-        sz_bottom = pitches.sz_bottom[0]
-        boty = self.midy + self.heighty / 2
-        sz_height = sz_top - sz_bottom
-        yfactor = self.heighty / sz_height
-        xfactor = self.widthx / (17 / 12)  # denominator is plate width in ft
-        pXs, pZs = pitches.pX, pitches.pZ
-        # set negative pZs to zero (ball touched the ground).
-        pZs = [0 if i < 0 else i for i in pZs]
-        # get relative pZs with respect to the screen
-        pZ_rels = [i - sz_bottom for i in pZs]
-
-        for i, pX in enumerate(pXs):
-            plot_y = round(boty - pZ_rels[i] * yfactor)
+        boty, xfactor = self.boty, self.xfactor
+        pZs = pitches.pZ
+        sz_tops, sz_bottoms = pitches.sz_top, pitches.sz_bottom
+        speeds = len(pitches) <= MAX_SPEED_LABELS
+        # keep markers (and the speed below them) inside the zone panel
+        miny, maxy = self.zone.y, self.zone.y + self.zone.height - 2
+        minx, maxx = self.zone.x + 1, self.zone.x + self.zone.width - 2
+
+        for i, pX in enumerate(pitches.pX):
+            # set negative pZs to zero (ball touched the ground) and get
+            # relative pZs with respect to the screen
+            yfactor = self.heighty / (sz_tops[i] - sz_bottoms[i])
+            pZ_rel = max(pZs[i], 0) - sz_bottoms[i]
+            plot_y = round(boty - pZ_rel * yfactor)
             plot_x = round(self.midx + (-1 * pX) * xfactor)
-            # if plot_y is bigger or smaller than screen dimensions, adjust (+ 5 is arbitrary)
-            if plot_y + 5 >= self.dims[0]:
-                plot_y = self.dims[0] - 2
-            # same for plot_x
-            if plot_x + 5 >= self.dims[1]:
-                plot_x = self.dims[1] - 2
-            # plot_x and plot_y cannot be negative
-            if plot_x <= 0:
-                plot_x = 0
-            if plot_y <= 0:
-                plot_y = 0
-
-            self.stdscr.addstr(plot_y, plot_x, "X", pitch_book(pitches.pitch_type[i]))
-            self.stdscr.addstr(
-                plot_y + 1, plot_x - 1, str(round(pitches.pitch_speed[i]))
-            )
+            plot_y = min(max(plot_y, miny), maxy)
+            plot_x = min(max(plot_x, minx), maxx)
+
+            self.zone.addstr(plot_y, plot_x, "X", pitch_book(pitches.pitch_type[i]))
+            if speeds:
+                self.zone.addstr(
+                    plot_y + 1, plot_x - 1, str(round(pitches.pitch_speed[i]))
+                )
+
+    def pitches_heatmap(self, pitches: BaseballPitchData):
+        from baseball_live.zone import density
+
+        # the cells of the zone panel, binned with the same scaling as
+        # pitches_plot; pitches off the panel are left out
+        boty, xfactor = self.boty, self.xfactor
+        miny, maxy = self.zone.y, self.zone.y + self.zone.height - 1
+        minx, maxx = self.zone.x + 1, self.zone.x + self.zone.width - 2
+        grid = density(
+            pitches,
+            maxy - miny + 1,
+            maxx - minx + 1,
+            ((self.midx - minx + 0.5) / xfactor, (self.midx - maxx - 0.5) / xfactor),
+            ((boty - miny + 0.5) / self.heighty, (boty - maxy - 0.5) / self.heighty),
+        )
+        peak = max(max(row) for row in grid)
+        if not peak:
+            return
+        attrs = [curses.color_pair(c + 1) | curses.A_REVERSE for c in HEAT_COLORS]
+        for i, row in enumerate(grid):
+            for j, count in enumerate(row):
+                if count:
+                    level = (count * len(attrs) - 1) // peak
+                    self.zone.addstr(miny + i, minx + j, " ", attrs[level])
+
+    def heatmap_legend(self, pitches: BaseballPitchData):
+        from baseball_live.zone import classify
+
+        legx = self.legx
+        legy = self.iy
+        self.legend.addstr(legy, legx, f"{len(pitches)} pitches")
+        self.legend.addstr(legy + 1, legx, "low ")
+        for i, color in enumerate(HEAT_COLORS):
+            attr = curses.color_pair(color + 1) | curses.A_REVERSE
+            self.legend.addstr(legy + 1, legx + 4 + i, " ", attr)
+        self.legend.addstr(legy + 1, legx + 4 + len(HEAT_COLORS), " high")
+        calls = Counter(classify(pitches))
+        for i, call in enumerate(("Strike", "MOE", "Ball")):
+            self.legend.addstr(legy + 3 + i, legx, f"{call}: {calls[call]}")
 
     def pitches_legend(self, pitches: BaseballPitchData):
         pitch_type_set = list(set(pitches.pitch_type))
-        legx = int(self.dims[1] * (5 / 6))
-        legy = int(self.dims[0] * (1 / 4))
+        legx = self.legx
+        legy = self.iy
         for i, pitch in enumerate(pitch_type_set):
-            self.stdscr.addstr(legy + i, legx, "X", pitch_book(pitch))
-            self.stdscr.addstr(legy + i, legx + 1, " - " + pitch)
+            self.legend.addstr(legy + i, legx, "X", pitch_book(pitch))
+            self.legend.addstr(legy + i, legx + 1, " - " + pitch)
 
     def current_inning(self, inning: str):
-        self.stdscr.addstr(self.iy, self.ix, f"I: {inning}")
+        self.board.addstr(self.iy, self.ix, f"I: {inning}")
 
     def score(self, score: tuple):
         aw, hm = score
-        self.stdscr.addstr(self.iy + 1, self.ix, f"R: {aw}-{hm}")
+        self.board.addstr(self.iy + 1, self.ix, f"R: {aw}-{hm}")
 
     def pitch_count(self, current_count: Union[dict, None]):
         if current_count is not None:
@@ -168,194 +444,903 @@ class GameDisplay:
             strikes = 0
             balls = 0
             outs = 0
-        self.stdscr.addstr(self.iy + 2, self.ix, f"{balls}-{strikes} O: {outs}")
+        self.board.addstr(self.iy + 2, self.ix, f"{balls}-{strikes} O: {outs}")
 
     def expected_call(self, expected_call: str):
-        self.stdscr.addstr(self.iy + 3, self.ix, f"EC: {expected_call}")
+        self.board.addstr(self.iy + 3, self.ix, f"EC: {expected_call}")
 
     def current_call(self, current_call: str):
-        self.stdscr.addstr(self.iy + 4, self.ix, current_call)
+        self.board.addstr(self.iy + 4, self.ix, current_call)
 
     def title(self, pitcher: str, batter: str):
         titlepitcher = f"Pitcher: {pitcher}"
         titlebatter = f"Batter: {batter}"
-        titleypitcher = int(self.dims[0] / 8)
+        titleypitcher = self.titley
         titlexpitcher = int(self.dims[1] / 2) - int(len(titlepitcher) / 2)
         titleybatter = titleypitcher + 1
         titlexbatter = int(self.dims[1] / 2) - int(len(titlebatter) / 2)
-        self.stdscr.addstr(titleypitcher, titlexpitcher, titlepitcher)
-        self.stdscr.addstr(titleybatter, titlexbatter, titlebatter)
+        self.header.addstr(titleypitcher, titlexpitcher, titlepitcher)
+        self.header.addstr(titleybatter, titlexbatter, titlebatter)
 
     def result(self, atbat_result: str):
-        resy = int(self.dims[0] * (6 / 7))
+        resy = self.resy
         resx = int(self.dims[1] / 2) - int(len(atbat_result) / 2)
         # if the string is too long, need to chop it up to display to next
         if len(atbat_result) > self.dims[1]:
             # wrap text
-            res = textwrap.fill(
-                atbat_result, width=self.dims[1] - int(self.dims[1] * (2 / 8))
+            atbat_result_list = wrapped_lines(
+                atbat_result, self.dims[1] - int(self.dims[1] * (2 / 8))
             )
-            atbat_result_list = res.splitlines()
             resx = int(self.dims[1] / 2) - int(len(atbat_result_list[0]) / 2)
             for i, ar in enumerate(atbat_result_list):
-                self.stdscr.addstr(resy + i, resx, ar)
+                self.footer.addstr(resy + i, resx, ar)
 
         else:
-            self.stdscr.addstr(resy, resx, atbat_result)
+            self.footer.addstr(resy, resx, atbat_result)
 
     def batter_stats(self, name: str, batter_stats: str):
-        b_split = batter_stats.splitlines()
-        b_split.append("")
+        b_split, gt_length = text_lines(batter_stats)
         gt_height = len(b_split)
-        gt_length = len(max(b_split, key=len))
         titlebatter = f"Batter: {name}"
         ycoord = int(self.dims[0] / 1.5) - int(gt_height / 2)
         titleybatter = ycoord - 2
         titlexbatter = int(self.dims[1] / 2) - int(len(titlebatter) / 2)
-        self.stdscr.addstr(titleybatter, titlexbatter, titlebatter)
+        self.stats.addstr(titleybatter, titlexbatter, titlebatter)
         for i, j in enumerate(b_split):
             ht = ycoord + i
             ln = int(self.dims[1] / 2) - int(gt_length / 2)
-            self.stdscr.addstr(ht, ln, j)
+            self.stats.addstr(ht, ln, j)
 
     def pitcher_stats(self, name: str, pitcher_stats: str):
-        p_split = pitcher_stats.splitlines()
-        p_split.append("")
+        p_split, gt_length = text_lines(pitcher_stats)
         gt_height = len(p_split)
-        gt_length = len(max(p_split, key=len))
         titlepitcher = f"Pitcher: {name}"
         ycoord = int(self.dims[0] / 3) - int(gt_height / 2)
         titleypitcher = ycoord - 2
         titlexpitcher = int(self.dims[1] / 2) - int(len(titlepitcher) / 2)
-        self.stdscr.addstr(titleypitcher, titlexpitcher, titlepitcher)
+        self.stats.addstr(titleypitcher, titlexpitcher, titlepitcher)
         for i, j in enumerate(p_split):
             ht = ycoord + i
             ln = int(self.dims[1] / 2) - int(gt_length / 2)
-            self.stdscr.addstr(ht, ln, j)
+            self.stats.addstr(ht, ln, j)
 
     def delay(self, delay: int):
-        self.stdscr.addstr(0, 0, f"DELAY: {delay} sec")
-        self.stdscr.refresh()
+        self.status.addstr(0, 0, f"DELAY: {delay} sec")
 
+    def mode_label(self, label: str):
+        self.status.addstr(0, max(self.dims[1] - len(label) - 1, 0), label)
 
-def display_live(gd: GameDisplay, api_data: BaseballLive):
+
+def display_live(gd: GameDisplay, api_data: LiveSnapshot):
     pitches = api_data.pitch_data
-    gd.strike_zone()
-    curses.curs_set(False)
-    if not pitches:
-        try:
-            gd.status_when_no_pitch(api_data.atbat_result)
-        except (KeyError, TypeError):
-            pass
-    else:
-        gd.pitches_plot(pitches)
-        gd.pitches_legend(pitches)
+
+    heatmap = pitches is not None and len(pitches) >= HEATMAP_MIN_PITCHES
+
+    def draw_zone():
+        if heatmap:
+            gd.pitches_heatmap(pitches)
+            gd.strike_zone()
+        else:
+            gd.strike_zone()
+            if pitches:
+                gd.pitches_plot(pitches)
+
+    def draw_board():
         gd.current_inning(api_data.inning)
         gd.score(api_data.score)
         gd.pitch_count(api_data.count)
         gd.expected_call(api_data.expected_call)  # should pass pitches instead.
         gd.current_call(api_data.call)
-        gd.title(api_data.pitcher, api_data.batter)
-        if api_data.atbat_result is not None:
+
+    def draw_footer():
+        if not pitches:
+            gd.status_when_no_pitch(api_data.atbat_result)
+        else:
             # need to do this since because some atbat_result has extra spaces
             words = api_data.atbat_result.split()
             atbat_result = " ".join(words)
             gd.result(atbat_result)
 
+    gd.zone.update(("zone", pitches), draw_zone)
+    if not pitches:
+        gd.header.update(None, None)
+        gd.board.update(None, None)
+        gd.legend.update(None, None)
+    else:
+        gd.header.update(
+            (api_data.pitcher, api_data.batter),
+            lambda: gd.title(api_data.pitcher, api_data.batter),
+        )
+        gd.board.update(
+            (
+                api_data.inning,
+                api_data.score,
+                api_data.count,
+                api_data.expected_call,
+                api_data.call,
+            ),
+            draw_board,
+        )
+        if heatmap:
+            gd.legend.update(len(pitches), lambda: gd.heatmap_legend(pitches))
+        else:
+            gd.legend.update(
+                frozenset(pitches.pitch_type), lambda: gd.pitches_legend(pitches)
+            )
+    # drawn differently with and without pitches, blank without a result
+    if api_data.atbat_result is None:
+        gd.footer.update(None, None)
+    else:
+        gd.footer.update((api_data.atbat_result, bool(pitches)), draw_footer)
 
-def display_stats(gd: GameDisplay, api_data: BaseballLive):
-    try:
-        batter_stats = BatterStats(api_data.batter_id)
-        pitcher_stats = PitcherStats(api_data.pitcher_id)
-        if gd.dims[1] < STATS_FULL_LENGTH:
-            full = False
+
+def pitch_history(snapshot: LiveSnapshot, store: PitchStore, mode: str) -> LiveSnapshot:
+    """snapshot with the current pitcher's (PITCHER_MODE) or batter's
+    (BATTER_MODE) pitches of the whole game in place of the at-bat's, as of
+    when the snapshot was taken. Without a pitcher or batter (between
+    at-bats, or on a partial feed) snapshot is returned as is.
+    """
+    if mode == PITCHER_MODE:
+        if snapshot.pitcher_id is None:
+            return snapshot
+        pitches = store.pitcher(snapshot.pitcher_id, until=snapshot.pitch_rows)
+    else:
+        if snapshot.batter_id is None:
+            return snapshot
+        pitches = store.batter(snapshot.batter_id, until=snapshot.pitch_rows)
+    return dataclasses.replace(snapshot, pitch_data=pitches)
+
+
+def display_stats(
+    gd: GameDisplay,
+    batter_stats: Union[BatterStats, None],
+    pitcher_stats: Union[PitcherStats, None],
+):
+    if gd.dims[1] < STATS_FULL_LENGTH:
+        full = False
+    else:
+        full = True
+
+    def draw():
+        try:
+            gd.pitcher_stats(
+                pitcher_stats.full_name(), stats_table(pitcher_stats, full)
+            )
+            gd.batter_stats(batter_stats.full_name(), stats_table(batter_stats, full))
+
+        except (KeyError, TypeError):
+            pass
+
+    if batter_stats is None or pitcher_stats is None:
+        gd.stats.update(None, None)
+    else:
+        gd.stats.update((batter_stats, pitcher_stats), draw)
+
+
+class Hud:
+    """Metrics overlay in the bottom right corner of the screen.
+
+    Showing the overlay turns METRICS on, hiding it restores the previous
+    setting. The overlay is drawn over the panels after they are painted,
+    the renderer repaints everything once it is hidden.
+
+    Attributes:
+        visible (bool): Whether the overlay is shown.
+    """
+
+    def __init__(self, stdscr: "curses._CursesWindow"):
+        """Initialize Hud (hidden) drawing on stdscr."""
+        self.stdscr = stdscr
+        self.visible = False
+        self._restore = METRICS.enabled
+
+    def toggle(self) -> bool:
+        """Shows or hides the overlay, returns whether it is now visible."""
+        self.visible = not self.visible
+        if self.visible:
+            self._restore = METRICS.enabled
+            METRICS.enabled = True
         else:
-            full = True
-        gd.pitcher_stats(
-            pitcher_stats.full_name(), pitcher_stats.stats_table(full=full)
+            METRICS.enabled = self._restore
+        return self.visible
+
+    def lines(self) -> List[str]:
+        summary = METRICS.summary()
+        lines = [f"{'ms':<8}{'last':>8}{'p50':>8}{'p95':>8}"]
+        for name, label in HUD_ROWS:
+            s = summary.get(name)
+            if s is not None:
+                lines.append(
+                    f"{label:<8}{s['last'] * 1000:8.1f}"
+                    f"{s['p50'] * 1000:8.1f}{s['p95'] * 1000:8.1f}"
+                )
+        payload = summary.get("payload_bytes")
+        if payload is not None:
+            lines.append(
+                f"payload {payload['last'] / 1024:.1f} KiB"
+                f"  requests {summary.get('requests_total', 0)}"
+            )
+        wire = summary.get("wire_bytes")
+        if wire is not None:
+            lines.append(
+                f"wire {wire['last'] / 1024:.1f} KiB"
+                f"  handshakes {summary.get('handshakes_total', 0)}"
+            )
+        stale = summary.get("feed_staleness_seconds")
+        stale = "-" if stale is None else f"{stale:.0f}s"
+        lines.append(
+            f"fps {summary['fps']:.1f}  stale {stale}"
+            f"  errors {summary.get('poll_errors_total', 0)}"
         )
-        gd.batter_stats(batter_stats.full_name(), batter_stats.stats_table(full=full))
+        return lines
+
+    def draw(self):
+        """Draws the overlay, if it is visible and fits on screen."""
+        if not self.visible:
+            return
+        lines = self.lines()
+        height, width = len(lines) + 2, HUD_WIDTH
+        rows, columns = self.stdscr.getmaxyx()
+        if height > rows or width > columns:
+            return
+        win = self.stdscr.derwin(height, width, rows - height, columns - width)
+        win.erase()
+        win.box()
+        for i, line in enumerate(lines):
+            win.addstr(i + 1, 1, line[: width - 2])
+        win.noutrefresh()
+
+
+class LiveRenderer:
+    """Retained-mode renderer for the live and stat screens.
+
+    The GameDisplay and its panels are kept between frames, laid out again
+    only when the terminal is resized and repainted whole when the screen
+    mode changes. Each frame only repaints the panels whose inputs changed
+    and flushes them with a single curses.doupdate, so an idle screen
+    writes nothing to the terminal. Text blocks are memoized (see
+    text_lines), so even a repaint rarely tabulates or wraps anything.
+    """
+
+    def __init__(self, stdscr: "curses._CursesWindow"):
+        """Initialize LiveRenderer drawing on stdscr."""
+        self.stdscr = stdscr
+        self.gd: Union[GameDisplay, None] = None
+        self.mode = None
+        self.hud = Hud(stdscr)
+
+    def toggle_hud(self):
+        """Shows or hides the metrics overlay."""
+        if not self.hud.toggle():
+            self.mode = None  # repaint what the overlay covered
+
+    def layout(self, mode: str) -> GameDisplay:
+        """The GameDisplay, laid out again on resize, invalidated on mode
+        change.
+        """
+        dims = self.stdscr.getmaxyx()
+        if self.gd is not None and self.gd.dims == dims and self.mode == mode:
+            return self.gd
+        self.stdscr.erase()
+        self.stdscr.noutrefresh()
+        if self.gd is None:
+            self.gd = GameDisplay(self.stdscr)
+        elif self.gd.dims != dims:
+            self.gd.layout()
+        else:
+            self.gd.invalidate()
+        self.mode = mode
+        return self.gd
+
+    def render(
+        self,
+        mode: str,
+        snapshot: Union[LiveSnapshot, None],
+        stats: Tuple[Union[BatterStats, None], Union[PitcherStats, None]] = (
+            None,
+            None,
+        ),
+        delay: int = 0,
+    ):
+        """Repaints whatever changed since the last frame.
+
+        Args:
+            mode (str): LIVE_MODE, STAT_MODE, PITCHER_MODE or BATTER_MODE.
+            snapshot (LiveSnapshot): The snapshot to show, None while loading.
+            In PITCHER_MODE and BATTER_MODE its pitch_data is plotted as the
+            history, see pitch_history.
+            stats (tuple): Batter and pitcher stats for Stat Mode.
+            delay (int): The broadcast delay shown in the status line.
+        """
+        with METRICS.timer("frame_seconds"):
+            gd = self.layout(mode)
+            label = HISTORY_LABELS.get(mode)
+
+            def draw_status():
+                if delay:
+                    gd.delay(delay)
+                if label:
+                    gd.mode_label(label)
+
+            gd.status.update((delay, label) if delay or label else None, draw_status)
+            if snapshot is not None:
+                if mode in (LIVE_MODE, PITCHER_MODE, BATTER_MODE):
+                    with METRICS.timer("display_live_seconds"):
+                        display_live(gd, snapshot)
+                elif mode == STAT_MODE:
+                    with METRICS.timer("display_stats_seconds"):
+                        display_stats(gd, *stats)
+            self.hud.draw()
+            curses.doupdate()
+        METRICS.frame()
+
+
+def game_card(card: Panel, watch: "GameWatch", focused: bool):
+    y, x = card.y, card.x + 1
+    attr = curses.A_REVERSE if focused else curses.A_BOLD
+    card.addstr(y, x, watch.title.ljust(card.width - 2), attr)
+    snapshot = watch.snapshot
+    if snapshot is None:
+        card.addstr(y + 1, x, "Loading...")
+        return
+    aw, hm = snapshot.score
+    card.addstr(y + 1, x, f"I: {snapshot.inning}  R: {aw}-{hm}")
+    count = snapshot.count or {"balls": 0, "strikes": 0, "outs": 0}
+    card.addstr(
+        y + 2,
+        x,
+        f"{count['balls']}-{count['strikes']} O: {count['outs']}  "
+        f"EC: {snapshot.expected_call}",
+    )
+    card.addstr(y + 3, x, f"P: {snapshot.pitcher}")
+    card.addstr(y + 4, x, f"B: {snapshot.batter}")
+    last = snapshot.atbat_result or snapshot.call
+    if last:
+        card.addstr(y + 5, x, " ".join(last.split()))
+
 
-    except (KeyError, TypeError):
-        pass
+class DashboardRenderer:
+    """Grid of game cards for the multi-game dashboard.
 
+    As many cards as fit are shown at once, when there are more games the
+    page holding the focused game is shown. Like LiveRenderer, cards are
+    panels that only repaint when their game or the focus changes.
+    """
 
-async def live(stdscr: "curses._CursesWindow"):
+    def __init__(self, stdscr: "curses._CursesWindow"):
+        """Initialize DashboardRenderer drawing on stdscr."""
+        self.stdscr = stdscr
+        self.dims = None
+        self.cards: List[Panel] = []
+        self.page = None
+        self.hud = Hud(stdscr)
+
+    def toggle_hud(self):
+        """Shows or hides the metrics overlay."""
+        if not self.hud.toggle():
+            self.dims = None  # repaint what the overlay covered
+
+    def layout(self) -> List[Panel]:
+        """The card panels, rebuilt when the terminal is resized."""
+        dims = self.stdscr.getmaxyx()
+        if dims != self.dims:
+            self.stdscr.erase()
+            self.stdscr.noutrefresh()
+            self.dims = dims
+            self.page = None
+            columns = max(1, dims[1] // CARD_WIDTH)
+            rows = max(1, (dims[0] - 1) // CARD_HEIGHT)
+            width = dims[1] // columns
+            self.cards = [
+                Panel(
+                    self.stdscr,
+                    1 + row * CARD_HEIGHT,
+                    column * width,
+                    CARD_HEIGHT,
+                    width,
+                )
+                for row in range(rows)
+                for column in range(columns)
+            ]
+        return self.cards
+
+    def render(self, watcher: "MultiGameWatcher"):
+        """Repaints the cards whose game or focus changed."""
+        with METRICS.timer("frame_seconds"):
+            self._render(watcher)
+        METRICS.frame()
+
+    def _render(self, watcher: "MultiGameWatcher"):
+        cards = self.layout()
+        watches = list(watcher.watches.values())
+        focus = list(watcher.watches).index(watcher.focus)
+        page = focus // len(cards)
+        if page != self.page:
+            self.page = page
+            header = f" {len(watches)} games - page {page + 1}/"
+            header += f"{(len(watches) - 1) // len(cards) + 1} (n/p: focus, q: quit)"
+            self.stdscr.move(0, 0)
+            self.stdscr.clrtoeol()
+            self.stdscr.addstr(0, 0, header[: self.dims[1] - 1])
+            self.stdscr.noutrefresh()
+        for i, card in enumerate(cards):
+            index = page * len(cards) + i
+            if index >= len(watches):
+                card.update(None, None)
+                continue
+            watch = watches[index]
+            focused = watch.gamePk == watcher.focus
+            snapshot = watch.snapshot
+            timecode = snapshot.timecode if snapshot is not None else None
+            card.update(
+                (watch.gamePk, timecode, focused),
+                lambda: game_card(card, watch, focused),
+            )
+        self.hud.draw()
+        curses.doupdate()
+
+
+class UIEvents:
+    """Wakes the UI loop on keypresses, new data and terminal resizes.
+
+    Keypresses are detected with loop.add_reader on stdin and resizes with a
+    SIGWINCH handler, everything else calls notify. Where stdin can't be
+    watched, wait falls back to polling every UI_UPDATE_INTERVAL.
+
+    Attributes:
+        resized (bool): A SIGWINCH arrived since the last wait.
+    """
+
+    def __init__(self):
+        """Initialize UIEvents, call attach from the running loop."""
+        self.resized = False
+        self._wake = asyncio.Event()
+        self._watching = False
+
+    def attach(self, fd: Union[int, None] = None):
+        """Starts watching stdin (or fd) and SIGWINCH, or polling if either
+        can't be watched (e.g. stdin is a file, or not on the main thread).
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            self._fd = sys.stdin.fileno() if fd is None else fd
+            loop.add_reader(self._fd, self.notify)
+        except (NotImplementedError, AttributeError, ValueError, OSError):
+            return
+        try:
+            loop.add_signal_handler(signal.SIGWINCH, self._on_resize)
+        except (NotImplementedError, AttributeError, ValueError, RuntimeError):
+            loop.remove_reader(self._fd)
+            return
+        self._watching = True
+
+    def detach(self):
+        """Stops watching stdin and SIGWINCH."""
+        if self._watching:
+            loop = asyncio.get_running_loop()
+            loop.remove_reader(self._fd)
+            loop.remove_signal_handler(signal.SIGWINCH)
+            self._watching = False
+
+    def notify(self):
+        """Wakes the UI loop."""
+        self._wake.set()
+
+    def _on_resize(self):
+        self.resized = True
+        self._wake.set()
+
+    async def wait(self):
+        """Waits for the next event (or the polling interval)."""
+        if self._watching:
+            await self._wake.wait()
+        else:
+            try:
+                await asyncio.wait_for(self._wake.wait(), UI_UPDATE_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+        self._wake.clear()
+
+
+def resize_terminal():
+    """Tells curses about the new terminal size after a SIGWINCH."""
+    try:
+        size = os.get_terminal_size(sys.__stdout__.fileno())
+    except OSError:
+        return
+    curses.resizeterm(size.lines, size.columns)
+
+
+async def live(
+    stdscr: "curses._CursesWindow",
+    get: Callable[[str, dict], Any],
+    schedule_cache: Union[ScheduleCache, None] = None,
+):
+    fetcher = AsyncFetcher()
+    try:
+        await watch_game(stdscr, fetcher, get, schedule_cache)
+    finally:
+        fetcher.close()
+
+
+async def dashboard(stdscr: "curses._CursesWindow", get: Callable[[str, dict], Any]):
+    fetcher = AsyncFetcher(max_workers=MAX_CONCURRENT_REQUESTS)
+    try:
+        await multi_game(stdscr, fetcher, get)
+    finally:
+        fetcher.close()
+
+
+async def choose_game(
+    stdscr: "curses._CursesWindow",
+    fetcher: AsyncFetcher,
+    get: Callable[[str, dict], Any],
+    events: "UIEvents",
+    schedule_cache: Union[ScheduleCache, None] = None,
+) -> Union[dict, None]:
+    """Game selection screen.
+
+    The cached schedule (or a loading message) is shown right away while
+    today's schedule is fetched in the background, and replaced by it once
+    it arrives. Pressing s switches to a scoreboard of the whole slate,
+    refreshed every SCOREBOARD_INTERVAL with a single schedule request and
+    only repainted when it changed.
+
+    Returns:
+        The chosen game's schedule entry, None if the user quit.
+    """
+    cached = schedule_cache.load() if schedule_cache is not None else None
+    bs, gt = cached if cached is not None else (None, "Loading today's games...")
+    loop = asyncio.get_running_loop()
+
+    def refresh() -> asyncio.Future:
+        future = asyncio.ensure_future(
+            fetcher.fetch("schedule", lambda: BaseballSchedule(get=get))
+        )
+        future.add_done_callback(lambda _: events.notify())
+        return future
+
+    fresh = refresh()
+    fetched = loop.time()
+    updated = False
+    scoreboard = False
+    board = None  # (schedule, its scoreboard table)
+    refresh_timer = None
+    shown = None
+    game_id = ""
+    try:
+        while True:
+            if fresh is not None and fresh.done():
+                if fresh.exception() is None:
+                    bs = fresh.result()
+                    gt = bs.games_today()
+                    if schedule_cache is not None:
+                        schedule_cache.save(bs, gt)
+                elif bs is None:
+                    gt = "Could not load today's games (q: quit)"
+                fresh = None
+                updated = True
+            if scoreboard and fresh is None:
+                wait = fetched + SCOREBOARD_INTERVAL - loop.time()
+                if wait <= 0:
+                    fresh = refresh()
+                    fetched = loop.time()
+                elif refresh_timer is None or refresh_timer.when() <= loop.time():
+                    # timers may fire a clock tick early
+                    refresh_timer = loop.call_later(wait, events.notify)
+            if scoreboard and bs is not None:
+                if board is None or board[0] is not bs:
+                    board = (bs, bs.scoreboard())
+                table = board[1]
+            else:
+                table = gt
+            if fresh is not None and bs is not None and not updated:
+                note = "Updating..."
+            else:
+                note = "s: game list" if scoreboard else "s: scoreboard"
+            screen = (table, stdscr.getmaxyx(), game_id, note)
+            if screen != shown:
+                display_games_today(stdscr, *screen)
+                shown = screen
+
+            await events.wait()
+            if events.resized:
+                events.resized = False
+                resize_terminal()
+            key = stdscr.getch()
+            while key != -1:
+                if key == ord("q"):
+                    return None
+                elif key in (curses.KEY_ENTER, ord("\n"), ord("\r")):
+                    if (
+                        bs is not None
+                        and game_id.isdigit()
+                        and 1 <= int(game_id) <= len(bs.schedule)
+                    ):
+                        return bs.id_to_game(game_id)
+                    game_id = ""
+                elif key in (curses.KEY_BACKSPACE, 127, 8):
+                    game_id = game_id[:-1]
+                elif ord("0") <= key <= ord("9") and len(game_id) < 3:
+                    game_id += chr(key)
+                elif key == ord("s"):
+                    scoreboard = not scoreboard
+                key = stdscr.getch()
+    finally:
+        if refresh_timer is not None:
+            refresh_timer.cancel()
+        if fresh is not None:
+            fresh.cancel()
+
+
+async def countdown(
+    stdscr: "curses._CursesWindow",
+    fetcher: AsyncFetcher,
+    get: Callable[[str, dict], Any],
+    events: "UIEvents",
+    game: dict,
+) -> bool:
+    """Counts down to the first pitch of a game that hasn't started.
+
+    The game's state is rechecked every PREVIEW_INTERVAL with a schedule
+    request, so an early start (or a stale cached schedule) is noticed.
+
+    Returns:
+        True once the game is PREGAME_LEAD from its first pitch or has
+        started, False if the user quit.
+    """
+    gamePk = game["game_id"]
+    start = first_pitch_time(game)
+    loop = asyncio.get_running_loop()
+
+    async def check_state():
+        while True:
+            try:
+                state = await fetcher.fetch(
+                    ("state", gamePk), BaseballSchedule.check_game_state, gamePk, get
+                )
+            except Exception:
+                state = "Preview"  # keep counting down
+            if state != "Preview":
+                return
+            await asyncio.sleep(PREVIEW_INTERVAL)
+
+    checking = asyncio.ensure_future(check_state())
+    checking.add_done_callback(lambda _: events.notify())
+    tick = None
+    try:
+        while True:
+            remaining = start - time.time()
+            if checking.done() or remaining <= PREGAME_LEAD:
+                return True
+            display_countdown(stdscr, game, remaining, stdscr.getmaxyx())
+            tick = loop.call_later(1, events.notify)
+
+            await events.wait()
+            tick.cancel()
+            if events.resized:
+                events.resized = False
+                resize_terminal()
+            key = stdscr.getch()
+            while key != -1:
+                if key == ord("q"):
+                    return False
+                key = stdscr.getch()
+    finally:
+        if tick is not None:
+            tick.cancel()
+        checking.cancel()
+
+
+async def watch_game(
+    stdscr: "curses._CursesWindow",
+    fetcher: AsyncFetcher,
+    get: Callable[[str, dict], Any],
+    schedule_cache: Union[ScheduleCache, None] = None,
+):
     # Display games today
     DELAY = 0  # seconds
-    bs = BaseballSchedule()
-    gt = bs.games_today()
-    dims = stdscr.getmaxyx()
-    game_id = display_games_today(stdscr, gt, dims)
-    gamePk = bs.id_to_gamepk(game_id)
-    game_state = bs.check_game_state(gamePk)
-    if game_state == "Preview":
+    events = UIEvents()
+    curses.curs_set(False)
+    stdscr.nodelay(1)  # this is to make getch non-blocking
+    events.attach()
+    try:
+        game = await choose_game(stdscr, fetcher, get, events, schedule_cache)
+        if game is None:
+            return None
+        gamePk = game["game_id"]
+        # the schedule tells the state, the first full feed is the live view's
+        if schedule_game_state(game["status"]) == "Preview":
+            if not await countdown(stdscr, fetcher, get, events, game):
+                return None
+
+        current_screen_mode = LIVE_MODE
+        snapshots = TimeShiftBuffer(max_age=MAX_DELAY)
+        feed = GameFeed(gamePk, get, FEED_SUBTREES)
+        stats_cache = PlayerStatsCache(
+            fetcher, ttl=STATS_UPDATE_INTERVAL, on_update=events.notify, get=get
+        )
+        # both rosters in two requests, so Stat Mode rarely waits on a player;
+        # this is also what covers relievers, bullpens included
+        stats_cache.preload((game["away_id"], game["home_id"]))
+
+        scheduler = PollScheduler(base_interval=API_UPDATE_INTERVAL)
+        last_poll = time.monotonic()
+
+        async def retrieve_api_data():
+            nonlocal last_poll
+            while True:
+                try:
+                    with METRICS.timer("poll_seconds"):
+                        api_data = await fetcher.fetch(("live", gamePk), feed.poll)
+                except Exception:
+                    # keep showing the last good snapshot while backing off
+                    METRICS.count("poll_errors_total")
+                    decision = scheduler.failure()
+                else:
+                    last_poll = time.monotonic()
+                    latest = snapshots.latest()
+                    if latest is None or latest.timecode != api_data.snapshot.timecode:
+                        snapshots.push(api_data.snapshot)
+                        events.notify()
+                    decision = scheduler.success(api_data.snapshot)
+                if METRICS.enabled:
+                    for name, value in scheduler.metrics().items():
+                        METRICS.set(name, value)
+                if decision.stop:
+                    break
+                await asyncio.sleep(decision.interval)
+
+        api_data_task = asyncio.create_task(retrieve_api_data())
+        renderer = LiveRenderer(stdscr)
+        loop = asyncio.get_running_loop()
+        delay_timer = None
+        hud_timer = None
+
+        running = True
+        while running:
+            # show the snapshot that was live DELAY seconds ago
+            snapshot = snapshots.at(DELAY)
+            METRICS.set("feed_staleness_seconds", time.monotonic() - last_poll)
+            stats = (None, None)
+            if snapshot is not None and current_screen_mode == STAT_MODE:
+                stats = (
+                    stats_cache.get(BatterStats, snapshot.batter_id),
+                    stats_cache.get(PitcherStats, snapshot.pitcher_id),
+                )
+            if snapshot is not None:
+                # the next hitters' stats, fetched before they come up; relievers
+                # aren't known in advance and come from the roster preload
+                for batter_id in snapshot.upcoming_batter_ids:
+                    stats_cache.get(BatterStats, batter_id)
+            if snapshot is not None and current_screen_mode in HISTORY_LABELS:
+                snapshot = pitch_history(snapshot, feed.pitches, current_screen_mode)
+            renderer.render(current_screen_mode, snapshot, stats, DELAY)
+
+            # wake up again when the delayed view reaches the next snapshot
+            if delay_timer is not None:
+                delay_timer.cancel()
+                delay_timer = None
+            if DELAY > 0:
+                due = snapshots.next_change(DELAY)
+                if due is not None:
+                    delay_timer = loop.call_later(due, events.notify)
+            # keep the overlay's figures moving while it is shown
+            if hud_timer is not None:
+                hud_timer.cancel()
+                hud_timer = None
+            if renderer.hud.visible:
+                hud_timer = loop.call_later(HUD_INTERVAL, events.notify)
+
+            await events.wait()
+            if events.resized:
+                events.resized = False
+                resize_terminal()
+
+            # drain every pending key, getch returns -1 once stdin is empty
+            key = stdscr.getch()
+            while key != -1:
+                if key == ord("q"):
+                    running = False
+                    break
+                elif key == ord("j"):
+                    current_screen_mode = STAT_MODE
+                elif key == ord("k"):
+                    current_screen_mode = LIVE_MODE
+                elif key == ord("p"):
+                    current_screen_mode = PITCHER_MODE
+                elif key == ord("b"):
+                    current_screen_mode = BATTER_MODE
+                elif key == ord("h"):
+                    DELAY = min(DELAY + 5, MAX_DELAY)
+                elif key == ord("l"):
+                    DELAY -= 5
+                    if DELAY < 0:
+                        DELAY = 0
+                elif key == ord("m"):
+                    renderer.toggle_hud()
+                key = stdscr.getch()
+
+        for timer in (delay_timer, hud_timer):
+            if timer is not None:
+                timer.cancel()
+        api_data_task.cancel()
+
+        try:
+            await api_data_task
+        except asyncio.CancelledError:
+            pass
+    finally:
+        events.detach()
+
+
+async def multi_game(
+    stdscr: "curses._CursesWindow",
+    fetcher: AsyncFetcher,
+    get: Callable[[str, dict], Any],
+):
+    from baseball_live.dashboard import MultiGameWatcher
+
+    stdscr.erase()
+    stdscr.addstr(0, 0, "Loading today's games...")
+    stdscr.refresh()
+    bs = await fetcher.fetch("schedule", lambda: BaseballSchedule(get=get))
+    games = {
+        game["game_id"]: f"{game['away_name']} @ {game['home_name']}"
+        for game in bs.games_in_progress()
+    }
+    if not games:
         stdscr.erase()
-        stdscr.addstr(0, 0, "Game has not started yet!")
+        stdscr.addstr(0, 0, "No games in progress!")
         stdscr.getch()
         return None
 
-    current_screen_mode = LIVE_MODE
-    api_data = BaseballLive(gamePk)
+    events = UIEvents()
+    watcher = MultiGameWatcher(games, fetcher, get, on_update=events.notify)
+    renderer = DashboardRenderer(stdscr)
+    curses.curs_set(False)
+    stdscr.nodelay(1)
+    events.attach()
+    try:
+        watcher.start()
 
-    async def retrieve_api_data():
-        nonlocal api_data
-        while True:
-            try:
-                api_data = BaseballLive(gamePk)
-            except Exception as e:
-                api_data = None
-            await asyncio.sleep(API_UPDATE_INTERVAL)
+        loop = asyncio.get_running_loop()
+        hud_timer = None
 
-    api_data_task = asyncio.create_task(retrieve_api_data())
-    stdscr.erase()
-    stdscr.nodelay(1)  # this is to make getch non-blocking
+        running = True
+        while running:
+            renderer.render(watcher)
+            if hud_timer is not None:
+                hud_timer.cancel()
+                hud_timer = None
+            if renderer.hud.visible:
+                hud_timer = loop.call_later(HUD_INTERVAL, events.notify)
+            await events.wait()
+            if events.resized:
+                events.resized = False
+                resize_terminal()
 
-    while True:
-        stdscr.refresh()
-        stdscr.erase()
-        gd = GameDisplay(stdscr)
-        if api_data:
-            api_data: BaseballLive
-
-            if current_screen_mode == LIVE_MODE:
-                if DELAY > 0:
-                    await asyncio.sleep(DELAY)
-                display_live(gd, api_data)
-            elif current_screen_mode == STAT_MODE:
-                stdscr.erase()
-                display_stats(gd, api_data)
-
-            stdscr.refresh()
             key = stdscr.getch()
-            if key == ord("q"):
-                break
-            elif key == ord("j"):
-                current_screen_mode = STAT_MODE
-            elif key == ord("k"):
-                current_screen_mode = LIVE_MODE
-            elif key == ord("h"):
-                DELAY += 5
-                gd.delay(DELAY)
-                await asyncio.sleep(0.5)
-            elif key == ord("l"):
-                DELAY -= 5
-                if DELAY < 0:
-                    DELAY = 0
-                gd.delay(DELAY)
-                await asyncio.sleep(0.5)
-
-        await asyncio.sleep(UI_UPDATE_INTERVAL)
-
-    api_data_task.cancel()
+            while key != -1:
+                if key == ord("q"):
+                    running = False
+                    break
+                elif key in (ord("n"), ord("\t"), curses.KEY_RIGHT):
+                    watcher.move_focus(1)
+                elif key in (ord("p"), curses.KEY_BTAB, curses.KEY_LEFT):
+                    watcher.move_focus(-1)
+                elif key == ord("m"):
+                    renderer.toggle_hud()
+                key = stdscr.getch()
 
-    try:
-        await api_data_task
-    except asyncio.CancelledError:
-        pass
+        if hud_timer is not None:
+            hud_timer.cancel()
+        await watcher.stop()
+    finally:
+        events.detach()
 
 
-def run_curses(stdscr):
+def run_curses(stdscr, args: Union[argparse.Namespace, None] = None):
     # Setting up color pairs
     if check_color_support():
         curses.start_color()
@@ -364,12 +1349,230 @@ def run_curses(stdscr):
             curses.init_pair(i + 1, i, -1)
     else:
         raise TerminalColorException("Terminal does not support 256 color")
-    asyncio.run(live(stdscr))
+    if args is None:
+        args = parse_args([])
+    transports = LazyTransports(args)
+    get = transports.get
+    exporter = None
+    if args.metrics:
+        METRICS.enabled = True
+        exporter = MetricsExporter(args.metrics, interval=args.metrics_interval)
+    try:
+        if args.multi:
+            asyncio.run(exporting(dashboard(stdscr, get), exporter))
+        else:
+            schedule_cache = None if args.replay or args.no_cache else ScheduleCache()
+            asyncio.run(exporting(live(stdscr, get, schedule_cache), exporter))
+    finally:
+        transports.close()
+
+
+def run_stream(args: argparse.Namespace) -> int:
+    """Streams game events to stdout as NDJSON lines, no terminal needed.
+
+    Returns:
+        The exit status, 1 if the reader went away before the end.
+    """
+    from baseball_live.stream import stream
+
+    transports = open_transports(args)
+    get = transports[-1].get
+    exporter = None
+    if args.metrics:
+        METRICS.enabled = True
+        exporter = MetricsExporter(args.metrics, interval=args.metrics_interval)
+    app = stream(
+        sys.stdout.buffer, args.stream, get, args.backpressure, args.queue_size
+    )
+    try:
+        asyncio.run(exporting(app, exporter))
+    except BrokenPipeError:
+        # keep the interpreter's final flush of stdout from failing again
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    finally:
+        for transport in reversed(transports):
+            transport.close()
+    return 0
+
+
+async def exporting(app, exporter: Union[MetricsExporter, None]):
+    """Runs app while exporter (if any) dumps the metrics in the background."""
+    if exporter is None:
+        return await app
+    task = asyncio.ensure_future(exporter.run())
+    try:
+        return await app
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+def run_daemon(args: argparse.Namespace) -> int:
+    """Polls games for the viewers connected to the socket until interrupted."""
+    from baseball_live.daemon import serve
+
+    transports = open_transports(args)
+    exporter = None
+    if args.metrics:
+        METRICS.enabled = True
+        exporter = MetricsExporter(args.metrics, interval=args.metrics_interval)
+    try:
+        asyncio.run(exporting(serve(args.serve, transports[-1].get), exporter))
+    finally:
+        for transport in reversed(transports):
+            transport.close()
+    return 0
+
+
+def open_transports(args: argparse.Namespace) -> list:
+    """The transports requested on the command line, outermost last."""
+    from baseball_live.transport import (
+        HttpTransport,
+        RecordingTransport,
+        ReplayTransport,
+    )
+
+    if args.replay:
+        return [ReplayTransport(args.replay, speed=args.speed or None)]
+    if args.connect:
+        from baseball_live.daemon import DaemonTransport
+
+        return [DaemonTransport(args.connect)]
+    transports = [HttpTransport(pool_size=MAX_CONCURRENT_REQUESTS)]
+    if args.record:
+        # record what the StatsAPI answered, never cached responses
+        transports.append(RecordingTransport(args.record, transports[-1].get))
+    elif not args.no_cache:
+        transports.append(DiskCache(get=transports[-1].get))
+    return transports
+
+
+class LazyTransports:
+    """The transports requested on the command line, opened by the first
+    request so the terminal can paint before the transport modules load.
+    """
+
+    def __init__(self, args: argparse.Namespace):
+        """Initialize LazyTransports with the parsed command line."""
+        self.args = args
+        self._transports: Union[list, None] = None
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str, params: dict) -> Union[dict, list]:
+        """Calls a StatsAPI endpoint through the outermost transport."""
+        with self._lock:
+            if self._transports is None:
+                self._transports = open_transports(self.args)
+            transport = self._transports[-1]
+        return transport.get(endpoint, params)
+
+    def close(self):
+        """Closes the transports opened, if any."""
+        with self._lock:
+            for transport in reversed(self._transports or ()):
+                transport.close()
+
+
+def parse_args(argv: Union[List[str], None] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="baseball_live",
+        description="Visualize live MLB at-bats on the terminal.",
+    )
+    parser.add_argument(
+        "--multi",
+        action="store_true",
+        help="watch every game in progress on one dashboard",
+    )
+    parser.add_argument(
+        "--stream",
+        nargs="*",
+        type=int,
+        metavar="GAMEPK",
+        help="write the pitches, plays, score and inning changes of the games "
+        "(every game today if none given) to stdout as JSON lines, no terminal",
+    )
+    parser.add_argument(
+        "--backpressure",
+        choices=POLICIES,
+        default=BLOCK,
+        help="when the --stream reader falls behind, wait for it (block) or "
+        f"drop the oldest of --queue-size waiting events (drop) (default: {BLOCK})",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=QUEUE_SIZE,
+        help=f"events waiting for a slow --stream reader (default: {QUEUE_SIZE})",
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
+        "--record",
+        metavar="PATH",
+        help="save every StatsAPI response to a capture file (implies --no-cache)",
+    )
+    source.add_argument(
+        "--connect",
+        nargs="?",
+        const=SOCKET_PATH,
+        metavar="SOCKET",
+        help="get games from a --serve daemon instead of polling the StatsAPI "
+        f"(default: {SOCKET_PATH})",
+    )
+    source.add_argument(
+        "--replay",
+        metavar="PATH",
+        help="replay a capture file instead of calling the StatsAPI",
+    )
+    parser.add_argument(
+        "--serve",
+        nargs="?",
+        const=SOCKET_PATH,
+        metavar="SOCKET",
+        help="run as a daemon polling each game once for every viewer started "
+        f"with --connect, no terminal (default: {SOCKET_PATH})",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="don't keep schedules and player stats on disk between runs",
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="replay speed, 0 for as fast as possible (default: 1)",
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="PATH",
+        help="dump metrics to PATH, Prometheus text if it ends in .prom, "
+        "NDJSON otherwise",
+    )
+    parser.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=EXPORT_INTERVAL,
+        help=f"seconds between metrics dumps (default: {EXPORT_INTERVAL})",
+    )
+    return parser.parse_args(argv)
 
 
 def main():
+    args = parse_args()
+    if args.serve:
+        try:
+            sys.exit(run_daemon(args))
+        except KeyboardInterrupt:
+            sys.exit(0)
+    if args.stream is not None:
+        try:
+            sys.exit(run_stream(args))
+        except KeyboardInterrupt:
+            sys.exit(130)
     try:
-        curses.wrapper(run_curses)
+        curses.wrapper(run_curses, args)
     except KeyboardInterrupt:
         curses.endwin()
 
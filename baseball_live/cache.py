@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+import asyncio
+import datetime
+import json
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from baseball_live.baseball_live import (
+    BaseballSchedule,
+    BaseballStats,
+    api_get,
+    roster_stats,
+)
+from baseball_live.fetcher import AsyncFetcher
+from baseball_live.metrics import METRICS
+
+STATS_TTL = 300  # seconds
+STATS_RETRY_INTERVAL = 10  # seconds
+STATS_CACHE_SIZE = 128  # entries
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "baseball_live",
+)
+# seconds, endpoints not listed are never cached; schedules are kept by
+# ScheduleCache instead, and every scoreboard refresh fetches
+DISK_CACHE_TTLS = {
+    "person": 3600,
+    "team_roster": 3600,
+}
+DISK_CACHE_MAX_STALE = {  # seconds past its TTL a response is still served
+    # while it revalidates, endpoints not listed are fetched again at once
+    "person": 24 * 3600,
+    "team_roster": 24 * 3600,
+}
+DISK_CACHE_BYTES = 32 * 1024 * 1024  # compressed responses kept on disk
+DISK_CACHE_TIMEOUT = 5  # seconds to wait on another process' write lock
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries go stale after a fixed TTL.
+
+    Stale entries are still returned by get; use is_fresh to decide whether
+    to refresh them.
+
+    Attributes:
+        ttl (float): Seconds an entry stays fresh after it is put.
+        maxsize (int): Maximum number of entries, least recently used are
+        evicted first.
+    """
+
+    def __init__(
+        self, ttl: float, maxsize: int, clock: Callable[[], float] = time.monotonic
+    ):
+        """Initialize TTLCache with ttl, maxsize and optional clock."""
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the value for key (fresh or stale) or default."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def is_fresh(self, key: Hashable) -> bool:
+        """Whether key is cached and younger than ttl."""
+        entry = self._entries.get(key)
+        return entry is not None and self._clock() - entry[0] < self.ttl
+
+    def put(self, key: Hashable, value: Any):
+        """Stores value for key, evicting the least recently used entry."""
+        self._entries[key] = (self._clock(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class PlayerStatsCache:
+    """Season stats cache keyed by player id, stat group and season.
+
+    get never blocks, it returns whatever is cached and schedules a
+    background refresh through the AsyncFetcher when the entry is missing
+    or stale. Concurrent refreshes of the same key are coalesced by the
+    fetcher and failed refreshes are retried at most every retry_interval.
+    preload fills it with whole rosters at once, so players who come up
+    later are already cached.
+    """
+
+    def __init__(
+        self,
+        fetcher: AsyncFetcher,
+        ttl: float = STATS_TTL,
+        maxsize: int = STATS_CACHE_SIZE,
+        retry_interval: float = STATS_RETRY_INTERVAL,
+        on_update: Optional[Callable[[], None]] = None,
+        get: Callable[[str, dict], Any] = api_get,
+    ):
+        """Initialize PlayerStatsCache with the fetcher used for refreshes, an
+        optional callback run whenever a refresh stores new stats and the
+        StatsAPI get function the stats are fetched with.
+        """
+        self.fetcher = fetcher
+        self._get = get
+        self.on_update = on_update
+        self._cache = TTLCache(ttl, maxsize)
+        self._attempts = TTLCache(retry_interval, maxsize)
+
+    def get(
+        self,
+        stats_cls: Type[BaseballStats],
+        player_id: int,
+        season: Optional[int] = None,
+    ) -> Optional[BaseballStats]:
+        """Cached stats for player_id, or None if never fetched.
+
+        Must be called from a running event loop.
+
+        Args:
+            stats_cls (type): BatterStats or PitcherStats.
+            player_id (int): The player id.
+            season (int): Optional season (default: current season).
+        """
+        key = (player_id, stats_cls.group, season)
+        if not self._cache.is_fresh(key) and not self._attempts.is_fresh(key):
+            self._attempts.put(key, True)
+            asyncio.ensure_future(self._refresh(key, stats_cls, player_id, season))
+        return self._cache.get(key)
+
+    def preload(self, team_ids: Iterable[int], season: Optional[int] = None):
+        """Schedules a background fetch of the stats of every player on the
+        active rosters of team_ids, one request per team.
+
+        Must be called from a running event loop.
+
+        Args:
+            team_ids (iterable): The teams, e.g. both teams of a game.
+            season (int): Optional season (default: current season).
+        """
+        for team_id in team_ids:
+            key = ("roster", team_id, season)
+            if not self._attempts.is_fresh(key):
+                self._attempts.put(key, True)
+                asyncio.ensure_future(self._preload(key, team_id, season))
+
+    async def _preload(self, key: tuple, team_id: int, season: Optional[int]):
+        try:
+            roster = await self.fetcher.fetch(
+                key, roster_stats, team_id, season, self._get
+            )
+        except Exception:
+            return
+        for stats in roster:
+            self._cache.put((stats.player_id, stats.group, season), stats)
+        if self.on_update is not None:
+            self.on_update()
+
+    async def _refresh(
+        self,
+        key: tuple,
+        stats_cls: Type[BaseballStats],
+        player_id: int,
+        season: Optional[int],
+    ):
+        try:
+            stats = await self.fetcher.fetch(
+                ("stats",) + key, stats_cls, player_id, season, self._get
+            )
+        except Exception:
+            return
+        self._cache.put(key, stats)
+        if self.on_update is not None:
+            self.on_update()
+
+
+class ScheduleCache:
+    """Today's schedule as last fetched, kept on disk between runs.
+
+    Lets the game list be shown at startup before the StatsAPI answers.
+    Along with the response the rendered games_today table is stored, so
+    showing the cached list needs neither arrow nor tabulate.
+    """
+
+    def __init__(
+        self,
+        path: str = os.path.join(CACHE_DIR, "schedule.json"),
+        today: Callable[[], datetime.date] = datetime.date.today,
+    ):
+        """Initialize ScheduleCache with optional file path and clock."""
+        self.path = path
+        self._today = today
+
+    def load(self) -> Optional[Tuple[BaseballSchedule, str]]:
+        """The cached schedule and its table, None unless saved today."""
+        try:
+            with open(self.path) as f:
+                cached = json.load(f)
+            if cached["date"] != self._today().isoformat():
+                return None
+            schedule = BaseballSchedule(cached["timezone"], response=cached["response"])
+            return schedule, cached["table"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, schedule: BaseballSchedule, table: Optional[str] = None):
+        """Stores schedule (and its games_today table) as today's.
+
+        A schedule of another day's games, e.g. one fetched just before
+        midnight, is not stored.
+        """
+        today = self._today().isoformat()
+        if any(game["game_date"] != today for game in schedule.schedule):
+            return
+        cached = {
+            "date": today,
+            "timezone": schedule.timezone,
+            "response": schedule.response,
+            "table": table if table is not None else schedule.games_today(),
+        }
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(cached, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass  # the cache is only an optimization
+
+
+class DiskCache:
+    """Wraps a StatsAPI get function with a cache kept in an SQLite file.
+
+    Responses are keyed by endpoint and parameters and go stale after the
+    TTL of their endpoint; endpoints without a TTL go straight to the
+    wrapped get. A stale response is returned as is while a background
+    thread revalidates it, for at most max_stale seconds past its TTL, so
+    only a response never fetched before (or long expired) waits on the
+    network. Endpoints without a max_stale are never served stale. Once the
+    compressed responses outgrow max_bytes the least recently used are
+    evicted.
+
+    The file may be shared by several processes: it is opened in WAL mode
+    and writers wait up to DISK_CACHE_TIMEOUT on each other. Database errors
+    are never raised, the request is then passed through uncached.
+
+    Attributes:
+        path (str): The SQLite file.
+        ttls (dict): Seconds a response stays fresh, per endpoint.
+        max_stale (dict): Seconds past its TTL a response may still be
+        served while it revalidates, per endpoint (default: 0).
+        max_bytes (int): Size bound of the stored responses.
+    """
+
+    def __init__(
+        self,
+        path: str = os.path.join(CACHE_DIR, "responses.sqlite"),
+        get: Callable[[str, dict], Any] = api_get,
+        ttls: Dict[str, float] = DISK_CACHE_TTLS,
+        max_stale: Dict[str, float] = DISK_CACHE_MAX_STALE,
+        max_bytes: int = DISK_CACHE_BYTES,
+        clock: Callable[[], float] = time.time,
+        background: Union[Callable[[Callable[[], None]], None], None] = None,
+    ):
+        """Initialize DiskCache with the file path and the get function whose
+        responses are cached. background runs revalidations (default: one
+        daemon thread each). The database is only opened by the first get.
+        """
+        self.path = path
+        self.ttls = ttls
+        self.max_stale = max_stale
+        self.max_bytes = max_bytes
+        self._get = get
+        self._clock = clock
+        self._background = background or self._thread
+        self._db = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._revalidating = set()
+
+    @staticmethod
+    def _thread(func: Callable[[], None]):
+        threading.Thread(target=func, daemon=True).start()
+
+    def _connect(self):
+        import sqlite3
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        db = sqlite3.connect(
+            self.path,
+            timeout=DISK_CACHE_TIMEOUT,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, fetched REAL, accessed REAL, "
+            "size INTEGER, body BLOB)"
+        )
+        db.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+        )
+        return db
+
+    def _query(self, func: Callable[[Any], Any]) -> Any:
+        """Runs func with the database, None if it is unavailable."""
+        import sqlite3
+
+        with self._lock:
+            if self._closed:
+                return None
+            try:
+                if self._db is None:
+                    self._db = self._connect()
+                return func(self._db)
+            except (sqlite3.Error, OSError):
+                return None
+
+    def get(self, endpoint: str, params: dict) -> Union[dict, list]:
+        """Answers a StatsAPI request from the cache, or the wrapped get."""
+        from baseball_live.transport import loads, request_key
+
+        ttl = self.ttls.get(endpoint)
+        if ttl is None:
+            return self._get(endpoint, params)
+        key = request_key(endpoint, params)
+        now = self._clock()
+
+        def lookup(db):
+            row = db.execute(
+                "SELECT fetched, body FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                db.execute(
+                    "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+                )
+            return row
+
+        row = self._query(lookup)
+        if row is None:
+            METRICS.count("disk_cache_misses_total")
+            return self._fetch(key, endpoint, params)
+        fetched, body = row
+        try:
+            response = loads(zlib.decompress(body))
+        except (zlib.error, ValueError):
+            METRICS.count("disk_cache_misses_total")
+            return self._fetch(key, endpoint, params)
+        age = now - fetched
+        if age < ttl:
+            METRICS.count("disk_cache_hits_total")
+        elif age < ttl + self.max_stale.get(endpoint, 0):
+            METRICS.count("disk_cache_stale_total")
+            self._revalidate(key, endpoint, params)
+        else:
+            METRICS.count("disk_cache_misses_total")
+            return self._fetch(key, endpoint, params)
+        return response
+
+    def _fetch(self, key: str, endpoint: str, params: dict) -> Union[dict, list]:
+        response = self._get(endpoint, params)
+        self._put(key, response)
+        return response
+
+    def _revalidate(self, key: str, endpoint: str, params: dict):
+        with self._lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+
+        def refresh():
+            try:
+                self._fetch(key, endpoint, params)
+            except Exception:
+                pass  # keep serving the stale response
+            finally:
+                with self._lock:
+                    self._revalidating.discard(key)
+
+        self._background(refresh)
+
+    def _put(self, key: str, response: Union[dict, list]):
+        body = zlib.compress(json.dumps(response, separators=(",", ":")).encode())
+        now = self._clock()
+
+        def put(db):
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                    (key, now, now, len(body), body),
+                )
+                total = db.execute("SELECT SUM(size) FROM responses").fetchone()[0]
+                if total > self.max_bytes:
+                    self._evict(db, total - self.max_bytes)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+        self._query(put)
+
+    @staticmethod
+    def _evict(db, excess: int):
+        """Deletes least recently used responses until excess bytes are freed."""
+        keys = []
+        for key, size in db.execute(
+            "SELECT key, size FROM responses ORDER BY accessed"
+        ):
+            if excess <= 0:
+                break
+            keys.append((key,))
+            excess -= size
+        db.executemany("DELETE FROM responses WHERE key = ?", keys)
+
+    def close(self):
+        """Closes the database; later gets pass through uncached."""
+        with self._lock:
+            self._closed = True
+            if self._db is not None:
+                self._db.close()
+                self._db = None
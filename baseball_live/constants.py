@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+import os
+import tempfile
+
+# Defaults shown by the command line, kept apart from the modules using them
+# so parsing the arguments doesn't load those modules.
+# the daemon's socket, in a directory only its user may enter
+SOCKET_DIR = os.environ.get("XDG_RUNTIME_DIR") or os.path.join(
+    tempfile.gettempdir(), f"baseball_live-{os.getuid()}"
+)
+SOCKET_PATH = os.path.join(SOCKET_DIR, "baseball_live.sock")
+MAX_CONCURRENT_REQUESTS = 4
+QUEUE_SIZE = 1024  # events held back while the reader is slow
+BLOCK = "block"  # a full queue holds up the polls until there is room
+DROP = "drop"  # a full queue drops its oldest event
+POLICIES = (BLOCK, DROP)
@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+import asyncio
+import os
+import socket
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Set, Union
+
+from baseball_live.baseball_live import REQUEST_TIMEOUT, LiveSnapshot, api_get
+from baseball_live.constants import MAX_CONCURRENT_REQUESTS, SOCKET_PATH
+from baseball_live.feed import FEED_SUBTREES, GameFeed, apply_patch
+from baseball_live.fetcher import AsyncFetcher
+from baseball_live.metrics import METRICS
+from baseball_live.scheduler import BASE_INTERVAL, PollScheduler
+from baseball_live.transport import dumps, loads, request_key
+
+VIEWER_BUFFER = 8 * 1024 * 1024  # bytes a viewer may fall behind before it is cut off
+MAX_PENDING = 1000  # messages kept for a game a viewer stopped polling
+# answered for viewers, the games themselves come by subscription
+VIEWER_ENDPOINTS = frozenset({"schedule", "person", "team_roster"})
+
+# Protocol: JSON lines both ways over a Unix socket.
+#   viewer -> daemon  {"op": "subscribe" | "unsubscribe", "gamePk": pk}
+#                     {"op": "get", "id": n, "endpoint": e, "params": p}
+#   daemon -> viewer  {"gamePk": pk, "game": document}   current state
+#                     {"gamePk": pk, "diff": operations} change since then
+#                     {"id": n, "response": r} or {"id": n, "error": text}
+
+
+def check_socket_dir(path: str, create: bool = False):
+    """Makes sure the directory of the socket at path is this user's alone,
+    so no one else can have put a socket of their own there.
+
+    Args:
+        path (str): The socket.
+        create (bool): Whether to create the directory (mode 0700) if
+        missing.
+
+    Raises:
+        PermissionError: If someone else owns or may enter the directory.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    if create:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+    status = os.stat(directory)
+    if status.st_uid != os.getuid() or status.st_mode & 0o077:
+        raise PermissionError(
+            f"{directory} must be yours alone (mode 0700) to hold the socket"
+        )
+
+
+class DaemonError(Exception):
+    """A request the daemon could not answer."""
+
+
+class GameChannel:
+    """One game, polled once for all of its subscribers.
+
+    Attributes:
+        gamePk (int): The game.
+        feed (GameFeed): The game document, kept current with diff patches.
+        game (dict): The document as last published (None before the first
+        poll).
+        subscribers (set): StreamWriter of every subscribed viewer.
+        scheduler (PollScheduler): Picks the game's next poll time.
+    """
+
+    def __init__(
+        self,
+        gamePk: int,
+        get: Callable[[str, dict], Any],
+        base_interval: float = BASE_INTERVAL,
+    ):
+        """Initialize GameChannel with gamePk and StatsAPI get function."""
+        self.gamePk = gamePk
+        self.feed = GameFeed(gamePk, get, FEED_SUBTREES)
+        self.game = None
+        self.subscribers: Set[asyncio.StreamWriter] = set()
+        self.scheduler = PollScheduler(base_interval=base_interval)
+        self.task: Union[asyncio.Task, None] = None
+        self._state = None
+
+    def state(self) -> bytes:
+        """The message carrying the whole document, encoded once per change."""
+        if self._state is None:
+            self._state = dumps({"gamePk": self.gamePk, "game": self.game}) + b"\n"
+        return self._state
+
+    def publish(self, game: dict, operations: Union[List[dict], None]) -> bytes:
+        """Makes game the current document and returns the message telling
+        subscribers about it: the operations, or the whole document if
+        there are none.
+        """
+        self.game = game
+        self._state = None
+        if operations is None:
+            return self.state()
+        return dumps({"gamePk": self.gamePk, "diff": operations}) + b"\n"
+
+
+class FanoutServer:
+    """Polls games once for any number of viewers of the same user.
+
+    Viewers connect to a Unix socket (see DaemonTransport) in a directory
+    only the user may enter (see check_socket_dir). A game is polled, with
+    a GameFeed and its own PollScheduler, while at least one viewer
+    subscribes to it. Its document is sent to every new subscriber right
+    away, and each change is encoded once and sent to all of them as the
+    patch operations the daemon applied. Requests to VIEWER_ENDPOINTS are
+    made on the viewers' behalf, identical requests in flight at the same
+    time sharing one upstream call, and others are refused. So upstream
+    requests don't grow with the number of viewers.
+
+    A viewer falling more than VIEWER_BUFFER bytes behind is disconnected;
+    its DaemonTransport connects again and starts over from the current
+    documents.
+
+    Attributes:
+        path (str): The socket.
+        channels (dict): GameChannel per subscribed gamePk.
+    """
+
+    def __init__(
+        self,
+        path: str = SOCKET_PATH,
+        get: Callable[[str, dict], Any] = api_get,
+        max_concurrent: int = MAX_CONCURRENT_REQUESTS,
+        base_interval: float = BASE_INTERVAL,
+    ):
+        """Initialize FanoutServer with the socket path, the StatsAPI get
+        function used upstream, the maximum number of requests in flight and
+        the poll interval of live games.
+        """
+        self.path = path
+        self.channels: Dict[int, GameChannel] = {}
+        self.fetcher = AsyncFetcher(max_workers=max_concurrent)
+        self.base_interval = base_interval
+        self._get = get
+        self._max_concurrent = max_concurrent
+        self._semaphore: Union[asyncio.Semaphore, None] = None
+        self._server = None
+
+    async def start(self):
+        """Listens on the socket, replacing a stale one.
+
+        Raises:
+            PermissionError: If the socket's directory isn't this user's
+            alone, see check_socket_dir.
+            OSError: If another daemon is listening on it already.
+        """
+        self._semaphore = asyncio.Semaphore(self._max_concurrent)
+        check_socket_dir(self.path, create=True)
+        if os.path.exists(self.path):
+            probe = socket.socket(socket.AF_UNIX)
+            try:
+                probe.connect(self.path)
+            except OSError:
+                os.unlink(self.path)  # left behind by a daemon that died
+            else:
+                raise OSError(f"A daemon is already listening on {self.path}")
+            finally:
+                probe.close()
+        self._server = await asyncio.start_unix_server(self._serve_viewer, self.path)
+
+    async def close(self):
+        """Stops listening and polling."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+        tasks = []
+        for channel in list(self.channels.values()):
+            for writer in list(channel.subscribers):
+                writer.transport.abort()
+            tasks.append(channel.task)
+            self._close_channel(channel)
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.fetcher.close()
+
+    def _send(self, writer: asyncio.StreamWriter, data: bytes):
+        if writer.is_closing():
+            return
+        writer.write(data)
+        if writer.transport.get_write_buffer_size() > VIEWER_BUFFER:
+            METRICS.count("daemon_viewers_dropped_total")
+            writer.transport.abort()
+
+    async def _serve_viewer(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        subscribed = set()
+        requests = set()
+        METRICS.count("daemon_viewers_total")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = loads(line)
+                op = message["op"]
+                if op == "subscribe":
+                    subscribed.add(message["gamePk"])
+                    self._subscribe(message["gamePk"], writer)
+                elif op == "unsubscribe":
+                    subscribed.discard(message["gamePk"])
+                    self._unsubscribe(message["gamePk"], writer)
+                elif op == "get":
+                    request = asyncio.ensure_future(self._answer(writer, message))
+                    requests.add(request)
+                    request.add_done_callback(requests.discard)
+        except (ConnectionError, ValueError, KeyError, TypeError):
+            pass  # viewer gone or talking nonsense, hang up
+        finally:
+            for request in requests:
+                request.cancel()
+            for gamePk in subscribed:
+                self._unsubscribe(gamePk, writer)
+            writer.close()
+
+    async def _answer(self, writer: asyncio.StreamWriter, message: dict):
+        endpoint, params = message["endpoint"], message["params"]
+        if endpoint not in VIEWER_ENDPOINTS or not isinstance(params, dict):
+            answer = {"id": message["id"], "error": f"Not served: {endpoint}"}
+            self._send(writer, dumps(answer) + b"\n")
+            return
+        try:
+            response = await self.fetcher.fetch(
+                request_key(endpoint, params), self._get, endpoint, params
+            )
+            answer = {"id": message["id"], "response": response}
+        except Exception as e:
+            answer = {"id": message["id"], "error": f"{type(e).__name__}: {e}"}
+        self._send(writer, dumps(answer) + b"\n")
+
+    def _subscribe(self, gamePk: int, writer: asyncio.StreamWriter):
+        channel = self.channels.get(gamePk)
+        if channel is None:
+            channel = GameChannel(gamePk, self._get, self.base_interval)
+            channel.task = asyncio.ensure_future(self._poll_game(channel))
+            self.channels[gamePk] = channel
+        channel.subscribers.add(writer)
+        METRICS.set("daemon_subscriptions", self._subscriptions())
+        if channel.game is not None:
+            self._send(writer, channel.state())
+
+    def _unsubscribe(self, gamePk: int, writer: asyncio.StreamWriter):
+        channel = self.channels.get(gamePk)
+        if channel is None:
+            return
+        channel.subscribers.discard(writer)
+        if not channel.subscribers:
+            self._close_channel(channel)
+        METRICS.set("daemon_subscriptions", self._subscriptions())
+
+    def _close_channel(self, channel: GameChannel):
+        channel.task.cancel()
+        del self.channels[channel.gamePk]
+
+    def _subscriptions(self) -> int:
+        return sum(len(channel.subscribers) for channel in self.channels.values())
+
+    async def _poll_game(self, channel: GameChannel):
+        feed = channel.feed
+        # changes read in the worker thread, published even if the wait
+        # for it timed out, so subscribers never miss an update
+        changes: Deque[tuple] = deque()
+
+        def poll() -> LiveSnapshot:
+            if feed.update():
+                changes.append((feed.game, feed.operations))
+            return LiveSnapshot.from_game(channel.gamePk, feed.game)
+
+        # checked too as a cancellation can get lost in AsyncFetcher.fetch's
+        # wait_for on Python < 3.12
+        while self.channels.get(channel.gamePk) is channel:
+            async with self._semaphore:
+                try:
+                    with METRICS.timer("poll_seconds"):
+                        snapshot = await self.fetcher.fetch(
+                            ("live", channel.gamePk), poll
+                        )
+                except Exception:
+                    METRICS.count("poll_errors_total")
+                    snapshot = None
+            while changes:
+                data = channel.publish(*changes.popleft())
+                for writer in list(channel.subscribers):
+                    self._send(writer, data)
+            if snapshot is None:
+                decision = channel.scheduler.failure()
+            else:
+                decision = channel.scheduler.success(snapshot)
+            if decision.stop:
+                return
+            await asyncio.sleep(decision.interval)
+
+
+async def serve(path: str = SOCKET_PATH, get: Callable[[str, dict], Any] = api_get):
+    """Runs a FanoutServer until cancelled."""
+    server = FanoutServer(path, get)
+    await server.start()
+    try:
+        await asyncio.Future()
+    finally:
+        await server.close()
+
+
+class DaemonTransport:
+    """StatsAPI get function served by a FanoutServer instead of the StatsAPI.
+
+    "game" requests subscribe to the game and return its current document,
+    "game_diff" requests return the changes received since the last
+    request as diff patches, so a GameFeed polls the daemon's subscription
+    without sending anything. Any other request is made by the daemon.
+
+    The connection is opened by the first get and opened again by the one
+    after it was lost, subscriptions then starting over from the current
+    documents. Safe to call from several worker threads at once.
+
+    Attributes:
+        path (str): The daemon's socket.
+        timeout (float): Seconds to wait for an answer.
+    """
+
+    def __init__(self, path: str = SOCKET_PATH, timeout: float = REQUEST_TIMEOUT):
+        """Initialize DaemonTransport with optional socket path and timeout."""
+        self.path = path
+        self.timeout = timeout
+        self._changed = threading.Condition()
+        self._sock: Union[socket.socket, None] = None
+        self._games: Dict[int, Deque[dict]] = {}
+        self._responses: Dict[int, dict] = {}
+        self._next_id = 0
+
+    def get(self, endpoint: str, params: dict) -> Union[dict, list]:
+        """Answers a StatsAPI request through the daemon.
+
+        Raises:
+            DaemonError: If the daemon's request failed.
+            OSError: If the daemon can't be reached or doesn't answer in time.
+        """
+        if endpoint == "game_diff" or (
+            endpoint == "game" and set(params) == {"gamePk"}
+        ):
+            return self._game(int(params["gamePk"]), endpoint == "game")
+        with self._changed:
+            sock = self._connect()
+            self._next_id += 1
+            request_id = self._next_id
+            self._send(
+                {"op": "get", "id": request_id, "endpoint": endpoint, "params": params}
+            )
+            self._wait(sock, lambda: request_id in self._responses)
+            answer = self._responses.pop(request_id)
+        if "error" in answer:
+            raise DaemonError(answer["error"])
+        return answer["response"]
+
+    def _game(self, gamePk: int, full: bool) -> Union[dict, list]:
+        with self._changed:
+            sock = self._connect()
+            messages = self._games.get(gamePk)
+            if full or messages is None:
+                messages = self._games[gamePk] = deque()
+                self._send({"op": "subscribe", "gamePk": gamePk})
+                self._wait(sock, lambda: any("game" in m for m in messages))
+            received = list(messages)
+            messages.clear()
+        # a whole document (the daemon fetched the game again) replaces
+        # everything before it
+        states = [i for i, message in enumerate(received) if "game" in message]
+        if not states:
+            return [{"diff": message["diff"]} for message in received]
+        game = received[states[-1]]["game"]
+        for message in received[states[-1] + 1 :]:
+            game = apply_patch(game, message["diff"])
+        return game
+
+    def _connect(self) -> socket.socket:
+        if self._sock is None:
+            check_socket_dir(self.path)
+            sock = socket.socket(socket.AF_UNIX)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.path)
+            except OSError:
+                sock.close()
+                raise
+            sock.settimeout(None)
+            self._sock = sock
+            self._games = {}
+            self._responses = {}
+            threading.Thread(
+                target=self._read,
+                args=(sock,),
+                name="baseball_live_daemon",
+                daemon=True,
+            ).start()
+        return self._sock
+
+    def _send(self, message: dict):
+        try:
+            self._sock.sendall(dumps(message) + b"\n")
+        except OSError:
+            self._disconnect(self._sock)
+            raise
+
+    def _wait(self, sock: socket.socket, predicate: Callable[[], bool]):
+        if not self._changed.wait_for(
+            lambda: predicate() or self._sock is not sock, self.timeout
+        ):
+            raise TimeoutError(f"No answer from the daemon at {self.path}")
+        if self._sock is not sock:
+            raise ConnectionError(f"Lost the connection to the daemon at {self.path}")
+
+    def _disconnect(self, sock: socket.socket):
+        if self._sock is sock:
+            self._sock = None
+            self._changed.notify_all()
+        try:
+            sock.shutdown(socket.SHUT_RDWR)  # wakes the reader thread
+        except OSError:
+            pass
+        sock.close()
+
+    def _read(self, sock: socket.socket):
+        try:
+            for line in sock.makefile("rb"):
+                message = loads(line)
+                with self._changed:
+                    if "id" in message:
+                        self._responses[message["id"]] = message
+                    else:
+                        messages = self._games.get(message["gamePk"])
+                        if messages is None:
+                            continue
+                        messages.append(message)
+                        if len(messages) > MAX_PENDING:
+                            # nobody polls the game anymore
+                            del self._games[message["gamePk"]]
+                            self._send(
+                                {"op": "unsubscribe", "gamePk": message["gamePk"]}
+                            )
+                    self._changed.notify_all()
+        except (OSError, ValueError):
+            pass
+        finally:
+            with self._changed:
+                self._disconnect(sock)
+
+    def close(self):
+        """Closes the connection."""
+        with self._changed:
+            if self._sock is not None:
+                self._disconnect(self._sock)
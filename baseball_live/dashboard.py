@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+import asyncio
+from typing import Any, Callable, Dict, List, Union
+
+from baseball_live.baseball_live import (
+    BaseballLive,
+    LiveSnapshot,
+    PitchStore,
+    api_get,
+)
+from baseball_live.constants import MAX_CONCURRENT_REQUESTS
+from baseball_live.feed import FEED_SUBTREES, GameFeed
+from baseball_live.fetcher import AsyncFetcher
+from baseball_live.metrics import METRICS
+from baseball_live.scheduler import PollDecision, PollScheduler
+
+FOCUS_INTERVAL = 5  # seconds
+BACKGROUND_INTERVAL = 20  # seconds
+
+
+class GameWatch:
+    """What the dashboard keeps for one game.
+
+    Only the focused game holds a GameFeed (and with it the full game
+    document), the others are fetched in full and reduced to a snapshot
+    right away, so memory per background game stays at one LiveSnapshot
+    and its PitchStore.
+
+    Attributes:
+        gamePk (int): The game.
+        title (str): Label shown on the dashboard, e.g. "Away @ Home".
+        snapshot (LiveSnapshot): Latest snapshot (None before the first poll).
+        scheduler (PollScheduler): Picks the game's next poll time.
+        pitches (PitchStore): Pitches seen so far.
+    """
+
+    def __init__(
+        self,
+        gamePk: int,
+        title: str,
+        get: Callable[[str, dict], Any] = api_get,
+        base_interval: float = FOCUS_INTERVAL,
+    ):
+        """Initialize GameWatch with gamePk, title and StatsAPI get function."""
+        self.gamePk = gamePk
+        self.title = title
+        self.snapshot: Union[LiveSnapshot, None] = None
+        self.scheduler = PollScheduler(base_interval=base_interval)
+        self.pitches = PitchStore()
+        self.feed: Union[GameFeed, None] = None
+        self.wake = asyncio.Event()
+        self._get = get
+
+    def poll(self, focused: bool) -> BaseballLive:
+        """Fetches the game (blocking), incrementally when focused."""
+        if focused:
+            if self.feed is None:
+                self.feed = GameFeed(self.gamePk, self._get, FEED_SUBTREES)
+                self.feed.pitches = self.pitches
+            return self.feed.poll()
+        self.feed = None
+        game = self._get("game", {"gamePk": self.gamePk})
+        return BaseballLive(self.gamePk, game=game, store=self.pitches)
+
+
+class MultiGameWatcher:
+    """Follows several games with one concurrency-limited fetcher.
+
+    Every game has its own polling task, but at most max_concurrent requests
+    are in flight at once. The focused game is polled on its PollScheduler
+    interval, the others no more often than background_interval.
+
+    Attributes:
+        watches (dict): GameWatch per gamePk, in display order.
+        focus (int): The focused gamePk.
+    """
+
+    def __init__(
+        self,
+        games: Dict[int, str],
+        fetcher: AsyncFetcher,
+        get: Callable[[str, dict], Any] = api_get,
+        max_concurrent: int = MAX_CONCURRENT_REQUESTS,
+        focus_interval: float = FOCUS_INTERVAL,
+        background_interval: float = BACKGROUND_INTERVAL,
+        on_update: Union[Callable[[], None], None] = None,
+    ):
+        """Initialize MultiGameWatcher.
+
+        Args:
+            games (dict): Title per gamePk.
+            fetcher (AsyncFetcher): Runs the blocking polls.
+            get (callable): StatsAPI get function shared by all games.
+            max_concurrent (int): Maximum number of requests in flight.
+            focus_interval (float): Base poll interval of the focused game.
+            background_interval (float): Minimum poll interval of the others.
+            on_update (callable): Called whenever a game gets a new snapshot.
+        """
+        self.watches = {
+            gamePk: GameWatch(gamePk, title, get, focus_interval)
+            for gamePk, title in games.items()
+        }
+        self.focus = next(iter(self.watches), None)
+        self.fetcher = fetcher
+        self.background_interval = background_interval
+        self.on_update = on_update
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._tasks: List[asyncio.Task] = []
+        self._running = False
+
+    def start(self):
+        """Starts one polling task per game."""
+        self._running = True
+        self._tasks = [
+            asyncio.ensure_future(self._watch(watch)) for watch in self.watches.values()
+        ]
+
+    async def stop(self):
+        """Cancels the polling tasks."""
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def set_focus(self, gamePk: int):
+        """Focuses gamePk and polls it right away."""
+        self.focus = gamePk
+        self.watches[gamePk].wake.set()
+
+    def move_focus(self, step: int):
+        """Moves the focus step games forward (or backward)."""
+        gamePks = list(self.watches)
+        if gamePks:
+            index = (gamePks.index(self.focus) + step) % len(gamePks)
+            self.set_focus(gamePks[index])
+
+    async def _poll(self, watch: GameWatch, focused: bool) -> PollDecision:
+        async with self._semaphore:
+            try:
+                with METRICS.timer("poll_seconds"):
+                    live = await self.fetcher.fetch(
+                        ("live", watch.gamePk), watch.poll, focused
+                    )
+            except Exception:
+                METRICS.count("poll_errors_total")
+                return watch.scheduler.failure()
+        watch.snapshot = live.snapshot
+        if self.on_update is not None:
+            self.on_update()
+        return watch.scheduler.success(live.snapshot)
+
+    async def _watch(self, watch: GameWatch):
+        # checked too as a cancellation can get lost in wait_for on
+        # Python < 3.12
+        while self._running:
+            focused = watch.gamePk == self.focus
+            decision = await self._poll(watch, focused)
+            if decision.stop:
+                break
+            interval = decision.interval
+            if not focused:
+                interval = max(interval, self.background_interval)
+            watch.wake.clear()
+            try:
+                await asyncio.wait_for(watch.wake.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+import copy
+from typing import Any, Callable, List, Sequence, Union
+
+from baseball_live.baseball_live import BaseballLive, PitchStore, api_get
+
+# the parts of the live feed LiveSnapshot and PitchStore read; rosters,
+# boxscore and the rest make up most of a late-inning feed
+FEED_SUBTREES = (
+    "/metaData",
+    "/gameData/status",
+    "/liveData/plays",
+    "/liveData/linescore",
+)
+_SKIP = object()
+
+
+class PatchError(Exception):
+    """Raised when a JSON patch cannot be applied to the game document."""
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _split_pointer(path: str) -> List[str]:
+    if path == "":
+        return []
+    if not path.startswith("/"):
+        raise PatchError(f"Invalid JSON pointer: {path}")
+    return [_unescape(token) for token in path[1:].split("/")]
+
+
+def _index(container: list, token: str, allow_end: bool = False) -> int:
+    if token == "-" and allow_end:
+        return len(container)
+    try:
+        idx = int(token)
+    except ValueError:
+        raise PatchError(f"Invalid list index: {token}")
+    upper = len(container) if allow_end else len(container) - 1
+    if idx < 0 or idx > upper:
+        raise PatchError(f"List index out of range: {token}")
+    return idx
+
+
+class _Patcher:
+    """Applies RFC 6902 operations with path copying.
+
+    Containers are copied the first time an operation descends through them,
+    so the source document is never mutated and unchanged subtrees are shared
+    between the old and the new document.
+    """
+
+    def __init__(self, doc: Any):
+        self.doc = self._copy(doc)
+        self._fresh = {id(self.doc)}
+
+    @staticmethod
+    def _copy(node: Any) -> Any:
+        if isinstance(node, dict):
+            return dict(node)
+        if isinstance(node, list):
+            return list(node)
+        return node
+
+    def _child(self, parent: Union[dict, list], token: str) -> Any:
+        if isinstance(parent, dict):
+            if token not in parent:
+                raise PatchError(f"Missing key: {token}")
+            key = token
+        elif isinstance(parent, list):
+            key = _index(parent, token)
+        else:
+            raise PatchError(f"Cannot descend into {type(parent).__name__}")
+        child = parent[key]
+        if isinstance(child, (dict, list)) and id(child) not in self._fresh:
+            child = self._copy(child)
+            self._fresh.add(id(child))
+            parent[key] = child
+        return child
+
+    def _parent(self, tokens: List[str]) -> Union[dict, list]:
+        node = self.doc
+        for token in tokens[:-1]:
+            node = self._child(node, token)
+        return node
+
+    def get(self, path: str) -> Any:
+        node = self.doc
+        for token in _split_pointer(path):
+            if isinstance(node, dict):
+                if token not in node:
+                    raise PatchError(f"Missing key: {token}")
+                node = node[token]
+            elif isinstance(node, list):
+                node = node[_index(node, token)]
+            else:
+                raise PatchError(f"Cannot descend into {type(node).__name__}")
+        return node
+
+    def add(self, path: str, value: Any):
+        tokens = _split_pointer(path)
+        if not tokens:
+            self.doc = value
+            return
+        parent = self._parent(tokens)
+        if isinstance(parent, dict):
+            parent[tokens[-1]] = value
+        elif isinstance(parent, list):
+            parent.insert(_index(parent, tokens[-1], allow_end=True), value)
+        else:
+            raise PatchError(f"Cannot add into {type(parent).__name__}")
+
+    def remove(self, path: str) -> Any:
+        tokens = _split_pointer(path)
+        if not tokens:
+            raise PatchError("Cannot remove the document root")
+        parent = self._parent(tokens)
+        if isinstance(parent, dict):
+            if tokens[-1] not in parent:
+                raise PatchError(f"Missing key: {tokens[-1]}")
+            return parent.pop(tokens[-1])
+        elif isinstance(parent, list):
+            return parent.pop(_index(parent, tokens[-1]))
+        raise PatchError(f"Cannot remove from {type(parent).__name__}")
+
+    def replace(self, path: str, value: Any):
+        tokens = _split_pointer(path)
+        if not tokens:
+            self.doc = value
+            return
+        parent = self._parent(tokens)
+        if isinstance(parent, dict):
+            if tokens[-1] not in parent:
+                raise PatchError(f"Missing key: {tokens[-1]}")
+            parent[tokens[-1]] = value
+        elif isinstance(parent, list):
+            parent[_index(parent, tokens[-1])] = value
+        else:
+            raise PatchError(f"Cannot replace in {type(parent).__name__}")
+
+    def apply(self, op: dict):
+        try:
+            name = op["op"]
+            path = op["path"]
+        except (KeyError, TypeError):
+            raise PatchError(f"Malformed operation: {op}")
+        if name == "add":
+            self.add(path, op.get("value"))
+        elif name == "remove":
+            self.remove(path)
+        elif name == "replace":
+            self.replace(path, op.get("value"))
+        elif name == "move":
+            self.add(path, self.remove(op["from"]))
+        elif name == "copy":
+            self.add(path, copy.deepcopy(self.get(op["from"])))
+        elif name == "test":
+            if self.get(path) != op.get("value"):
+                raise PatchError(f"Test failed at {path}")
+        else:
+            raise PatchError(f"Unknown operation: {name}")
+
+
+def apply_patch(doc: Any, operations: List[dict]) -> Any:
+    """Applies a list of JSON patch operations (RFC 6902) to doc.
+
+    Args:
+        doc: The JSON document, it is left untouched.
+        operations (list): Operations as returned by the game_diff endpoint.
+
+    Returns:
+        The patched document, sharing unchanged subtrees with doc.
+
+    Raises:
+        PatchError: If any operation does not apply.
+    """
+    patcher = _Patcher(doc)
+    for op in operations:
+        patcher.apply(op)
+    return patcher.doc
+
+
+def subtree_tree(subtrees: Sequence[str]) -> dict:
+    """Nests JSON pointers into a tree of keys, None marking a whole subtree."""
+    tree: dict = {}
+    for path in subtrees:
+        tokens = _split_pointer(path)
+        if not tokens:
+            raise ValueError("The document root is not a subtree")
+        node = tree
+        for token in tokens[:-1]:
+            node = node.setdefault(token, {})
+            if node is None:
+                break
+        else:
+            node[tokens[-1]] = None
+    return tree
+
+
+def select(doc: Any, tree: Union[dict, None]) -> Any:
+    """The parts of doc under the subtrees of tree (see subtree_tree).
+
+    Kept subtrees are shared with doc, not copied.
+    """
+    if tree is None or not isinstance(doc, dict):
+        return doc
+    return {key: select(doc[key], sub) for key, sub in tree.items() if key in doc}
+
+
+def _scope(tree: dict, path: str) -> Any:
+    """What of tree lies under path: None if path is inside a kept subtree,
+    _SKIP if nothing is kept there, else the subtree to select values with.
+    """
+    node = tree
+    for token in _split_pointer(path):
+        if node is None:
+            return None
+        if token not in node:
+            return _SKIP
+        node = node[token]
+    return node
+
+
+def select_patch(operations: List[dict], tree: dict) -> List[dict]:
+    """Restricts patch operations to the subtrees of tree.
+
+    Operations on dropped parts of the document are left out and values
+    added above a kept subtree are cut down to it.
+
+    Raises:
+        PatchError: If an operation moves or copies data between a kept
+        and a dropped part of the document.
+    """
+    selected = []
+    for op in operations:
+        try:
+            scope = _scope(tree, op["path"])
+        except (KeyError, TypeError):
+            raise PatchError(f"Malformed operation: {op}")
+        if op.get("op") in ("move", "copy"):
+            source = _scope(tree, op.get("from", ""))
+            if scope is _SKIP and source is _SKIP:
+                continue
+            if scope is not None or source is not None:
+                raise PatchError(f"Cannot select {op['op']} across subtrees")
+        elif scope is _SKIP:
+            continue
+        elif scope is not None and "value" in op:
+            op = dict(op, value=select(op["value"], scope))
+        selected.append(op)
+    return selected
+
+
+class GameFeed:
+    """Long-lived live feed for a game, kept current with game_diff patches.
+
+    The first poll downloads the full feed, later polls only request the
+    changes since the feed's metaData.timeStamp. A full fetch is done again
+    whenever the diff cannot be applied.
+
+    Given subtrees (e.g. FEED_SUBTREES) only those parts of the feed are
+    kept: the rest of every download is dropped right after decoding and
+    patches to it are skipped, so polls hold and patch a fraction of the
+    document.
+
+    Attributes:
+        gamePk (int): The game followed.
+        game (dict): The current game document (None before the first poll),
+        cut down to subtrees if given.
+        full_fetches (int): Number of full feed downloads.
+        diff_fetches (int): Number of diff downloads.
+        pitches (PitchStore): Pitches seen since the feed was created.
+        operations (list): Patch operations the last update applied, None
+        if it replaced the whole document.
+    """
+
+    def __init__(
+        self,
+        gamePk: int,
+        get: Callable[[str, dict], Any] = api_get,
+        subtrees: Union[Sequence[str], None] = None,
+    ):
+        """Initialize GameFeed with gamePk, optional StatsAPI get function and
+        the JSON pointers of the subtrees to keep (default: everything).
+        """
+        self.gamePk = gamePk
+        self.game = None
+        self.full_fetches = 0
+        self.diff_fetches = 0
+        self.pitches = PitchStore()
+        self.operations: Union[List[dict], None] = None
+        self._get = get
+        self._tree = subtree_tree(subtrees) if subtrees is not None else None
+
+    @property
+    def timecode(self) -> Union[str, None]:
+        """Timestamp of the current game document."""
+        if self.game is None:
+            return None
+        return self.game["metaData"]["timeStamp"]
+
+    def fetch_full(self) -> bool:
+        """Replaces the document with a full download of the live feed."""
+        self.game = select(self._get("game", {"gamePk": self.gamePk}), self._tree)
+        self.full_fetches += 1
+        self.operations = None
+        return True
+
+    def update(self) -> bool:
+        """Brings the document up to date.
+
+        Returns:
+            True if the document changed.
+        """
+        if self.game is None:
+            return self.fetch_full()
+        diffs = self._get(
+            "game_diff", {"gamePk": self.gamePk, "startTimecode": self.timecode}
+        )
+        self.diff_fetches += 1
+        # the endpoint answers with the full feed when the delta is too large
+        if isinstance(diffs, dict):
+            self.game = select(diffs, self._tree)
+            self.operations = None
+            return True
+        applied = []
+        try:
+            game = self.game
+            for diff in diffs:
+                operations = diff["diff"]
+                if self._tree is not None:
+                    operations = select_patch(operations, self._tree)
+                game = apply_patch(game, operations)
+                applied += operations
+            game["metaData"]["timeStamp"]
+        except (PatchError, KeyError, TypeError):
+            return self.fetch_full()
+        changed = game is not self.game
+        self.game = game
+        self.operations = applied
+        return changed
+
+    def poll(self) -> BaseballLive:
+        """Updates the document and returns a BaseballLive view of it."""
+        self.update()
+        return BaseballLive(self.gamePk, game=self.game, store=self.pitches)
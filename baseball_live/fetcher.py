@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable
+
+FETCH_TIMEOUT = 15  # seconds
+MAX_WORKERS = 4
+
+
+class AsyncFetcher:
+    """Runs blocking StatsAPI calls off the asyncio event loop.
+
+    Every call is keyed by the resource it fetches (e.g. ``("live", gamePk)``).
+    While a call for a key is in flight, further fetches for that key await
+    the same result instead of starting a second request.
+
+    Attributes:
+        timeout (float): Seconds to wait for a result before giving up.
+    """
+
+    def __init__(self, timeout: float = FETCH_TIMEOUT, max_workers: int = MAX_WORKERS):
+        """Initialize AsyncFetcher with optional timeout and worker count."""
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="baseball_live"
+        )
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Whether a request for key is currently running."""
+        return key in self._inflight
+
+    async def fetch(self, key: Hashable, func: Callable[..., Any], *args) -> Any:
+        """Runs func(*args) in a worker thread and returns its result.
+
+        Args:
+            key (hashable): Identifies the resource, at most one call per key
+            runs at a time.
+            func (callable): Blocking function to run, e.g. BaseballLive.
+
+        Raises:
+            asyncio.TimeoutError: If no result arrives within self.timeout.
+        """
+        future = self._inflight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                self._executor, functools.partial(func, *args)
+            )
+            self._inflight[key] = future
+            future.add_done_callback(lambda f: self._release(key, f))
+        # shield so a timed out or cancelled waiter doesn't cancel the shared
+        # future other waiters may still be awaiting.
+        return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+
+    def _release(self, key: Hashable, future: asyncio.Future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        # retrieve the exception so abandoned futures don't log warnings
+        if not future.cancelled():
+            future.exception()
+
+    def close(self):
+        """Cancels pending requests and releases the worker threads."""
+        for future in list(self._inflight.values()):
+            if not future.get_loop().is_closed():
+                future.cancel()
+        self._inflight.clear()
+        self._executor.shutdown(wait=False)
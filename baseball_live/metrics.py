@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Deque, Dict, Union
+
+WINDOW = 256  # samples kept per timing
+FPS_WINDOW = 5  # seconds of frames used for the frame rate
+EXPORT_INTERVAL = 10  # seconds
+PREFIX = "baseball_live_"
+_DISABLED = nullcontext()
+
+
+class _Timer:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics: "Metrics", name: str):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+
+
+class Metrics:
+    """Timings, counters and gauges of the hot paths.
+
+    Every method returns right away while enabled is False, and timer then
+    hands out a shared no-op context manager, so instrumentation left in
+    the hot paths costs next to nothing when nobody is looking.
+
+    Timings keep the last WINDOW samples, counters only go up and gauges
+    hold the last value set. Safe to update from worker threads.
+
+    Attributes:
+        enabled (bool): Whether anything is recorded.
+    """
+
+    def __init__(self, enabled: bool = False, window: int = WINDOW):
+        """Initialize Metrics, disabled unless enabled is set."""
+        self.enabled = enabled
+        self.window = window
+        self.samples: Dict[str, Deque[float]] = {}
+        self.totals: Dict[str, list] = {}
+        self.counters: Dict[str, float] = {}
+        self.gauges: Dict[str, Union[int, float, str]] = {}
+        self._frames: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def timer(self, name: str):
+        """Context manager observing the seconds spent in its block."""
+        if not self.enabled:
+            return _DISABLED
+        return _Timer(self, name)
+
+    def observe(self, name: str, value: float):
+        """Records a sample, e.g. a latency or a payload size."""
+        if not self.enabled:
+            return
+        with self._lock:
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = deque(maxlen=self.window)
+                self.totals[name] = [0, 0.0]
+            samples.append(value)
+            totals = self.totals[name]
+            totals[0] += 1
+            totals[1] += value
+
+    def count(self, name: str, n: float = 1):
+        """Adds n to a counter."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def set(self, name: str, value: Union[int, float, str]):
+        """Sets a gauge."""
+        if self.enabled:
+            self.gauges[name] = value
+
+    def frame(self):
+        """Marks a rendered frame, for the frame rate."""
+        if self.enabled:
+            self._frames.append(time.monotonic())
+
+    def fps(self) -> float:
+        """Frames per second over the last FPS_WINDOW seconds."""
+        now = time.monotonic()
+        recent = [t for t in self._frames if now - t <= FPS_WINDOW]
+        return len(recent) / FPS_WINDOW
+
+    def reset(self):
+        """Forgets everything recorded so far."""
+        with self._lock:
+            self.samples.clear()
+            self.totals.clear()
+            self.counters.clear()
+            self.gauges.clear()
+            self._frames.clear()
+
+    def summary(self) -> Dict[str, dict]:
+        """Statistics of every metric.
+
+        Returns:
+            Per timing its count, sum, last value, mean, p50 and p95 over the
+            window, then the counters, the gauges and "fps".
+        """
+        with self._lock:
+            samples = {name: sorted(s) for name, s in self.samples.items()}
+            last = {name: s[-1] for name, s in self.samples.items() if s}
+            totals = {name: tuple(t) for name, t in self.totals.items()}
+            counters = dict(self.counters)
+        summary = {}
+        for name, values in samples.items():
+            if not values:
+                continue
+            n = len(values)
+            summary[name] = {
+                "count": totals[name][0],
+                "sum": totals[name][1],
+                "last": last[name],
+                "mean": sum(values) / n,
+                "p50": values[n // 2],
+                "p95": values[min(n - 1, int(n * 0.95))],
+            }
+        summary.update(counters)
+        summary.update(self.gauges)
+        summary["fps"] = self.fps()
+        return summary
+
+    def to_ndjson(self) -> str:
+        """One JSON line with a timestamp and the summary."""
+        return json.dumps({"time": time.time(), **self.summary()}) + "\n"
+
+    def to_prometheus(self) -> str:
+        """The summary in the Prometheus text exposition format."""
+        lines = []
+        for name, value in self.summary().items():
+            metric = PREFIX + name
+            if isinstance(value, dict):
+                lines.append(f"# TYPE {metric} summary")
+                for q in ("p50", "p95"):
+                    quantile = int(q[1:]) / 100
+                    lines.append(f'{metric}{{quantile="{quantile}"}} {value[q]}')
+                lines.append(f"{metric}_sum {value['sum']}")
+                lines.append(f"{metric}_count {value['count']}")
+            elif isinstance(value, str):
+                lines.append(f"# TYPE {metric} gauge")
+                lines.append(f'{metric}{{value="{value}"}} 1')
+            else:
+                kind = "counter" if name.endswith("_total") else "gauge"
+                lines.append(f"# TYPE {metric} {kind}")
+                lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
+
+
+class MetricsExporter:
+    """Periodically dumps metrics to a local file.
+
+    NDJSON dumps are appended, one line each. Prometheus dumps replace the
+    file atomically, as the node_exporter textfile collector expects.
+
+    Attributes:
+        path (str): The file written.
+        fmt (str): "ndjson" or "prometheus".
+        interval (float): Seconds between dumps.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fmt: Union[str, None] = None,
+        interval: float = EXPORT_INTERVAL,
+        metrics: Metrics = METRICS,
+    ):
+        """Initialize MetricsExporter, picking the format from the file
+        extension (.prom is Prometheus, anything else NDJSON) unless given.
+        """
+        if fmt is None:
+            fmt = "prometheus" if path.endswith(".prom") else "ndjson"
+        if fmt not in ("ndjson", "prometheus"):
+            raise ValueError(f"Unknown metrics format {fmt}")
+        self.path = path
+        self.fmt = fmt
+        self.interval = interval
+        self.metrics = metrics
+
+    def write(self):
+        """Writes one dump."""
+        if self.fmt == "ndjson":
+            with open(self.path, "a") as f:
+                f.write(self.metrics.to_ndjson())
+        else:
+            tmp = self.path + ".tmp"
+            with open(tmp, "w") as f:
+                f.write(self.metrics.to_prometheus())
+            os.replace(tmp, self.path)
+
+    async def run(self):
+        """Writes a dump every interval until cancelled, and a last one then."""
+        try:
+            while True:
+                await asyncio.sleep(self.interval)
+                self.write()
+        finally:
+            self.write()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, Union
+
+from baseball_live.baseball_live import LiveSnapshot
+
+BASE_INTERVAL = 5  # seconds, while pitches are being thrown
+IDLE_INTERVAL = 15  # seconds, no new pitch for IDLE_AFTER (pitching change, review)
+IDLE_AFTER = 60  # seconds
+BREAK_INTERVAL = 30  # seconds, between half innings
+DELAYED_INTERVAL = 60  # seconds, rain delays and suspended games
+PREVIEW_INTERVAL = 60  # seconds, before first pitch
+MAX_BACKOFF = 120  # seconds
+
+
+@dataclass(frozen=True)
+class PollDecision:
+    """When to poll next and why.
+
+    Attributes:
+        interval (float): Seconds until the next poll.
+        reason (str): What the decision was based on, e.g. "live" or "error".
+        stop (bool): Whether polling should stop altogether.
+    """
+
+    interval: float
+    reason: str
+    stop: bool = False
+
+
+class PollScheduler:
+    """Picks the next poll time from the state of the game.
+
+    Attributes:
+        base_interval (float): Interval while the game is live and active.
+        errors (int): Consecutive failed polls.
+        decisions (Counter): Number of decisions taken per reason.
+        last_decision (PollDecision): The most recent decision.
+    """
+
+    def __init__(
+        self,
+        base_interval: float = BASE_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Callable[[], float] = random.random,
+    ):
+        """Initialize PollScheduler with optional base interval, clock and
+        random number generator (used for jitter).
+        """
+        self.base_interval = base_interval
+        self.errors = 0
+        self.decisions: Counter = Counter()
+        self.last_decision: Union[PollDecision, None] = None
+        self._clock = clock
+        self._rng = rng
+        self._last_pitch = None
+        self._last_pitch_time = clock()
+
+    def _decide(self, interval: float, reason: str, stop: bool = False) -> PollDecision:
+        decision = PollDecision(interval, reason, stop)
+        self.decisions[reason] += 1
+        self.last_decision = decision
+        return decision
+
+    def success(self, snapshot: LiveSnapshot) -> PollDecision:
+        """Decision after a successful poll returning snapshot."""
+        now = self._clock()
+        self.errors = 0
+        play = snapshot.current_play
+        pitch = (
+            play.get("about", {}).get("atBatIndex"),
+            len(play.get("playEvents", ())),
+        )
+        if pitch != self._last_pitch:
+            self._last_pitch = pitch
+            self._last_pitch_time = now
+
+        detailed_state = snapshot.detailed_state or ""
+        if snapshot.game_state == "Final":
+            return self._decide(0, "final", stop=True)
+        if "Delay" in detailed_state or "Suspended" in detailed_state:
+            return self._decide(DELAYED_INTERVAL, "delayed")
+        if snapshot.game_state == "Preview":
+            return self._decide(PREVIEW_INTERVAL, "preview")
+        if snapshot.inning_state in ("Middle", "End"):
+            return self._decide(BREAK_INTERVAL, "inning break")
+        if now - self._last_pitch_time >= IDLE_AFTER:
+            return self._decide(IDLE_INTERVAL, "idle")
+        return self._decide(self.base_interval, "live")
+
+    def failure(self) -> PollDecision:
+        """Decision after a failed poll, exponential backoff with jitter."""
+        self.errors += 1
+        backoff = min(self.base_interval * 2 ** (self.errors - 1), MAX_BACKOFF)
+        # equal jitter: somewhere between half and the full backoff
+        interval = backoff / 2 + self._rng() * backoff / 2
+        return self._decide(interval, "error")
+
+    def metrics(self) -> Dict[str, Union[int, float, str]]:
+        """Counters describing the decisions taken so far."""
+        metrics = {
+            f"poll_{reason.replace(' ', '_')}": n
+            for reason, n in self.decisions.items()
+        }
+        metrics["poll_errors_in_a_row"] = self.errors
+        if self.last_decision is not None:
+            metrics["poll_interval"] = self.last_decision.interval
+            metrics["poll_reason"] = self.last_decision.reason
+        return metrics
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Callable, Deque, Dict, List, Sequence, Union
+
+from baseball_live.baseball_live import (
+    BaseballSchedule,
+    _expected_call,
+    api_get,
+    schedule_game_state,
+)
+from baseball_live.constants import (
+    BLOCK,
+    DROP,
+    MAX_CONCURRENT_REQUESTS,
+    POLICIES,
+    QUEUE_SIZE,
+)
+from baseball_live.feed import FEED_SUBTREES, GameFeed
+from baseball_live.fetcher import AsyncFetcher
+from baseball_live.metrics import METRICS
+from baseball_live.scheduler import PollScheduler
+from baseball_live.transport import dumps
+
+_READ = -1  # play whose result was reported, see GameEvents
+
+
+class GameEvents:
+    """Turns the successive documents of a game into new events.
+
+    Plays are read from the first one that wasn't complete yet, and of
+    every play only the play events not read before, so each pitch, play
+    result, score and inning is reported once however often the game is
+    polled, and whether its document was patched or downloaded again. A
+    pitch is reported once its pitchData has arrived, as PitchStore stores
+    it, holding back the events after it until then; once a later play has
+    begun it is reported without.
+
+    Every event is a dict with its "type" ("status", "inning", "pitch",
+    "play" or "score"), the "gamePk", an "id" unique to the event within
+    the game and the "timecode" of the document it was read from.
+
+    Attributes:
+        gamePk (int): The game.
+    """
+
+    def __init__(self, gamePk: int):
+        """Initialize GameEvents with gamePk, nothing reported yet."""
+        self.gamePk = gamePk
+        self._next_play = 0
+        self._read: Dict[int, int] = {}  # play events read per play
+        self._status = None
+        self._inning = None
+        self._score = (0, 0)
+
+    def update(self, game: dict) -> List[dict]:
+        """The events of game not reported yet, in the order they happened."""
+        timecode = game.get("metaData", {}).get("timeStamp")
+        live_data = game.get("liveData", {})
+        events = []
+        plays = live_data.get("plays", {}).get("allPlays", ())
+        for i in range(min(self._next_play, len(plays)), len(plays)):
+            read = self._read.get(i, 0)
+            if read == _READ:
+                continue
+            play = plays[i]
+            about = play.get("about", {})
+            inning = (about.get("inning"), about.get("halfInning"))
+            if inning != self._inning and None not in inning:
+                self._inning = inning
+                event = self._event("inning", f"inning-{inning[0]}-{inning[1]}")
+                event.update(inning=inning[0], half=inning[1])
+                events.append(event)
+            play_events = play.get("playEvents", ())
+            waiting = None
+            for j in range(read, len(play_events)):
+                if not play_events[j].get("isPitch"):
+                    continue
+                # the location of a pitch arrives after the pitch, wait for
+                # it as long as no later play has begun
+                if "pitchData" not in play_events[j] and i == len(plays) - 1:
+                    waiting = j
+                    break
+                events.append(self._pitch(play, play_events[j], j))
+            result = play.get("result", {})
+            if waiting is not None:
+                self._read[i] = waiting
+            elif about.get("isComplete") and "event" in result:
+                self._read[i] = _READ
+                events.append(self._play(play))
+                if "awayScore" in result:
+                    self._score_event(events, result["awayScore"], result["homeScore"])
+            else:
+                self._read[i] = len(play_events)
+        while self._read.get(self._next_play) == _READ:
+            del self._read[self._next_play]
+            self._next_play += 1
+
+        teams = live_data.get("linescore", {}).get("teams", {})
+        self._score_event(
+            events,
+            teams.get("away", {}).get("runs", 0),
+            teams.get("home", {}).get("runs", 0),
+        )
+
+        status = game.get("gameData", {}).get("status", {})
+        state = (status.get("abstractGameState"), status.get("detailedState"))
+        if state != self._status:
+            self._status = state
+            event = self._event("status", f"status-{state[0]}-{state[1]}")
+            event.update(game_state=state[0], detailed_state=state[1])
+            # a game starts before its first pitch and ends after its last play
+            if state[0] == "Final":
+                events.append(event)
+            else:
+                events.insert(0, event)
+        for event in events:
+            event["timecode"] = timecode
+        return events
+
+    def _event(self, kind: str, event_id: str) -> dict:
+        return {"type": kind, "gamePk": self.gamePk, "id": event_id}
+
+    def _pitch(self, play: dict, pitch: dict, index: int) -> dict:
+        about = play.get("about", {})
+        matchup = play.get("matchup", {})
+        details = pitch.get("details", {})
+        pitch_data = pitch.get("pitchData") or {}
+        coordinates = pitch_data.get("coordinates", {})
+        at_bat_index = about.get("atBatIndex")
+        event = self._event("pitch", f"pitch-{at_bat_index}-{index}")
+        event.update(
+            at_bat_index=at_bat_index,
+            pitch_number=pitch.get("pitchNumber"),
+            inning=about.get("inning"),
+            half=about.get("halfInning"),
+            batter_id=matchup.get("batter", {}).get("id"),
+            pitcher_id=matchup.get("pitcher", {}).get("id"),
+            pitch_type=details.get("type", {}).get("code"),
+            call=details.get("description"),
+            speed=pitch_data.get("startSpeed"),
+            pX=coordinates.get("pX"),
+            pZ=coordinates.get("pZ"),
+            sz_top=pitch_data.get("strikeZoneTop"),
+            sz_bottom=pitch_data.get("strikeZoneBottom"),
+            expected_call=_expected_call(pitch.get("pitchData")),
+            count=pitch.get("count"),
+        )
+        return event
+
+    def _play(self, play: dict) -> dict:
+        about = play.get("about", {})
+        matchup = play.get("matchup", {})
+        result = play["result"]
+        at_bat_index = about.get("atBatIndex")
+        event = self._event("play", f"play-{at_bat_index}")
+        event.update(
+            at_bat_index=at_bat_index,
+            inning=about.get("inning"),
+            half=about.get("halfInning"),
+            batter_id=matchup.get("batter", {}).get("id"),
+            pitcher_id=matchup.get("pitcher", {}).get("id"),
+            event=result["event"],
+            description=result.get("description"),
+            rbi=result.get("rbi"),
+        )
+        return event
+
+    def _score_event(self, events: List[dict], away: int, home: int):
+        if (away, home) == self._score:
+            return
+        self._score = (away, home)
+        event = self._event("score", f"score-{away}-{home}")
+        event.update(away=away, home=home)
+        events.append(event)
+
+
+class EventSink:
+    """Writes events to a binary file (e.g. stdout) as NDJSON lines.
+
+    Events wait in a queue while a worker thread writes them out in
+    batches, so a slow reader never holds up the event loop. Once max_queue
+    events are waiting, put either waits for room (BLOCK), which holds up
+    the game's polls in turn, or drops the oldest waiting event (DROP).
+    The reader is told how many events were dropped with a "dropped" event
+    ahead of the next batch.
+
+    Attributes:
+        out (file): Where the lines go.
+        policy (str): BLOCK or DROP.
+        dropped (int): Events dropped so far.
+    """
+
+    def __init__(self, out: BinaryIO, policy: str = BLOCK, max_queue: int = QUEUE_SIZE):
+        """Initialize EventSink, to be created on the running event loop."""
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown backpressure policy {policy}")
+        self.out = out
+        self.policy = policy
+        self.dropped = 0
+        self._unreported = 0
+        self._queue: asyncio.Queue = asyncio.Queue(max_queue)
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="baseball_live_stream"
+        )
+
+    async def put(self, event: dict):
+        """Queues an event, applying the policy if the queue is full."""
+        if self.policy == DROP and self._queue.full():
+            self._queue.get_nowait()
+            self._queue.task_done()
+            self.dropped += 1
+            self._unreported += 1
+            METRICS.count("stream_dropped_total")
+        await self._queue.put(event)
+        METRICS.set("stream_queue_depth", self._queue.qsize())
+
+    def _write(self, events: List[dict]):
+        self.out.write(b"".join(dumps(event) + b"\n" for event in events))
+        self.out.flush()
+
+    async def run(self):
+        """Writes queued events until cancelled.
+
+        Raises:
+            OSError: If the events can't be written, e.g. BrokenPipeError
+            once the reader is gone.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            n = len(batch)
+            if self._unreported:
+                batch.insert(0, {"type": "dropped", "events": self._unreported})
+                self._unreported = 0
+            try:
+                await loop.run_in_executor(self._executor, self._write, batch)
+            finally:
+                for _ in range(n):
+                    self._queue.task_done()
+            METRICS.count("stream_events_total", n)
+
+    async def join(self):
+        """Waits until every queued event has been written (run must be
+        running).
+        """
+        await self._queue.join()
+
+    def close(self):
+        """Releases the writer thread."""
+        self._executor.shutdown(wait=False)
+
+
+async def stream_game(
+    gamePk: int,
+    fetcher: AsyncFetcher,
+    get: Callable[[str, dict], Any],
+    sink: EventSink,
+    semaphore: asyncio.Semaphore,
+):
+    """Polls a game until it is final, putting its new events in sink.
+
+    The game is followed with a GameFeed, so polls after the first only
+    download and patch the changes, and polled as often as its
+    PollScheduler decides.
+    """
+    feed = GameFeed(gamePk, get, FEED_SUBTREES)
+    game_events = GameEvents(gamePk)
+    scheduler = PollScheduler()
+    # read in the worker thread, handed over even if the wait timed out
+    pending: Deque[dict] = deque()
+
+    def poll():
+        live = feed.poll()
+        pending.extend(game_events.update(feed.game))
+        return live.snapshot
+
+    while True:
+        async with semaphore:
+            try:
+                with METRICS.timer("poll_seconds"):
+                    snapshot = await fetcher.fetch(("live", gamePk), poll)
+            except Exception:
+                METRICS.count("poll_errors_total")
+                snapshot = None
+        while pending:
+            await sink.put(pending.popleft())
+        if snapshot is None:
+            decision = scheduler.failure()
+        else:
+            decision = scheduler.success(snapshot)
+        if decision.stop:
+            return
+        await asyncio.sleep(decision.interval)
+
+
+async def stream(
+    out: BinaryIO,
+    gamePks: Union[Sequence[int], None] = None,
+    get: Callable[[str, dict], Any] = api_get,
+    policy: str = BLOCK,
+    max_queue: int = QUEUE_SIZE,
+    max_concurrent: int = MAX_CONCURRENT_REQUESTS,
+):
+    """Streams the events of games to out as NDJSON until they are final.
+
+    Every game has its own polling task, but at most max_concurrent
+    requests are in flight at once.
+
+    Args:
+        out (file): Binary file the lines are written to.
+        gamePks (sequence): The games, every game today that isn't over if
+        empty or None.
+        get (callable): StatsAPI get function shared by all games.
+        policy (str): What to do when out can't keep up, BLOCK or DROP.
+        max_queue (int): Events held back before the policy applies.
+        max_concurrent (int): Maximum number of requests in flight.
+
+    Raises:
+        OSError: If out can't be written, e.g. BrokenPipeError once the
+        reader is gone.
+    """
+    fetcher = AsyncFetcher(max_workers=max_concurrent)
+    sink = EventSink(out, policy, max_queue)
+    writer = asyncio.ensure_future(sink.run())
+    try:
+        if not gamePks:
+            bs = await fetcher.fetch("schedule", lambda: BaseballSchedule(get=get))
+            gamePks = [
+                game["game_id"]
+                for game in bs.schedule
+                if schedule_game_state(game["status"]) != "Final"
+            ]
+        semaphore = asyncio.Semaphore(max_concurrent)
+        games = asyncio.gather(
+            *(stream_game(pk, fetcher, get, sink, semaphore) for pk in gamePks)
+        )
+        await asyncio.wait([games, writer], return_when=asyncio.FIRST_COMPLETED)
+        if writer.done():
+            games.cancel()
+            await asyncio.gather(games, return_exceptions=True)
+            writer.result()
+        games.result()
+        written = asyncio.ensure_future(sink.join())
+        await asyncio.wait([written, writer], return_when=asyncio.FIRST_COMPLETED)
+        written.cancel()
+        if writer.done():
+            writer.result()
+    finally:
+        writer.cancel()
+        await asyncio.gather(writer, return_exceptions=True)
+        sink.close()
+        fetcher.close()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+import time
+from collections import deque
+from typing import Any, Callable, Union
+
+MAX_DELAY = 120  # seconds
+BUFFER_SIZE = 256  # snapshots
+
+
+class TimeShiftBuffer:
+    """Ring buffer of timestamped snapshots for the broadcast delay.
+
+    Snapshots are pushed as they arrive and looked up by the time they should
+    be shown (now - delay), so changing the delay takes effect immediately
+    and can rewind as far back as the buffer reaches.
+
+    Attributes:
+        max_age (float): Snapshots older than this are dropped (seconds).
+    """
+
+    def __init__(
+        self,
+        max_age: float = MAX_DELAY,
+        maxlen: int = BUFFER_SIZE,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize TimeShiftBuffer with optional max_age, size and clock."""
+        self.max_age = max_age
+        self._clock = clock
+        self._entries: "deque[tuple]" = deque(maxlen=maxlen)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def push(self, item: Any, timestamp: Union[float, None] = None):
+        """Adds item as received at timestamp (default: now)."""
+        if timestamp is None:
+            timestamp = self._clock()
+        self._entries.append((timestamp, item))
+        # keep one entry older than max_age so the full window stays covered
+        while len(self._entries) > 1 and self._entries[1][0] < timestamp - self.max_age:
+            self._entries.popleft()
+
+    def latest(self) -> Any:
+        """The most recent item, or None if the buffer is empty."""
+        if not self._entries:
+            return None
+        return self._entries[-1][1]
+
+    def at(self, delay: float) -> Any:
+        """The item that was current delay seconds ago.
+
+        Falls back to the oldest item when the delay reaches past the buffer.
+        """
+        if not self._entries:
+            return None
+        target = self._clock() - delay
+        for timestamp, item in reversed(self._entries):
+            if timestamp <= target:
+                return item
+        return self._entries[0][1]
+
+    def next_change(self, delay: float) -> Union[float, None]:
+        """Seconds until at(delay) returns a different item, None if never."""
+        target = self._clock() - delay
+        for timestamp, _ in self._entries:
+            if timestamp > target:
+                return timestamp - target
+        return None
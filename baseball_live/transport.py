@@ -0,0 +1,508 @@
+#!/usr/bin/env python3
+import json
+import socket
+import struct
+import threading
+import time
+import zlib
+from bisect import bisect_right
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+from baseball_live.baseball_live import REQUEST_TIMEOUT, api_get
+from baseball_live.metrics import METRICS
+
+try:
+    import orjson
+except ImportError:  # optional, several times faster than json on big feeds
+    orjson = None
+
+BASE_URL = "https://statsapi.mlb.com/api/"  # statsapi.endpoints.BASE_URL
+POOL_SIZE = 10  # connections kept alive per host
+CONNECT_TIMEOUT = 3.05  # seconds, just over the 3 s TCP retransmission timeout
+ENDPOINT_TIMEOUTS = {  # read timeouts (seconds) differing from REQUEST_TIMEOUT
+    "game_diff": 5,  # small and polled every few seconds, better retried soon
+    "game": 15,  # a late-inning full feed runs to megabytes
+}
+RETRIES = 2  # per request, for connection errors and 5xx answers
+RETRY_BACKOFF = 0.25  # seconds before the second try, doubling after
+DNS_TTL = 300  # seconds a resolved address is reused for new connections
+
+# capture file: MAGIC, records, index, footer
+# record: <I length> + zlib(JSON [timestamp, endpoint, params, response])
+# footer: <Q index offset> <I index length> MAGIC, index: zlib(JSON entries)
+CAPTURE_MAGIC = b"BLCAP1\n"
+_LENGTH = struct.Struct("<I")
+_FOOTER = struct.Struct("<QI")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decodes a JSON document, with orjson if it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Encodes obj as compact JSON, with orjson if it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+_dns_cache: Dict[Tuple[str, int], Tuple[float, str]] = {}
+_dns_lock = threading.Lock()
+_pool_classes: Union[dict, None] = None
+_shared: Union["HttpTransport", None] = None
+_shared_lock = threading.Lock()
+
+
+def resolve(host: str, port: int, clock: Callable[[], float] = time.monotonic) -> str:
+    """Address of host, looked up at most once every DNS_TTL seconds.
+
+    Raises:
+        socket.gaierror: If host can't be resolved.
+    """
+    now = clock()
+    with _dns_lock:
+        cached = _dns_cache.get((host, port))
+    if cached is not None and now - cached[0] < DNS_TTL:
+        return cached[1]
+    address = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)[0][4][0]
+    with _dns_lock:
+        _dns_cache[(host, port)] = (now, address)
+    return address
+
+
+def forget(host: str, port: int):
+    """Drops host's cached address, e.g. after a connection to it failed."""
+    with _dns_lock:
+        _dns_cache.pop((host, port), None)
+
+
+def pool_classes() -> dict:
+    """urllib3 connection pool classes per scheme whose new connections
+    resolve their host with resolve and are counted as handshakes_total.
+    """
+    global _pool_classes
+    if _pool_classes is None:
+        from urllib3.connection import HTTPConnection, HTTPSConnection
+        from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+        class Connecting:
+            def _new_conn(self):
+                METRICS.count("handshakes_total")
+                host = self._dns_host
+                # TLS still checks the certificate against self.host
+                self._dns_host = resolve(host, self.port)
+                try:
+                    return super()._new_conn()
+                except Exception:
+                    forget(host, self.port)
+                    raise
+                finally:
+                    self._dns_host = host
+
+        class Connection(Connecting, HTTPConnection):
+            pass
+
+        class SecureConnection(Connecting, HTTPSConnection):
+            pass
+
+        class Pool(HTTPConnectionPool):
+            ConnectionCls = Connection
+
+        class SecurePool(HTTPSConnectionPool):
+            ConnectionCls = SecureConnection
+
+        _pool_classes = {"http": Pool, "https": SecurePool}
+    return _pool_classes
+
+
+def shared_transport() -> "HttpTransport":
+    """The HttpTransport api_get calls go through, opened on first use."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = HttpTransport()
+        return _shared
+
+
+def build_url(
+    endpoint: str, params: dict, base_url: str = BASE_URL
+) -> Tuple[str, Dict[str, str]]:
+    """Resolves a StatsAPI endpoint name and parameters to a URL.
+
+    Mirrors statsapi.get: path parameters are substituted (or defaulted) and
+    everything else becomes a query parameter.
+
+    Args:
+        endpoint (str): StatsAPI endpoint name, e.g. "game" or "schedule".
+        params (dict): Path and query parameters for the endpoint.
+        base_url (str): Root of the API (default: the public StatsAPI).
+
+    Returns:
+        The URL and the query parameters.
+
+    Raises:
+        ValueError: If the endpoint is unknown or a required path parameter
+        is missing.
+    """
+    from statsapi import endpoints
+
+    ep = endpoints.ENDPOINTS.get(endpoint)
+    if ep is None:
+        raise ValueError(f"Invalid endpoint ({endpoint}).")
+    url = base_url + ep["url"][len(endpoints.BASE_URL) :]
+    query = {}
+    for name, value in params.items():
+        if name in ep["path_params"]:
+            path_param = ep["path_params"][name]
+            url = url.replace(
+                "{" + name + "}",
+                ("/" if path_param["leading_slash"] else "")
+                + str(value)
+                + ("/" if path_param["trailing_slash"] else ""),
+            )
+        else:
+            query[name] = str(value)
+    for name, path_param in ep["path_params"].items():
+        placeholder = "{" + name + "}"
+        if placeholder not in url:
+            continue
+        default = path_param.get("default") or ""
+        if default:
+            url = url.replace(
+                placeholder,
+                ("/" if path_param["leading_slash"] else "")
+                + default
+                + ("/" if path_param["trailing_slash"] else ""),
+            )
+        elif path_param.get("required"):
+            raise ValueError(f"Missing required path parameter {{{name}}}")
+        else:
+            url = url.replace(placeholder, "")
+    return url, query
+
+
+class HttpTransport:
+    """StatsAPI client sharing one keep-alive HTTP session between callers.
+
+    get has the same signature as api_get, so a transport's get can be passed
+    anywhere a StatsAPI get function is expected. It is safe to call from
+    several worker threads at once. requests is only imported, and the
+    session only opened, by the first get, so creating a transport is free.
+
+    Connections are kept alive in a pool per host, and new ones look the
+    host up through a DNS cache (see resolve). Responses are requested
+    compressed. Connection errors and 5xx answers are retried RETRIES
+    times with exponential backoff. Every new connection (a TCP and, for
+    https, a TLS handshake) counts towards handshakes_total, and the
+    compressed size of every response is observed as wire_bytes.
+
+    Attributes:
+        base_url (str): Root of the API.
+        timeout (float): Read timeout (seconds) of endpoints not in timeouts.
+        timeouts (dict): Read timeout per endpoint.
+        retries (int): Retries per request.
+        request_count (int): Number of requests sent.
+    """
+
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        timeout: float = REQUEST_TIMEOUT,
+        pool_size: int = POOL_SIZE,
+        timeouts: Dict[str, float] = ENDPOINT_TIMEOUTS,
+        retries: int = RETRIES,
+    ):
+        """Initialize HttpTransport with optional base URL, timeouts, pool
+        size and number of retries.
+        """
+        self.base_url = base_url
+        self.timeout = timeout
+        self.timeouts = dict(timeouts)
+        self.retries = retries
+        self.request_count = 0
+        self.pool_size = pool_size
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> "requests.Session":
+        """The pooled HTTP session, opened on first use."""
+        with self._lock:
+            if self._session is None:
+                import requests
+                from urllib3.util import Retry, make_headers
+
+                session = requests.Session()
+                # whatever this urllib3 can decode: gzip, deflate and br or
+                # zstd when brotli or zstandard are installed
+                session.headers.update(make_headers(accept_encoding=True))
+                retry = Retry(
+                    total=self.retries,
+                    backoff_factor=RETRY_BACKOFF,
+                    status_forcelist=(500, 502, 503, 504),
+                    allowed_methods=frozenset({"GET"}),
+                    raise_on_status=False,
+                )
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=self.pool_size,
+                    pool_maxsize=self.pool_size,
+                    max_retries=retry,
+                )
+                adapter.poolmanager.pool_classes_by_scheme = pool_classes()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    def get(self, endpoint: str, params: dict) -> Union[dict, list]:
+        """Calls a StatsAPI endpoint and returns the decoded JSON."""
+        url, query = build_url(endpoint, params, self.base_url)
+        session = self.session
+        with self._lock:
+            self.request_count += 1
+        METRICS.count("requests_total")
+        timeout = (CONNECT_TIMEOUT, self.timeouts.get(endpoint, self.timeout))
+        with METRICS.timer("fetch_seconds"):
+            r = session.get(url, params=query, timeout=timeout)
+            content = r.content
+        if r.raw.retries is not None and r.raw.retries.history:
+            METRICS.count("retries_total", len(r.raw.retries.history))
+        r.raise_for_status()
+        METRICS.observe("payload_bytes", len(content))
+        METRICS.observe("wire_bytes", r.raw.tell())
+        METRICS.count("wire_bytes_total", r.raw.tell())
+        with METRICS.timer("decode_seconds"):
+            return loads(content)
+
+    def close(self):
+        """Closes the pooled connections."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+def request_key(endpoint: str, params: dict) -> str:
+    """Identifies a request independently of the order of its parameters."""
+    return endpoint + json.dumps(params, sort_keys=True, default=str)
+
+
+class RecordingTransport:
+    """Wraps a StatsAPI get function and writes every response to a capture.
+
+    Each response is stored with its timestamp as a separately compressed
+    record, so a replay can seek to any of them without decompressing the
+    others. The index is written on close; a capture that was never closed
+    (e.g. after a crash) is still readable, ReplayTransport rebuilds the
+    index by scanning the records.
+
+    Attributes:
+        path (str): The capture file.
+        records (int): Number of responses recorded.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        get: Callable[[str, dict], Any] = api_get,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize RecordingTransport with the capture path and the get
+        function whose responses are recorded.
+        """
+        self.path = path
+        self.records = 0
+        self._get = get
+        self._clock = clock
+        self._index: List[list] = []
+        self._lock = threading.Lock()
+        self._file = open(path, "wb")
+        self._file.write(CAPTURE_MAGIC)
+
+    def get(self, endpoint: str, params: dict) -> Union[dict, list]:
+        """Calls the wrapped get function and records its response."""
+        response = self._get(endpoint, params)
+        timestamp = self._clock()
+        blob = zlib.compress(
+            json.dumps(
+                [timestamp, endpoint, params, response],
+                separators=(",", ":"),
+                default=str,
+            ).encode()
+        )
+        with self._lock:
+            self._file.write(_LENGTH.pack(len(blob)))
+            offset = self._file.tell()
+            self._file.write(blob)
+            self._file.flush()
+            self._index.append([timestamp, endpoint, params, offset, len(blob)])
+            self.records += 1
+        return response
+
+    def close(self):
+        """Writes the index and closes the capture."""
+        with self._lock:
+            if self._file.closed:
+                return
+            index = zlib.compress(json.dumps(self._index, default=str).encode())
+            offset = self._file.tell()
+            self._file.write(index + _FOOTER.pack(offset, len(index)) + CAPTURE_MAGIC)
+            self._file.close()
+
+
+class ReplayTransport:
+    """Serves the responses of a capture file, in place of the StatsAPI.
+
+    Replay runs on a virtual clock starting at the first recorded response.
+    At speed 1 it advances in real time, at speed 10 ten times as fast; with
+    speed None every get moves it to the next recorded response, replaying
+    as fast as the caller polls. A request is answered with the latest
+    response recorded for it by the virtual time (or the first one if the
+    clock hasn't got there yet).
+
+    game_diff requests are answered relative to the caller's startTimecode:
+    the recorded diffs from that timecode up to the virtual time are
+    concatenated, so a client polling at a different rate than the one
+    recorded still sees every change exactly once.
+
+    Attributes:
+        path (str): The capture file.
+        speed (float): Replay speed (None: as fast as possible).
+        entries (list): [timestamp, endpoint, params, offset, length] per
+        recorded response, in recording order.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        speed: Union[float, None] = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize ReplayTransport with the capture path and replay speed.
+
+        Raises:
+            ValueError: If the file is not a capture.
+        """
+        self.path = path
+        self.speed = speed
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._file = open(path, "rb")
+        if self._file.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            self._file.close()
+            raise ValueError(f"{path} is not a capture file")
+        self.entries = self._read_index()
+        self._timelines: Dict[str, List[int]] = {}
+        self._diffs: Dict[Any, List[int]] = {}
+        for i, (_, endpoint, params, _, _) in enumerate(self.entries):
+            self._timelines.setdefault(request_key(endpoint, params), []).append(i)
+            if endpoint == "game_diff":
+                self._diffs.setdefault(str(params.get("gamePk")), []).append(i)
+        self._start = None
+        self._step = 0
+
+    def _read_index(self) -> List[list]:
+        size = self._file.seek(0, 2)
+        tail = _FOOTER.size + len(CAPTURE_MAGIC)
+        if size >= len(CAPTURE_MAGIC) + tail:
+            self._file.seek(size - tail)
+            footer = self._file.read(tail)
+            if footer.endswith(CAPTURE_MAGIC):
+                offset, length = _FOOTER.unpack(footer[: _FOOTER.size])
+                self._file.seek(offset)
+                return loads(zlib.decompress(self._file.read(length)))
+        # no index: the recording was interrupted, scan the records
+        entries = []
+        offset = len(CAPTURE_MAGIC)
+        self._file.seek(offset)
+        while True:
+            header = self._file.read(_LENGTH.size)
+            if len(header) < _LENGTH.size:
+                break
+            (length,) = _LENGTH.unpack(header)
+            try:
+                record = loads(zlib.decompress(self._file.read(length)))
+            except (zlib.error, ValueError):
+                break  # truncated last record
+            timestamp, endpoint, params, _ = record
+            entries.append([timestamp, endpoint, params, offset + _LENGTH.size, length])
+            offset += _LENGTH.size + length
+        return entries
+
+    def response(self, i: int) -> Union[dict, list]:
+        """The response recorded in entries[i]."""
+        _, _, _, offset, length = self.entries[i]
+        with self._lock:
+            self._file.seek(offset)
+            blob = self._file.read(length)
+        return loads(zlib.decompress(blob))[3]
+
+    def virtual_time(self) -> float:
+        """The recording time replay has reached."""
+        if not self.entries:
+            return 0.0
+        first = self.entries[0][0]
+        if self.speed is None:
+            return self.entries[min(self._step, len(self.entries) - 1)][0]
+        if self._start is None:
+            return first
+        return first + (self._clock() - self._start) * self.speed
+
+    @property
+    def done(self) -> bool:
+        """Whether replay has reached the last recorded response."""
+        return not self.entries or self.virtual_time() >= self.entries[-1][0]
+
+    def get(self, endpoint: str, params: dict) -> Union[dict, list]:
+        """Answers a StatsAPI request from the capture.
+
+        Raises:
+            LookupError: If no such request was recorded.
+        """
+        if self._start is None:
+            self._start = self._clock()
+        now = self.virtual_time()
+        self._step += 1
+        if endpoint == "game_diff":
+            return self._diff(params, now)
+        return self._latest(endpoint, params, now)
+
+    def _latest(self, endpoint: str, params: dict, now: float) -> Union[dict, list]:
+        timeline = self._timelines.get(request_key(endpoint, params))
+        if not timeline:
+            raise LookupError(f"{endpoint} {params} is not in {self.path}")
+        times = [self.entries[i][0] for i in timeline]
+        pos = max(bisect_right(times, now) - 1, 0)
+        return self.response(timeline[pos])
+
+    def _diff(self, params: dict, now: float) -> Union[dict, list]:
+        gamePk = params.get("gamePk")
+        diffs = self._diffs.get(str(gamePk), [])
+        start = str(params.get("startTimecode"))
+        first = next(
+            (
+                n
+                for n, i in enumerate(diffs)
+                if str(self.entries[i][2].get("startTimecode")) == start
+            ),
+            None,
+        )
+        if first is None:
+            # the caller's timecode was never diffed from, resend the feed
+            return self._latest("game", {"gamePk": gamePk}, now)
+        patches = []
+        for i in diffs[first:]:
+            if self.entries[i][0] > now:
+                break
+            response = self.response(i)
+            if isinstance(response, dict):
+                return response if not patches else patches
+            patches.extend(response)
+        return patches
+
+    def close(self):
+        """Closes the capture."""
+        self._file.close()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+import functools
+from typing import List, Sequence, Tuple
+
+from baseball_live.baseball_live import (
+    PLATE_EDGE,
+    PLATE_HALF_WIDTH,
+    ZONE_EDGE,
+    BaseballPitchData,
+    zone_call,
+)
+
+CALLS = ("Ball", "Strike", "MOE")  # indexed by the codes of classify_codes
+
+
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    """numpy if installed, imported on first use as it's slow to load."""
+    try:
+        import numpy
+    except ImportError:  # optional, vectorizes the batch paths below
+        numpy = None
+    return numpy
+
+
+def classify_codes(pitches: BaseballPitchData) -> Sequence[int]:
+    """Expected call of every pitch as an index into CALLS, see zone_call."""
+    numpy = _numpy()
+    if numpy is not None:
+        pX = numpy.abs(numpy.asarray(pitches.pX))
+        pZ = numpy.asarray(pitches.pZ)
+        top = numpy.asarray(pitches.sz_top)
+        bottom = numpy.asarray(pitches.sz_bottom)
+        x_in = pX <= PLATE_HALF_WIDTH
+        y_in = (pZ >= bottom) & (pZ <= top)
+        near = (pX <= PLATE_EDGE) & (pZ >= bottom - ZONE_EDGE) & (pZ <= top + ZONE_EDGE)
+        return numpy.where(near, numpy.where(x_in & y_in, 1, 2), 0)
+    codes = {call: i for i, call in enumerate(CALLS)}
+    return [
+        codes[zone_call(pX, pZ, top, bottom)]
+        for pX, pZ, top, bottom in zip(
+            pitches.pX, pitches.pZ, pitches.sz_top, pitches.sz_bottom
+        )
+    ]
+
+
+def classify(pitches: BaseballPitchData) -> List[str]:
+    """Expected call of every pitch: 'Strike', 'Ball' or 'MOE'."""
+    return [CALLS[code] for code in classify_codes(pitches)]
+
+
+def density(
+    pitches: BaseballPitchData,
+    rows: int,
+    cols: int,
+    x_range: Tuple[float, float],
+    z_range: Tuple[float, float],
+) -> List[List[int]]:
+    """Counts the pitches falling in each cell of a rows x cols grid.
+
+    Heights are measured in strike zones, 0 at the bottom and 1 at the top
+    of each pitch's batter's zone, so pitches to batters of any size land
+    on the same grid. Pitches outside the grid are left out.
+
+    Args:
+        pitches (BaseballPitchData): The pitches.
+        rows (int): Number of rows.
+        cols (int): Number of columns.
+        x_range (tuple): pX at the left edge of the first column and at the
+        right edge of the last (ft); decreasing for the pitcher's view.
+        z_range (tuple): Zone height at the top edge of the first row and at
+        the bottom edge of the last; decreasing to put high pitches on top.
+
+    Returns:
+        The counts, rows of columns.
+    """
+    x0, x1 = x_range
+    z0, z1 = z_range
+    numpy = _numpy()
+    if numpy is not None:
+        pX = numpy.asarray(pitches.pX)
+        bottom = numpy.asarray(pitches.sz_bottom)
+        height = numpy.asarray(pitches.sz_top) - bottom
+        pZ = numpy.maximum(numpy.asarray(pitches.pZ), 0)
+        col = numpy.floor((pX - x0) / (x1 - x0) * cols).astype(int)
+        row = numpy.floor(((pZ - bottom) / height - z0) / (z1 - z0) * rows).astype(int)
+        inside = (col >= 0) & (col < cols) & (row >= 0) & (row < rows)
+        counts = numpy.bincount(row[inside] * cols + col[inside], minlength=rows * cols)
+        return counts.reshape(rows, cols).tolist()
+    grid = [[0] * cols for _ in range(rows)]
+    xscale = cols / (x1 - x0)
+    zscale = rows / (z1 - z0)
+    for pX, pZ, top, bottom in zip(
+        pitches.pX, pitches.pZ, pitches.sz_top, pitches.sz_bottom
+    ):
+        col = int((pX - x0) * xscale // 1)
+        row = int(((max(pZ, 0) - bottom) / (top - bottom) - z0) * zscale // 1)
+        if 0 <= row < rows and 0 <= col < cols:
+            grid[row][col] += 1
+    return grid
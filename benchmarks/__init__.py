@@ -0,0 +1,4 @@
+"""Benchmarks for the parse → derive → render pipeline.
+
+Run with ``python -m benchmarks.run`` from the repository root.
+"""
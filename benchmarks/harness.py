@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+import contextlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, List, Sequence
+
+from tabulate import tabulate
+
+REGRESSION_THRESHOLD = 0.2  # p50 slowdown flagged as a regression
+NOISE_FLOOR = 5.0  # microseconds, smaller differences are never flagged
+SCREEN_SIZE = (40, 140)  # lines, columns of the off-screen terminal
+
+
+@dataclass
+class StageResult:
+    """Latency and allocation figures of one benchmark stage.
+
+    Latencies are in microseconds per call, allocations in bytes per call.
+
+    Attributes:
+        name (str): The stage.
+        calls (int): Number of timed calls.
+        p50, p90, p99, max (float): Latency percentiles.
+        best_p50 (float): Lowest median of a single pass, the figure runs
+        are compared on since it is the least affected by background load.
+        peak_bytes (float): Mean peak of memory allocated during a call.
+        retained_bytes (float): Mean memory still allocated after a call.
+    """
+
+    name: str
+    calls: int
+    p50: float
+    p90: float
+    p99: float
+    max: float
+    best_p50: float
+    peak_bytes: float
+    retained_bytes: float
+
+
+def percentile(timings: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of sorted timings."""
+    if not timings:
+        return 0.0
+    return timings[min(len(timings) - 1, int(q * len(timings)))]
+
+
+def measure(
+    name: str,
+    func: Callable[[Any], Any],
+    inputs: Sequence[Any],
+    repeat: int = 5,
+) -> StageResult:
+    """Times func over every input, then measures its allocations.
+
+    The first pass over the inputs is a warm-up. Allocations are measured
+    in a separate traced pass so tracing doesn't skew the latencies.
+
+    Args:
+        name (str): The stage.
+        func (callable): Called once per input.
+        inputs (sequence): Arguments for func.
+        repeat (int): Number of timed passes over the inputs.
+    """
+    for item in inputs:
+        func(item)
+    timings = []
+    best_p50 = float("inf")
+    for _ in range(repeat):
+        run = []
+        for item in inputs:
+            start = time.perf_counter_ns()
+            func(item)
+            run.append((time.perf_counter_ns() - start) / 1000)
+        best_p50 = min(best_p50, percentile(sorted(run), 0.5))
+        timings += run
+    timings.sort()
+
+    peaks = retained = 0
+    tracemalloc.start()
+    try:
+        for item in inputs:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            func(item)
+            current, peak = tracemalloc.get_traced_memory()
+            peaks += peak - before
+            retained += current - before
+    finally:
+        tracemalloc.stop()
+    n = max(len(inputs), 1)
+    return StageResult(
+        name,
+        len(timings),
+        percentile(timings, 0.5),
+        percentile(timings, 0.9),
+        percentile(timings, 0.99),
+        timings[-1] if timings else 0.0,
+        best_p50 if timings else 0.0,
+        peaks / n,
+        retained / n,
+    )
+
+
+def save(results: List[StageResult], path: str):
+    """Writes results as a baseline for later runs."""
+    with open(path, "w") as f:
+        json.dump({"stages": [asdict(r) for r in results]}, f, indent=2)
+        f.write("\n")
+
+
+def load(path: str) -> Dict[str, StageResult]:
+    """Reads a baseline written by save."""
+    with open(path) as f:
+        return {s["name"]: StageResult(**s) for s in json.load(f)["stages"]}
+
+
+def regressions(
+    results: List[StageResult],
+    baseline: Dict[str, StageResult],
+    threshold: float = REGRESSION_THRESHOLD,
+) -> List[str]:
+    """Stages whose best median latency got worse than threshold allows."""
+    slower = []
+    for result in results:
+        base = baseline.get(result.name)
+        if base is None:
+            continue
+        if (
+            result.best_p50 > base.best_p50 * (1 + threshold)
+            and result.best_p50 - base.best_p50 > NOISE_FLOOR
+        ):
+            slower.append(result.name)
+    return slower
+
+
+def report(results: List[StageResult], baseline: Dict[str, StageResult] = None) -> str:
+    """Tabulates results, with the best p50 change against baseline if given."""
+    headers = ["stage", "calls", "p50 µs", "p90 µs", "p99 µs", "max µs", "peak KiB"]
+    if baseline:
+        headers.append("best p50 vs base")
+    table = []
+    for r in results:
+        row = [r.name, r.calls, r.p50, r.p90, r.p99, r.max, r.peak_bytes / 1024]
+        if baseline:
+            base = baseline.get(r.name)
+            row.append(
+                f"{r.best_p50 / base.best_p50 - 1:+.0%}"
+                if base and base.best_p50
+                else "new"
+            )
+        table.append(row)
+    return tabulate(table, headers=headers, floatfmt=".1f")
+
+
+@contextlib.contextmanager
+def offscreen(lines: int = SCREEN_SIZE[0], columns: int = SCREEN_SIZE[1]) -> Iterator:
+    """Initializes curses on a terminal whose output goes to /dev/null.
+
+    Yields the standard screen, sized lines x columns, with the same color
+    pairs as the application. Drawing and curses.doupdate run for real, so
+    the render stages pay the actual curses costs.
+    """
+    import curses
+
+    os.environ.update(TERM="xterm-256color", LINES=str(lines), COLUMNS=str(columns))
+    sys.stdout.flush()
+    saved = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    try:
+        stdscr = curses.initscr()
+        try:
+            curses.start_color()
+            curses.use_default_colors()
+            for i in range(0, min(curses.COLORS, curses.COLOR_PAIRS - 1)):
+                curses.init_pair(i + 1, i, -1)
+            yield stdscr
+        finally:
+            try:
+                curses.endwin()
+            except curses.error:
+                pass  # not a real terminal, nothing to restore
+    finally:
+        os.dup2(saved, 1)
+        os.close(saved)
+        os.close(devnull)
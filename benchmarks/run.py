@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""Runs the pipeline benchmarks and compares them against a baseline.
+
+python -m benchmarks.run                      # synthetic game
+python -m benchmarks.run --capture game.cap   # a recorded game
+python -m benchmarks.run --save benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Any, Callable, List, Union
+
+from baseball_live import zone
+from baseball_live.baseball_live import (
+    BaseballLive,
+    BaseballPitchData,
+    BaseballSchedule,
+    BatterStats,
+    LiveSnapshot,
+    PitcherStats,
+    PitchStore,
+    _expected_call,
+    schedule_games,
+)
+from baseball_live.feed import FEED_SUBTREES, select, subtree_tree
+from baseball_live.stream import GameEvents
+from baseball_live.transport import loads
+from benchmarks.harness import (
+    REGRESSION_THRESHOLD,
+    StageResult,
+    load,
+    measure,
+    offscreen,
+    regressions,
+    report,
+    save,
+)
+from benchmarks.workload import (
+    Workload,
+    capture_workload,
+    late_feeds,
+    synthetic_workload,
+)
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+SEASON_PITCHES = 3000  # about a starter's season
+
+
+def derive(gamePk: int, game: dict):
+    live = BaseballLive(gamePk, game=game)
+    return (
+        live.count,
+        live.batter,
+        live.pitcher,
+        live.call,
+        live.pitch_data,
+        live.expected_call,
+        live.atbat_result,
+        live.inning,
+        live.score,
+    )
+
+
+def polling(gamePk: int, games: List[dict]) -> Callable[[dict], Any]:
+    """derive with a PitchStore kept across the documents of a pass."""
+    store = PitchStore()
+
+    def poll(game: dict):
+        nonlocal store
+        if game is games[0]:
+            store = PitchStore()
+        return BaseballLive(gamePk, game=game, store=store).snapshot
+
+    return poll
+
+
+def streaming(gamePk: int, games: List[dict]) -> Callable[[dict], Any]:
+    """GameEvents.update with the reader kept across the documents of a pass."""
+    events = GameEvents(gamePk)
+
+    def update(game: dict):
+        nonlocal events
+        if game is games[0]:
+            events = GameEvents(gamePk)
+        return events.update(game)
+
+    return update
+
+
+def game_pitches(workload: Workload) -> PitchStore:
+    store = PitchStore()
+    for game in workload.games:
+        LiveSnapshot.from_game(workload.gamePk, game, store)
+    return store
+
+
+def season_pitches(store: PitchStore, n: int = SEASON_PITCHES) -> BaseballPitchData:
+    """The game's pitches repeated until there are n of them."""
+    rows = list(range(len(store)))
+    return store.pitches((rows * (n // max(len(rows), 1) + 1))[:n])
+
+
+def pitch_data(play: dict):
+    store = PitchStore()
+    store.add_play(play)
+    store.at_bat(play["about"]["atBatIndex"])
+    calls = [
+        _expected_call(event.get("pitchData"))
+        for event in play["playEvents"]
+        if event.get("isPitch")
+    ]
+    assert None not in calls, "pitch_data timed pitches without a location"
+    return calls
+
+
+def stats_objects(workload: Workload) -> list:
+    stats = []
+    for person in workload.people:
+        groups = {s["group"]["displayName"] for s in person["people"][0]["stats"]}
+        for cls in (BatterStats, PitcherStats):
+            if cls.group in groups:
+                stats.append(cls(person["people"][0]["id"], person=person))
+    return stats
+
+
+def data_stages(workload: Workload, repeat: int) -> List[StageResult]:
+    """Parse and derive stages, no terminal needed."""
+    pk = workload.gamePk
+    plays = workload.games[-1]["liveData"]["plays"]["allPlays"]
+    feeds = late_feeds(workload)
+    tree = subtree_tree(FEED_SUBTREES)
+    results = [
+        measure("decode_feed", json.loads, feeds, repeat),
+        measure(
+            "decode_feed_selected", lambda f: select(loads(f), tree), feeds, repeat
+        ),
+        measure("derive", lambda game: derive(pk, game), workload.games, repeat),
+        measure("derive_polling", polling(pk, workload.games), workload.games, repeat),
+        measure("pitch_data", pitch_data, plays, repeat),
+        measure("stream_events", streaming(pk, workload.games), workload.games, repeat),
+    ]
+    if workload.schedule is not None:
+        schedule = workload.schedule
+        results.append(
+            measure("schedule_parse", schedule_games, [schedule], repeat * 20)
+        )
+        bs = BaseballSchedule(get=lambda endpoint, params: schedule)
+        results.append(
+            measure("games_today", lambda _: bs.games_today(), [None], repeat * 20)
+        )
+        results.append(
+            measure("scoreboard", lambda _: bs.scoreboard(), [None], repeat * 20)
+        )
+    store = game_pitches(workload)
+    game = store.pitches(list(range(len(store))))
+    if game is not None:
+        inputs = [game, season_pitches(store)]
+        results.append(measure("classify", zone.classify, inputs, repeat * 5))
+    stats = stats_objects(workload)
+    if stats:
+        results.append(
+            measure(
+                "stats_table", lambda s: s.stats_table(full=True), stats, repeat * 10
+            )
+        )
+    return results
+
+
+def render_stages(workload: Workload, repeat: int) -> List[StageResult]:
+    """Render stages, drawn on an off-screen terminal."""
+    with offscreen() as stdscr:
+        import curses
+        from baseball_live.baseball_term import (
+            GameDisplay,
+            display_live,
+            display_stats,
+        )
+
+        store = PitchStore()
+        snapshots = [
+            LiveSnapshot.from_game(workload.gamePk, game, store)
+            for game in workload.games
+        ]
+        season = [season_pitches(store)]
+        at_bats = [
+            store.at_bat(play["about"]["atBatIndex"])
+            for play in workload.games[-1]["liveData"]["plays"]["allPlays"]
+        ]
+        at_bats = [pitches for pitches in at_bats if pitches]
+        gd = GameDisplay(stdscr)
+
+        def plot(pitches):
+            gd.zone.win.erase()
+            gd.pitches_plot(pitches)
+
+        def heatmap(pitches):
+            gd.zone.win.erase()
+            gd.pitches_heatmap(pitches)
+
+        def frame(snapshot):
+            display_live(gd, snapshot)
+            curses.doupdate()
+
+        def stats_frame(matchup):
+            # every panel repainted, as after a mode change
+            gd.invalidate()
+            display_stats(gd, *matchup)
+            curses.doupdate()
+
+        results = [
+            measure("pitches_plot", plot, at_bats, repeat),
+            measure("plot_season", plot, season, repeat * 5),
+            measure("heatmap_season", heatmap, season, repeat * 5),
+            measure("display_live", frame, snapshots, repeat),
+        ]
+        stats = stats_objects(workload)
+        batters = [s for s in stats if isinstance(s, BatterStats)]
+        pitchers = [s for s in stats if isinstance(s, PitcherStats)]
+        if batters and pitchers:
+            matchups = [(b, p) for b in batters for p in pitchers]
+            results.append(measure("display_stats", stats_frame, matchups, repeat))
+        return results
+
+
+def parse_args(argv: Union[List[str], None] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="benchmarks.run",
+        description="Benchmark the parse -> derive -> render pipeline.",
+    )
+    parser.add_argument("--capture", help="capture file recorded with --record")
+    parser.add_argument("--repeat", type=int, default=7, help="timed passes")
+    parser.add_argument(
+        "--baseline",
+        default=BASELINE,
+        help="results to compare against (default: benchmarks/baseline.json)",
+    )
+    parser.add_argument("--save", metavar="PATH", help="write results as baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=REGRESSION_THRESHOLD,
+        help="slowdown reported as a regression (default: 0.2)",
+    )
+    parser.add_argument(
+        "--no-render", action="store_true", help="skip the curses stages"
+    )
+    return parser.parse_args(argv)
+
+
+def main(
+    argv: Union[List[str], None] = None, output: Callable[[str], None] = print
+) -> int:
+    args = parse_args(argv)
+    if args.capture:
+        workload = capture_workload(args.capture)
+    else:
+        workload = synthetic_workload()
+    results = data_stages(workload, args.repeat)
+    if not args.no_render:
+        results += render_stages(workload, args.repeat)
+
+    baseline = load(args.baseline) if os.path.exists(args.baseline) else {}
+    output(report(results, baseline))
+    if args.save:
+        save(results, args.save)
+    slower = regressions(results, baseline, args.threshold)
+    if slower:
+        output(f"Regressions: {', '.join(slower)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Measures cold start to first paint of the game selection screen.
+
+    python -m benchmarks.startup
+
+Each run starts a fresh interpreter running baseball_live's main on an
+off-screen terminal, with the schedule cached in a temporary cache
+directory, and ends it once the cached game list is painted. Requests go
+to a proxy that refuses them, so no run waits on the network. The "eager"
+runs import statsapi, arrow, tabulate and requests up front first, as the
+package used to at import time.
+
+The budget applies to the time first paint adds to a bare interpreter
+start, which depends on the Python installation rather than on the package.
+"""
+
+import argparse
+import datetime
+import fcntl
+import os
+import pty
+import struct
+import subprocess
+import sys
+import tempfile
+import termios
+import threading
+import time
+from typing import Callable, List, Union
+
+from tabulate import tabulate
+
+from baseball_live.baseball_live import BaseballSchedule
+from baseball_live.cache import ScheduleCache
+from benchmarks.harness import SCREEN_SIZE, percentile
+from benchmarks.workload import synthetic_schedule
+
+FIRST_PAINT_BUDGET = 0.1  # seconds
+RUNS = 15
+EAGER_IMPORTS = "import statsapi, arrow, tabulate, requests\n"
+FIRST_PAINT = """
+import sys
+from baseball_live import baseball_term
+paint = baseball_term.display_games_today
+def display_games_today(*args):
+    paint(*args)
+    sys.stderr.write("painted\\n")
+    sys.stderr.flush()
+    raise SystemExit
+baseball_term.display_games_today = display_games_today
+sys.argv = ["baseball_live"]
+baseball_term.main()
+"""
+REFUSING_PROXY = "http://127.0.0.1:9"  # the discard port, closed
+
+
+def drain(fd: int):
+    """Reads fd until the other end is closed."""
+    try:
+        while os.read(fd, 65536):
+            pass
+    except OSError:
+        pass  # EIO once the child's side of a pseudo-terminal is closed
+
+
+def time_run(code: str, args: List[str], env: dict) -> float:
+    """Seconds from spawning an interpreter running code on a pseudo-terminal
+    to its first line on stderr.
+    """
+    master, slave = pty.openpty()
+    fcntl.ioctl(slave, termios.TIOCSWINSZ, struct.pack("HHHH", *SCREEN_SIZE, 0, 0))
+    reader = threading.Thread(target=drain, args=(master,), daemon=True)
+    reader.start()
+    start = time.perf_counter()
+    child = subprocess.Popen(
+        [sys.executable, "-c", code] + args,
+        stdin=slave,
+        stdout=slave,
+        stderr=subprocess.PIPE,
+        env=env,
+    )
+    os.close(slave)
+    child.stderr.readline()
+    elapsed = time.perf_counter() - start
+    child.communicate()
+    reader.join()
+    os.close(master)
+    if child.returncode != 0:
+        raise RuntimeError(f"startup run failed with status {child.returncode}")
+    return elapsed
+
+
+def parse_args(argv: Union[List[str], None] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="benchmarks.startup",
+        description="Benchmark cold start to first paint.",
+    )
+    parser.add_argument("--runs", type=int, default=RUNS, help="runs per variant")
+    return parser.parse_args(argv)
+
+
+def main(
+    argv: Union[List[str], None] = None, output: Callable[[str], None] = print
+) -> int:
+    args = parse_args(argv)
+    env = dict(
+        os.environ,
+        TERM="xterm-256color",
+        LINES=str(SCREEN_SIZE[0]),
+        COLUMNS=str(SCREEN_SIZE[1]),
+        PYTHONPATH=os.pathsep.join(p for p in sys.path if p),
+        HTTP_PROXY=REFUSING_PROXY,
+        HTTPS_PROXY=REFUSING_PROXY,
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        env["XDG_CACHE_HOME"] = tmp
+        os.mkdir(os.path.join(tmp, "baseball_live"))
+        path = os.path.join(tmp, "baseball_live", "schedule.json")
+        schedule = synthetic_schedule()
+        # only a schedule of today's games is cached
+        schedule["dates"][0]["date"] = datetime.date.today().isoformat()
+        ScheduleCache(path).save(BaseballSchedule(response=schedule))
+        variants = [
+            ("interpreter", "import sys; sys.stderr.write('\\n')", []),
+            ("first paint", FIRST_PAINT, []),
+            ("first paint, eager imports", EAGER_IMPORTS + FIRST_PAINT, []),
+        ]
+        table = []
+        results = {}
+        for name, code, code_args in variants:
+            timings = sorted(time_run(code, code_args, env) for _ in range(args.runs))
+            results[name] = percentile(timings, 0.5)
+            table.append(
+                [
+                    name,
+                    percentile(timings, 0.5) * 1000,
+                    percentile(timings, 0.9) * 1000,
+                    timings[-1] * 1000,
+                ]
+            )
+    output(tabulate(table, headers=["", "p50 ms", "p90 ms", "max ms"], floatfmt=".1f"))
+    added = results["first paint"] - results["interpreter"]
+    output(
+        f"First paint adds {added * 1000:.0f} ms to interpreter startup, "
+        f"budget {FIRST_PAINT_BUDGET * 1000:.0f} ms"
+    )
+    return 0 if added <= FIRST_PAINT_BUDGET else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
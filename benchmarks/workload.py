@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+import json
+from dataclasses import dataclass, field
+from typing import List, Tuple, Union
+
+from baseball_live.feed import GameFeed
+from baseball_live.transport import ReplayTransport
+from tests.feeds import make_atbat, make_game
+
+SYNTHETIC_PLAYS = 54  # nine innings of six batters
+SYNTHETIC_PITCHES = 4  # per at-bat
+SYNTHETIC_GAMES = 15  # on the schedule
+SYNTHETIC_ROSTER = 26  # players per team
+
+HITTING = {
+    "gamesPlayed": 120,
+    "plateAppearances": 500,
+    "atBats": 450,
+    "runs": 70,
+    "hits": 120,
+    "doubles": 25,
+    "triples": 2,
+    "homeRuns": 20,
+    "rbi": 70,
+    "stolenBases": 5,
+    "caughtStealing": 2,
+    "baseOnBalls": 45,
+    "strikeOuts": 110,
+    "avg": ".267",
+    "obp": ".335",
+    "slg": ".460",
+    "ops": ".795",
+}
+PITCHING = {
+    "wins": 10,
+    "losses": 7,
+    "gamesPlayed": 28,
+    "saves": 0,
+    "inningsPitched": "170.1",
+    "hits": 150,
+    "runs": 70,
+    "earnedRuns": 65,
+    "homeRuns": 18,
+    "baseOnBalls": 50,
+    "strikeOuts": 180,
+    "strikeoutsPer9Inn": "9.51",
+    "hitBatsmen": 6,
+    "era": "3.43",
+    "whip": "1.17",
+    "strikeoutWalkRatio": "3.60",
+    "homeRunsPer9": "0.95",
+}
+
+
+@dataclass
+class Workload:
+    """Recorded responses the benchmark stages run on.
+
+    Attributes:
+        gamePk (int): The game followed.
+        games (list): Successive documents of the game's live feed.
+        schedule (dict): A "schedule" response (None if not recorded).
+        people (list): "person" responses with season stats.
+    """
+
+    gamePk: int
+    games: List[dict]
+    schedule: Union[dict, None] = None
+    people: List[dict] = field(default_factory=list)
+
+
+def synthetic_person(person_id: int, group: str) -> dict:
+    stats = HITTING if group == "hitting" else PITCHING
+    return {
+        "people": [
+            {
+                "id": person_id,
+                "useName": "Player",
+                "lastName": str(person_id),
+                "stats": [
+                    {
+                        "type": {"displayName": "season"},
+                        "group": {"displayName": group},
+                        "splits": [{"season": "2023", "stat": dict(stats)}],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+def synthetic_schedule(n_games: int = SYNTHETIC_GAMES) -> dict:
+    games = [
+        {
+            "gamePk": pk,
+            "gameDate": f"2023-04-01T{17 + pk % 6:02d}:05:00Z",
+            "gameType": "R",
+            "status": {"detailedState": "In Progress"},
+            "teams": {
+                "away": {"team": {"id": 2 * pk, "name": f"Away {pk}"}, "score": 1},
+                "home": {"team": {"id": 2 * pk + 1, "name": f"Home {pk}"}, "score": 2},
+            },
+            "linescore": {"currentInning": 5, "inningState": "Top"},
+        }
+        for pk in range(1, n_games + 1)
+    ]
+    return {"dates": [{"date": "2023-04-01", "games": games}]}
+
+
+def synthetic_roster() -> Tuple[dict, dict]:
+    """gameData.players and liveData.boxscore for two full rosters, the bulk
+    of a real feed next to its plays.
+    """
+    players = {}
+    boxscore = {"teams": {}}
+    for side, first_id in (("away", 100), ("home", 300)):
+        box = {}
+        for person_id in range(first_id, first_id + SYNTHETIC_ROSTER):
+            person = {
+                "id": person_id,
+                "fullName": f"Player {person_id}",
+                "link": f"/api/v1/people/{person_id}",
+                "primaryNumber": str(person_id % 100),
+                "birthDate": "1995-01-01",
+                "height": "6' 2\"",
+                "weight": 210,
+                "primaryPosition": {"code": "1", "abbreviation": "P"},
+                "batSide": {"code": "R", "description": "Right"},
+                "pitchHand": {"code": "R", "description": "Right"},
+            }
+            players[f"ID{person_id}"] = person
+            box[f"ID{person_id}"] = {
+                "person": {"id": person_id, "fullName": person["fullName"]},
+                "stats": {"batting": dict(HITTING), "pitching": dict(PITCHING)},
+                "seasonStats": {"batting": dict(HITTING), "pitching": dict(PITCHING)},
+            }
+        boxscore["teams"][side] = {"players": box}
+    return players, boxscore
+
+
+def synthetic_workload(
+    n_plays: int = SYNTHETIC_PLAYS, pitches_per_play: int = SYNTHETIC_PITCHES
+) -> Workload:
+    """A game fed pitch by pitch, as polling a live game would see it."""
+    games = []
+    done = []
+    for i in range(n_plays):
+        kwargs = dict(
+            inning=i // 6 + 1,
+            half="top" if i % 6 < 3 else "bottom",
+            batter=(100 + i % 9, f"Batter {i % 9}"),
+            pitcher=(200 + i // 27, f"Pitcher {i // 27}"),
+        )
+        for n in range(1, pitches_per_play + 1):
+            event = "Strikeout" if n == pitches_per_play else None
+            play = make_atbat(i, n, event=event, **kwargs)
+            games.append(
+                make_game(
+                    1,
+                    done + [play],
+                    timestamp=f"20230401_{190000 + len(games):06d}",
+                    score=(i // 10, i // 12),
+                )
+            )
+        done = done + [play]
+    players, boxscore = synthetic_roster()
+    for game in games:
+        game["gameData"]["players"] = players
+        game["liveData"]["boxscore"] = boxscore
+    people = [synthetic_person(100, "hitting"), synthetic_person(200, "pitching")]
+    return Workload(1, games, synthetic_schedule(), people)
+
+
+def late_feeds(workload: Workload, n: int = 5) -> List[bytes]:
+    """The last n documents of the game, encoded as downloaded."""
+    return [json.dumps(game).encode() for game in workload.games[-n:]]
+
+
+def capture_workload(path: str) -> Workload:
+    """Rebuilds the documents of the first game recorded in a capture."""
+    replay = ReplayTransport(path, speed=None)
+    try:
+        gamePks = [
+            params["gamePk"]
+            for _, endpoint, params, _, _ in replay.entries
+            if endpoint == "game"
+        ]
+        if not gamePks:
+            raise ValueError(f"{path} has no live feed")
+        schedule = None
+        people = []
+        for i, (_, endpoint, _, _, _) in enumerate(replay.entries):
+            if endpoint == "schedule" and schedule is None:
+                schedule = replay.response(i)
+            elif endpoint == "person":
+                people.append(replay.response(i))
+        feed = GameFeed(gamePks[0], get=replay.get)
+        games = []
+        for _ in replay.entries:
+            feed.update()
+            if not games or feed.timecode != games[-1]["metaData"]["timeStamp"]:
+                games.append(feed.game)
+            if replay.done:
+                break
+        return Workload(gamePks[0], games, schedule, people)
+    finally:
+        replay.close()
@@ -5,7 +5,8 @@ setup(
     version='0.1.0',
     description='A package to visualize live baseball data on the commandline.',
     packages=find_packages(),
-    install_requires=['MLB-StatsAPI', 'arrow', 'tabulate'],
+    install_requires=['MLB-StatsAPI', 'arrow', 'tabulate', 'requests', 'urllib3'],
+    extras_require={'fast': ['orjson'], 'numpy': ['numpy']},
     python_requires='>=3.6',
     entry_points={
         'console_scripts': [
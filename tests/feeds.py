@@ -0,0 +1,327 @@
+"""Synthetic StatsAPI game feeds and a local stand-in that serves them."""
+
+import copy
+import gzip
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SZ_TOP = 3.4
+SZ_BOTTOM = 1.6
+
+SCHEDULE = {
+    "dates": [
+        {
+            "date": "2023-04-01",
+            "games": [
+                {
+                    "gamePk": 1,
+                    "gameDate": "2023-04-01T19:05:00Z",
+                    "gameType": "R",
+                    "status": {"detailedState": "In Progress"},
+                    "teams": {
+                        "away": {"team": {"id": 1, "name": "Away"}, "score": 2},
+                        "home": {"team": {"id": 2, "name": "Home"}, "score": 1},
+                    },
+                }
+            ],
+        }
+    ]
+}
+PERSON = {
+    "people": [
+        {
+            "id": 10,
+            "useName": "Bat",
+            "lastName": "Ter",
+            "stats": [
+                {
+                    "type": {"displayName": "season"},
+                    "group": {"displayName": "hitting"},
+                    "splits": [
+                        {
+                            "season": "2023",
+                            "stat": {
+                                "avg": ".250",
+                                "obp": ".300",
+                                "slg": ".400",
+                                "ops": ".700",
+                            },
+                        }
+                    ],
+                }
+            ],
+        }
+    ]
+}
+
+
+def make_pitch(
+    index,
+    pitch_number,
+    code="FF",
+    speed=95.0,
+    px=0.0,
+    pz=2.5,
+    call="Ball",
+    balls=0,
+    strikes=0,
+    outs=0,
+):
+    return {
+        "index": index,
+        "isPitch": True,
+        "pitchNumber": pitch_number,
+        "count": {"balls": balls, "strikes": strikes, "outs": outs},
+        "details": {
+            "description": call,
+            "type": {"code": code, "description": code},
+        },
+        "pitchData": {
+            "startSpeed": speed,
+            "strikeZoneTop": SZ_TOP,
+            "strikeZoneBottom": SZ_BOTTOM,
+            "coordinates": {"pX": px, "pZ": pz},
+        },
+    }
+
+
+def make_play(
+    at_bat_index,
+    pitches=(),
+    inning=1,
+    half="top",
+    batter=(10, "Bat Ter"),
+    pitcher=(20, "Pitch Er"),
+    event=None,
+):
+    result = {"type": "atBat"}
+    if event is not None:
+        result.update({"event": event, "description": f"Batter {event.lower()}s."})
+    return {
+        "result": result,
+        "about": {
+            "atBatIndex": at_bat_index,
+            "halfInning": half,
+            "isTopInning": half == "top",
+            "inning": inning,
+            "isComplete": event is not None,
+        },
+        "matchup": {
+            "batter": {"id": batter[0], "fullName": batter[1]},
+            "pitcher": {"id": pitcher[0], "fullName": pitcher[1]},
+        },
+        "playEvents": list(pitches),
+    }
+
+
+def make_game(
+    gamePk,
+    plays,
+    timestamp="20230401_190000",
+    state="Live",
+    detailed_state="In Progress",
+    score=(0, 0),
+    inning_state="Top",
+):
+    current = plays[-1] if plays else {}
+    inning = current.get("about", {}).get("inning", 1)
+    half = "Top" if current.get("about", {}).get("isTopInning", True) else "Bottom"
+    return {
+        "gamePk": gamePk,
+        "metaData": {"timeStamp": timestamp},
+        "gameData": {
+            "status": {"abstractGameState": state, "detailedState": detailed_state},
+            "datetime": {"dateTime": "2023-04-01T19:05:00Z"},
+        },
+        "liveData": {
+            "plays": {"allPlays": plays, "currentPlay": current},
+            "linescore": {
+                "currentInning": inning,
+                "inningHalf": half,
+                "inningState": inning_state,
+                "teams": {"away": {"runs": score[0]}, "home": {"runs": score[1]}},
+            },
+        },
+    }
+
+
+def make_atbat(at_bat_index, n_pitches, event=None, **kwargs):
+    """A play with n_pitches pitches spread around the zone."""
+    pitches = []
+    for n in range(n_pitches):
+        pitches.append(
+            make_pitch(
+                n,
+                n + 1,
+                code=("FF", "SL", "CH")[n % 3],
+                speed=90.0 + n,
+                px=-1.0 + 0.4 * n,
+                pz=1.5 + 0.3 * n,
+                balls=min(n, 3),
+                strikes=min(n, 2),
+            )
+        )
+    return make_play(at_bat_index, pitches, event=event, **kwargs)
+
+
+def make_full_game(gamePk, n_plays, pitches_per_play=4):
+    """A game document with n_plays completed at-bats."""
+    plays = [
+        make_atbat(
+            i,
+            pitches_per_play,
+            event="Strikeout",
+            inning=i // 6 + 1,
+            half="top" if i % 6 < 3 else "bottom",
+            batter=(100 + i % 9, f"Batter {i % 9}"),
+            pitcher=(200 + (i // 30), f"Pitcher {i // 30}"),
+        )
+        for i in range(n_plays)
+    ]
+    return make_game(gamePk, plays)
+
+
+def diff(old, new, path=""):
+    """JSON patch operations turning old into new."""
+    if type(old) is not type(new):
+        return [{"op": "replace", "path": path, "value": copy.deepcopy(new)}]
+    if isinstance(old, dict):
+        ops = []
+        for key in old:
+            sub = path + "/" + key.replace("~", "~0").replace("/", "~1")
+            if key not in new:
+                ops.append({"op": "remove", "path": sub})
+            else:
+                ops.extend(diff(old[key], new[key], sub))
+        for key in new:
+            if key not in old:
+                sub = path + "/" + key.replace("~", "~0").replace("/", "~1")
+                ops.append({"op": "add", "path": sub, "value": copy.deepcopy(new[key])})
+        return ops
+    if isinstance(old, list):
+        ops = []
+        for i in range(min(len(old), len(new))):
+            ops.extend(diff(old[i], new[i], f"{path}/{i}"))
+        for i in range(len(old) - 1, len(new) - 1, -1):
+            ops.append({"op": "remove", "path": f"{path}/{i}"})
+        for item in new[len(old) :]:
+            ops.append({"op": "add", "path": f"{path}/-", "value": copy.deepcopy(item)})
+        return ops
+    if old != new:
+        return [{"op": "replace", "path": path, "value": new}]
+    return []
+
+
+class FakeStatsApi:
+    """Serves recorded game snapshots for "game" and patches for "game_diff".
+
+    Attributes:
+        snapshots (list): Game documents in timestamp order.
+        position (int): Index of the snapshot that is "live" right now.
+        calls (list): (endpoint, params) of every request.
+    """
+
+    def __init__(self, snapshots):
+        self.snapshots = snapshots
+        self.position = 0
+        self.calls = []
+        self.full_on_diff = False
+
+    def advance(self, steps=1):
+        self.position = min(self.position + steps, len(self.snapshots) - 1)
+
+    def get(self, endpoint, params):
+        self.calls.append((endpoint, dict(params)))
+        current = self.snapshots[self.position]
+        if endpoint == "game":
+            return copy.deepcopy(current)
+        if endpoint == "game_diff":
+            if self.full_on_diff:
+                return copy.deepcopy(current)
+            start = params["startTimecode"]
+            patches = []
+            previous = None
+            for snapshot in self.snapshots[: self.position + 1]:
+                if previous is not None and previous["metaData"]["timeStamp"] >= start:
+                    patches.append({"diff": diff(previous, snapshot)})
+                previous = snapshot
+            return patches
+        raise ValueError(f"Unknown endpoint {endpoint}")
+
+
+class FakeStatsApiServer:
+    """Local HTTP stand-in for statsapi.mlb.com serving synthetic game feeds.
+
+    Attributes:
+        base_url (str): Pass to HttpTransport as base_url.
+        requests (int): Number of requests served.
+        in_flight (int): Requests being answered right now.
+        max_in_flight (int): Highest number of concurrent requests seen.
+        connections (int): Number of connections accepted.
+        failures (int): Requests still to be answered with a 503.
+    """
+
+    def __init__(self, games, latency=0.0, failures=0):
+        bodies = {pk: json.dumps(game).encode() for pk, game in games.items()}
+        server = self
+        self.requests = 0
+        self.max_in_flight = 0
+        self.connections = 0
+        self.failures = failures
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                try:
+                    time.sleep(latency)
+                    match = re.match(
+                        r"/api/v1.1/game/(\d+)/feed/live(/diffPatch)?", self.path
+                    )
+                    with server._lock:
+                        fail = server.failures > 0
+                        server.failures -= fail
+                    if fail or match is None or int(match.group(1)) not in bodies:
+                        self.send_response(503 if fail else 404)
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    body = b"[]" if match.group(2) else bodies[int(match.group(1))]
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    if "gzip" in self.headers.get("Accept-Encoding", ""):
+                        body = gzip.compress(body)
+                        self.send_header("Content-Encoding", "gzip")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._server.server_port}/api/"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
@@ -1,10 +1,46 @@
-from baseball_live.baseball_live import BaseballLive
+from baseball_live.baseball_live import (
+    BaseballLive,
+    BaseballSchedule,
+    LiveSnapshot,
+    PitchStore,
+    first_pitch_time,
+)
+from baseball_live.transport import RecordingTransport, ReplayTransport
+from tests.feeds import (
+    SCHEDULE,
+    FakeStatsApi,
+    make_atbat,
+    make_full_game,
+    make_game,
+    make_pitch,
+)
+from array import array
+import copy
+import dataclasses
+import os
+import tempfile
 import unittest
 
 
 class TestBaseballLive(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # a capture of a synthetic game, so the tests never reach the StatsAPI
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.tmp.name, "565542.cap")
+        api = FakeStatsApi([make_full_game(565542, 12)])
+        recorder = RecordingTransport(cls.path, api.get)
+        BaseballLive(565542, get=recorder.get)
+        recorder.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
     def setUp(self):
-        self.game = BaseballLive(565542)
+        replay = ReplayTransport(self.path, speed=None)
+        self.addCleanup(replay.close)
+        self.game = BaseballLive(565542, get=replay.get)
 
     def test_get_current_play(self):
         self.assertIsInstance(self.game.current_play, dict)
@@ -34,5 +70,169 @@ class TestBaseballLive(unittest.TestCase):
         self.assertIsInstance(self.game.atbat_result, str)
 
 
+class TestLiveSnapshot(unittest.TestCase):
+    def setUp(self):
+        plays = [make_atbat(0, 4, event="Strikeout"), make_atbat(1, 2)]
+        self.game = BaseballLive(1, game=make_game(1, plays, score=(2, 1)))
+
+    def test_snapshot_fields(self):
+        snapshot = self.game.snapshot
+        self.assertEqual(snapshot.count, {"balls": 1, "strikes": 1, "outs": 0})
+        self.assertEqual(snapshot.batter_id, 10)
+        self.assertEqual(snapshot.pitcher, "Pitch Er")
+        self.assertEqual(snapshot.call, "Ball")
+        self.assertEqual(snapshot.pitch_type["code"], "SL")
+        self.assertEqual(snapshot.inning, "1 Top")
+        self.assertEqual(snapshot.score, (2, 1))
+        self.assertEqual(snapshot.game_state, "Live")
+        self.assertIsNone(snapshot.atbat_result)
+        self.assertEqual(len(snapshot.pitch_data), 2)
+
+    def test_properties_read_snapshot(self):
+        self.assertEqual(self.game.expected_call, self.game.snapshot.expected_call)
+        self.assertIs(self.game.current_play, self.game.snapshot.current_play)
+        self.assertFalse(hasattr(self.game, "game"))
+
+    def test_frozen(self):
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            self.game.snapshot.count = None
+
+    def test_empty_feed(self):
+        snapshot = LiveSnapshot.from_game(1, make_game(1, [], state="Preview"))
+        self.assertIsNone(snapshot.count)
+        self.assertIsNone(snapshot.pitch_data)
+        self.assertEqual(snapshot.game_state, "Preview")
+        self.assertEqual(snapshot.upcoming_batter_ids, ())
+
+    def test_upcoming_batters(self):
+        game = make_game(1, [make_atbat(0, 1)])
+        game["liveData"]["linescore"].update(
+            offense={"batter": {"id": 10}, "onDeck": {"id": 11}, "inHole": {"id": 12}},
+            defense={"batter": {"id": 20}, "onDeck": {"id": 21}},
+        )
+        snapshot = LiveSnapshot.from_game(1, game)
+        self.assertEqual(snapshot.upcoming_batter_ids, (11, 12, 20, 21))
+
+
+class TestPitchStore(unittest.TestCase):
+    def setUp(self):
+        self.store = PitchStore()
+
+    def test_appends_only_new_pitches(self):
+        play = make_atbat(0, 2)
+        self.assertEqual(self.store.add_play(play), 2)
+        play["playEvents"].append(make_pitch(2, 3, code="CU"))
+        self.assertEqual(self.store.add_play(play), 1)
+        self.assertEqual(len(self.store), 3)
+        pitches = self.store.at_bat(0)
+        self.assertIsInstance(pitches.pX, array)
+        self.assertEqual(list(pitches.pitch_type), ["FF", "SL", "CU"])
+
+    def test_skips_events_without_pitch_data(self):
+        play = make_atbat(0, 2)
+        # a pitch without pitchData must not reuse the previous pitch's data
+        del play["playEvents"][1]["pitchData"]
+        play["playEvents"].append({"isPitch": False, "details": {}})
+        self.store.add_play(play)
+        pitches = self.store.at_bat(0)
+        self.assertEqual(len(pitches), 1)
+        self.assertEqual(len(pitches.pitch_type), 1)
+
+    def test_whole_game(self):
+        game = make_full_game(1, 80)
+        for play in game["liveData"]["plays"]["allPlays"]:
+            self.store.add_play(play)
+        self.assertEqual(len(self.store), 320)
+        self.assertEqual(self.store.type_codes, ["FF", "SL", "CH"])
+        self.assertEqual(len(self.store.at_bat(79)), 4)
+        self.assertIsNone(self.store.at_bat(80))
+
+    def test_shared_across_fetches(self):
+        plays = [make_atbat(0, 3)]
+        BaseballLive(1, game=make_game(1, plays), store=self.store)
+        plays[0]["playEvents"].append(make_pitch(3, 4))
+        live = BaseballLive(1, game=make_game(1, plays), store=self.store)
+        self.assertEqual(len(self.store), 4)
+        self.assertEqual(len(live.pitch_data), 4)
+
+    def test_index(self):
+        game = make_full_game(1, 80)
+        self.assertEqual(
+            self.store.add_plays(game["liveData"]["plays"]["allPlays"]), 320
+        )
+        # pitcher 201 faced at-bats 30-59, batter 100 every ninth at-bat
+        self.assertEqual(len(self.store.pitcher(201)), 120)
+        self.assertEqual(len(self.store.batter(100)), 36)
+        self.assertEqual(len(self.store.rows(inning=2)), 24)
+        self.assertEqual(len(self.store.rows(pitcher_id=201, batter_id=100)), 12)
+        self.assertEqual(
+            len(self.store.rows(pitcher_id=200, inning=1, pitch_type="SL")), 6
+        )
+        self.assertEqual(self.store.rows(pitch_type="KN"), [])
+        self.assertEqual(self.store.rows(batter_id=100, until=38), [0, 1, 2, 3, 36, 37])
+        self.assertIsNone(self.store.pitcher(999))
+
+    def test_add_plays_resumes_at_play_in_progress(self):
+        plays = [make_atbat(0, 4, event="Strikeout"), make_atbat(1, 1)]
+        self.store.add_plays(plays)
+        plays[1]["playEvents"].append(make_pitch(1, 2))
+        # a completed play is not read again
+        plays[0]["playEvents"].append(make_pitch(4, 5))
+        self.assertEqual(self.store.add_plays(plays), 1)
+        self.assertEqual(len(self.store.at_bat(1)), 2)
+
+    def test_snapshot_sees_whole_game(self):
+        plays = [make_atbat(0, 3, event="Strikeout"), make_atbat(1, 2)]
+        snapshot = LiveSnapshot.from_game(1, make_game(1, plays), self.store)
+        self.assertEqual(snapshot.pitch_rows, 5)
+        self.assertEqual(len(self.store.pitcher(snapshot.pitcher_id)), 5)
+
+
+class TestBaseballSchedule(unittest.TestCase):
+    def setUp(self):
+        self.requests = []
+
+    def get(self, endpoint, params):
+        self.requests.append((endpoint, params))
+        return SCHEDULE
+
+    def test_check_game_state_reads_schedule(self):
+        state = BaseballSchedule.check_game_state(1, self.get)
+        self.assertEqual(state, "In progress")
+        self.assertEqual(self.requests, [("schedule", {"gamePk": 1})])
+
+    def test_check_game_state_unknown_game(self):
+        with self.assertRaises(LookupError):
+            BaseballSchedule.check_game_state(2, lambda e, p: {"dates": []})
+
+    def test_id_to_game(self):
+        game = BaseballSchedule(get=self.get).id_to_game("1")
+        self.assertEqual(game["game_id"], 1)
+        self.assertEqual(first_pitch_time(game), 1680375900)
+
+    def test_scoreboard(self):
+        schedule = copy.deepcopy(SCHEDULE)
+        games = schedule["dates"][0]["games"]
+        games[0]["linescore"] = {
+            "currentInning": 5,
+            "inningState": "Top",
+            "outs": 2,
+            "defense": {"pitcher": {"id": 20, "fullName": "Pitch Er"}},
+        }
+        preview = copy.deepcopy(games[0])
+        preview.update(gamePk=2, status={"detailedState": "Scheduled"})
+        del preview["linescore"]
+        preview["teams"]["away"]["probablePitcher"] = {"fullName": "Start Er"}
+        games.append(preview)
+        bs = BaseballSchedule(get=lambda endpoint, params: schedule)
+        rows = bs.scoreboard().splitlines()[2:]
+        self.assertEqual(
+            rows[0].split(),
+            ["1", "Away", "2", "Home", "1"]
+            + (["Top", "5,", "2", "out", "Pitch", "Er"]),
+        )
+        self.assertEqual(rows[1].split(), ["2", "Away", "Home", "15:05", "Start", "Er"])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,278 @@
+from baseball_live.baseball_live import LiveSnapshot, PitchStore
+from baseball_live.baseball_term import (
+    BATTER_MODE,
+    LIVE_MODE,
+    PITCHER_MODE,
+    STAT_MODE,
+    UI_UPDATE_INTERVAL,
+    LiveRenderer,
+    Panel,
+    UIEvents,
+    display_live,
+    pitch_history,
+    stats_table,
+    text_lines,
+    watch_game,
+    wrapped_lines,
+)
+from baseball_live.fetcher import AsyncFetcher
+from benchmarks.harness import SCREEN_SIZE, offscreen
+from tests.feeds import make_atbat, make_full_game, make_game
+import asyncio
+import contextlib
+import curses
+import dataclasses
+import os
+import signal
+import sys
+import tempfile
+import time
+import unittest
+
+
+class CursesTestCase(unittest.TestCase):
+    """Runs its tests on an off-screen terminal, see benchmarks.harness."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.screen = contextlib.ExitStack()
+        cls.stdscr = cls.screen.enter_context(offscreen())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.screen.close()
+
+    def setUp(self):
+        curses.resizeterm(*SCREEN_SIZE)
+        self.stdscr.erase()
+        self.repainted = []
+        update = Panel.update
+
+        def counting(panel, key, draw):
+            if update(panel, key, draw):
+                self.repainted.append(panel)
+                return True
+            return False
+
+        Panel.update = counting
+        self.addCleanup(setattr, Panel, "update", update)
+
+    def written(self, frame) -> int:
+        """Bytes frame() writes to the terminal."""
+        with tempfile.TemporaryFile() as output:
+            sys.stdout.flush()
+            saved = os.dup(1)
+            os.dup2(output.fileno(), 1)
+            try:
+                frame()
+            finally:
+                os.dup2(saved, 1)
+                os.close(saved)
+            return output.seek(0, os.SEEK_END)
+
+
+class TestPitchHistory(unittest.TestCase):
+    def setUp(self):
+        self.store = PitchStore()
+        game = make_full_game(1, 40)
+        self.store.add_plays(game["liveData"]["plays"]["allPlays"])
+        plays = [make_atbat(40, 2)]
+        self.snapshot = LiveSnapshot.from_game(1, make_game(1, plays), self.store)
+
+    def test_whole_game(self):
+        # pitcher 201 faced at-bats 30-39, batter 100 every ninth at-bat
+        snapshot = dataclasses.replace(self.snapshot, pitcher_id=201, batter_id=100)
+        pitcher = pitch_history(snapshot, self.store, PITCHER_MODE)
+        self.assertEqual(len(pitcher.pitch_data), 40)
+        batter = pitch_history(snapshot, self.store, BATTER_MODE)
+        self.assertEqual(len(batter.pitch_data), 20)
+
+    def test_without_player(self):
+        # not every pitch of the game, the at-bat's stay on screen
+        for mode, field in ((PITCHER_MODE, "pitcher_id"), (BATTER_MODE, "batter_id")):
+            snapshot = dataclasses.replace(self.snapshot, **{field: None})
+            self.assertIs(pitch_history(snapshot, self.store, mode), snapshot)
+
+
+class TestLiveRenderer(CursesTestCase):
+    def setUp(self):
+        super().setUp()
+        self.renderer = LiveRenderer(self.stdscr)
+        plays = [make_atbat(0, 3, event="Strikeout"), make_atbat(1, 2)]
+        self.snapshot = LiveSnapshot.from_game(1, make_game(1, plays))
+
+    def test_idle_frame(self):
+        render = lambda: self.renderer.render(LIVE_MODE, self.snapshot, delay=5)
+        self.assertGreater(self.written(render), 0)
+        self.repainted.clear()
+        # the same snapshot again repaints nothing and writes nothing
+        self.assertEqual(self.written(render), 0)
+        self.assertEqual(self.repainted, [])
+
+    def test_resize(self):
+        self.renderer.render(LIVE_MODE, self.snapshot)
+        gd = self.renderer.gd
+        zone = gd.zone
+        curses.resizeterm(SCREEN_SIZE[0] + 10, SCREEN_SIZE[1] + 20)
+        self.repainted.clear()
+        self.renderer.render(LIVE_MODE, self.snapshot)
+        self.assertIs(self.renderer.gd, gd)
+        self.assertEqual(gd.dims, (SCREEN_SIZE[0] + 10, SCREEN_SIZE[1] + 20))
+        self.assertIsNot(gd.zone, zone)
+        self.assertGreater(gd.zone.width, zone.width)
+        # every panel with something to show, on the new layout
+        self.assertIn(gd.zone, self.repainted)
+        self.assertEqual(
+            set(self.repainted), {p for p in gd.panels if p.key is not None}
+        )
+
+    def test_layout_kept(self):
+        gd = self.renderer.layout(LIVE_MODE)
+        panels = gd.panels
+        for mode in (LIVE_MODE, LIVE_MODE):
+            self.renderer.render(mode, self.snapshot)
+            self.assertIs(self.renderer.gd, gd)
+            self.assertEqual(gd.panels, panels)
+        # until the terminal is resized
+        curses.resizeterm(SCREEN_SIZE[0] + 10, SCREEN_SIZE[1])
+        self.renderer.render(LIVE_MODE, self.snapshot)
+        self.assertIs(self.renderer.gd, gd)
+        self.assertTrue(all(a is not b for a, b in zip(gd.panels, panels)))
+
+    def test_footer_follows_pitches(self):
+        # the same result is drawn differently with and without pitches
+        result = dataclasses.replace(self.snapshot, atbat_result="Strikeout")
+        gd = self.renderer.layout(LIVE_MODE)
+        display_live(gd, result)
+        self.repainted.clear()
+        display_live(gd, dataclasses.replace(result, pitch_data=None))
+        self.assertIn(gd.footer, self.repainted)
+
+    def test_mode_change(self):
+        self.renderer.render(LIVE_MODE, self.snapshot)
+        gd = self.renderer.gd
+        self.repainted.clear()
+        self.renderer.render(STAT_MODE, self.snapshot)
+        self.assertEqual(set(self.repainted), {gd.status, gd.stats})
+        self.repainted.clear()
+        # back to the live screen, whose panels the stat screen covered
+        self.renderer.render(LIVE_MODE, self.snapshot)
+        self.assertEqual(set(self.repainted), set(gd.panels) - {gd.stats})
+        self.repainted.clear()
+        self.renderer.render(PITCHER_MODE, self.snapshot)
+        self.assertIn(gd.status, self.repainted)
+
+
+class CountingStats:
+    def __init__(self):
+        self.tables = 0
+
+    def stats_table(self, full):
+        self.tables += 1
+        return f"table {full}"
+
+
+class TestTextCache(unittest.TestCase):
+    def test_text_lines(self):
+        lines = text_lines("a\nbcd")
+        self.assertEqual(lines, (("a", "bcd", ""), 3))
+        self.assertIs(text_lines("a\nbcd"), lines)
+
+    def test_wrapped_lines(self):
+        text = "a play description long enough to wrap"
+        lines = wrapped_lines(text, 12)
+        self.assertTrue(all(len(line) <= 12 for line in lines))
+        self.assertIs(wrapped_lines(text, 12), lines)
+        self.assertNotEqual(wrapped_lines(text, 20), lines)
+
+    def test_stats_table(self):
+        stats = CountingStats()
+        self.assertEqual(stats_table(stats, True), "table True")
+        stats_table(stats, True)
+        self.assertEqual(stats.tables, 1)
+        self.assertEqual(stats_table(stats, False), "table False")
+        self.assertEqual(stats.tables, 2)
+        # replaced stats are tabulated again
+        self.assertEqual(stats_table(CountingStats(), True), "table True")
+
+
+class BrokenScheduleCache:
+    def load(self):
+        raise RuntimeError("broken")
+
+
+class TestUIEvents(CursesTestCase):
+    def setUp(self):
+        super().setUp()
+        self.read, self.write = os.pipe()
+        self.addCleanup(os.close, self.read)
+        self.addCleanup(os.close, self.write)
+
+    def run_events(self, test, fd=None):
+        async def run():
+            events = UIEvents()
+            events.attach(self.read if fd is None else fd)
+            try:
+                await test(events)
+            finally:
+                events.detach()
+
+        asyncio.run(asyncio.wait_for(run(), 5))
+
+    def test_new_data(self):
+        async def test(events):
+            asyncio.get_running_loop().call_soon(events.notify)
+            await events.wait()
+            self.assertFalse(events.resized)
+
+        self.run_events(test)
+
+    def test_keypress(self):
+        async def test(events):
+            os.write(self.write, b"q")
+            await events.wait()
+
+        self.run_events(test)
+
+    def test_resize(self):
+        async def test(events):
+            os.kill(os.getpid(), signal.SIGWINCH)
+            await events.wait()
+            self.assertTrue(events.resized)
+
+        self.run_events(test)
+        self.assertEqual(signal.getsignal(signal.SIGWINCH), signal.SIG_DFL)
+
+    def test_polling_fallback(self):
+        # a file can't be watched, the wait times out instead
+        async def test(events):
+            start = time.monotonic()
+            await events.wait()
+            self.assertGreaterEqual(time.monotonic() - start, UI_UPDATE_INTERVAL / 2)
+
+        with tempfile.TemporaryFile() as stdin:
+            self.run_events(test, stdin.fileno())
+
+    def test_detached_when_failing(self):
+        async def run():
+            fetcher = AsyncFetcher()
+            try:
+                with self.assertRaises(RuntimeError):
+                    await watch_game(self.stdscr, fetcher, None, BrokenScheduleCache())
+            finally:
+                fetcher.close()
+            # neither the stdin reader nor the SIGWINCH handler is left
+            loop = asyncio.get_running_loop()
+            self.assertFalse(loop.remove_reader(sys.stdin.fileno()))
+            self.assertEqual(signal.getsignal(signal.SIGWINCH), signal.SIG_DFL)
+
+        saved, sys.stdin = sys.stdin, os.fdopen(os.dup(self.read))
+        try:
+            asyncio.run(run())
+        finally:
+            sys.stdin.close()
+            sys.stdin = saved
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+from benchmarks.harness import StageResult, measure, percentile, regressions
+import unittest
+
+
+def result(name, p50):
+    return StageResult(name, 10, p50, p50, p50, p50, p50, 0, 0)
+
+
+class TestHarness(unittest.TestCase):
+    def test_percentile(self):
+        timings = list(range(1, 101))
+        self.assertEqual(percentile(timings, 0.5), 51)
+        self.assertEqual(percentile(timings, 0.99), 100)
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+    def test_measure(self):
+        stage = measure("sum", lambda n: [0] * n, [10, 1000], repeat=2)
+        self.assertEqual(stage.calls, 4)
+        self.assertLessEqual(stage.best_p50, stage.max)
+        self.assertGreater(stage.peak_bytes, 0)
+
+    def test_regressions(self):
+        baseline = {"a": result("a", 100.0), "b": result("b", 1.0)}
+        results = [result("a", 130.0), result("b", 3.0), result("c", 1000.0)]
+        # b is 3x slower but below the noise floor, c has no baseline
+        self.assertEqual(regressions(results, baseline), ["a"])
+        self.assertEqual(regressions(results, baseline, threshold=0.5), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
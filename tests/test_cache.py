@@ -0,0 +1,264 @@
+from baseball_live.baseball_live import BaseballSchedule, BatterStats, PitcherStats
+from baseball_live.cache import (
+    DISK_CACHE_TTLS,
+    DiskCache,
+    PlayerStatsCache,
+    ScheduleCache,
+    TTLCache,
+)
+from baseball_live.fetcher import AsyncFetcher
+from tests.feeds import SCHEDULE
+import asyncio
+import datetime
+import os
+import tempfile
+import unittest
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeStats:
+    group = "hitting"
+    calls = 0
+
+    def __init__(self, player_id, season=None, get=None):
+        FakeStats.calls += 1
+        self.player_id = player_id
+
+
+class TestTTLCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = TTLCache(ttl=10, maxsize=2, clock=self.clock)
+
+    def test_expiry(self):
+        self.cache.put("a", 1)
+        self.assertTrue(self.cache.is_fresh("a"))
+        self.clock.now = 11
+        self.assertFalse(self.cache.is_fresh("a"))
+        # stale entries are still served
+        self.assertEqual(self.cache.get("a"), 1)
+
+    def test_lru_eviction(self):
+        self.cache.put("a", 1)
+        self.cache.put("b", 2)
+        self.cache.get("a")
+        self.cache.put("c", 3)
+        self.assertIn("a", self.cache)
+        self.assertNotIn("b", self.cache)
+        self.assertEqual(len(self.cache), 2)
+
+
+class TestPlayerStatsCache(unittest.TestCase):
+    def test_coalesces_and_serves_from_memory(self):
+        FakeStats.calls = 0
+
+        async def run():
+            fetcher = AsyncFetcher()
+            cache = PlayerStatsCache(fetcher, ttl=60)
+            try:
+                # many frames before the first fetch completes
+                for _ in range(20):
+                    self.assertIsNone(cache.get(FakeStats, 1))
+                await asyncio.sleep(0.1)
+                for _ in range(20):
+                    stats = cache.get(FakeStats, 1)
+                return stats
+            finally:
+                fetcher.close()
+
+        stats = asyncio.run(run())
+        self.assertEqual(stats.player_id, 1)
+        self.assertEqual(FakeStats.calls, 1)
+
+    def test_preload_rosters(self):
+        calls = []
+
+        def get(endpoint, params):
+            calls.append(endpoint)
+            team_id = params["teamId"]
+            split = [{"stat": {"avg": ".250"}}]
+            return {
+                "roster": [
+                    {
+                        "person": {
+                            "id": team_id * 10 + n,
+                            "lastName": f"Player {n}",
+                            "stats": [
+                                {
+                                    "type": {"displayName": "season"},
+                                    "group": {"displayName": group},
+                                    "splits": split,
+                                }
+                            ],
+                        }
+                    }
+                    for n, group in enumerate(("hitting", "pitching"))
+                ]
+            }
+
+        async def run():
+            fetcher = AsyncFetcher()
+            updates = []
+            cache = PlayerStatsCache(
+                fetcher, ttl=60, on_update=lambda: updates.append(1), get=get
+            )
+            try:
+                cache.preload((1, 2))
+                cache.preload((1, 2))  # already under way
+                await asyncio.sleep(0.1)
+                return (
+                    cache.get(BatterStats, 20),
+                    cache.get(PitcherStats, 11),
+                    cache.get(PitcherStats, 20),
+                    len(updates),
+                )
+            finally:
+                fetcher.close()
+
+        batter, pitcher, missing, updates = asyncio.run(run())
+        self.assertEqual(batter.player_id, 20)
+        self.assertEqual(pitcher.stats["last_name"], "Player 1")
+        self.assertIsNone(missing)
+        self.assertEqual(updates, 2)
+        # one request per team, nothing fetched player by player but the miss
+        self.assertEqual(calls.count("team_roster"), 2)
+        self.assertLessEqual(calls.count("person"), 1)
+
+
+class TestScheduleCache(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.today = datetime.date(2023, 4, 1)
+        self.cache = ScheduleCache(
+            os.path.join(self.dir.name, "cache", "schedule.json"),
+            today=lambda: self.today,
+        )
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_roundtrip(self):
+        self.assertIsNone(self.cache.load())
+        self.cache.save(BaseballSchedule(response=SCHEDULE), "table")
+        schedule, table = self.cache.load()
+        self.assertEqual(table, "table")
+        self.assertEqual(schedule.id_to_gamepk(1), 1)
+
+    def test_only_today(self):
+        self.cache.save(BaseballSchedule(response=SCHEDULE), "table")
+        self.today = datetime.date(2023, 4, 2)
+        self.assertIsNone(self.cache.load())
+
+    def test_only_todays_games(self):
+        self.today = datetime.date(2023, 4, 2)
+        self.cache.save(BaseballSchedule(response=SCHEDULE), "table")
+        self.assertIsNone(self.cache.load())
+
+    def test_corrupt_file(self):
+        self.cache.save(BaseballSchedule(response=SCHEDULE), "table")
+        with open(self.cache.path, "w") as f:
+            f.write("{")
+        self.assertIsNone(self.cache.load())
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "responses.sqlite")
+        self.now = 1000.0
+        self.calls = []
+        self.pending = []
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def get(self, endpoint, params):
+        self.calls.append((endpoint, params))
+        return {"n": len(self.calls)}
+
+    def cache(self, **kwargs):
+        cache = DiskCache(
+            self.path,
+            self.get,
+            clock=lambda: self.now,
+            background=self.pending.append,
+            **kwargs,
+        )
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_read_through(self):
+        cache = self.cache()
+        self.assertEqual(cache.get("person", {"personId": 1}), {"n": 1})
+        self.assertEqual(cache.get("person", {"personId": 1}), {"n": 1})
+        self.assertEqual(cache.get("person", {"personId": 2}), {"n": 2})
+        self.assertEqual(len(self.calls), 2)
+
+    def test_uncached_endpoint(self):
+        cache = self.cache()
+        cache.get("game", {"gamePk": 1})
+        cache.get("game", {"gamePk": 1})
+        self.assertEqual(len(self.calls), 2)
+
+    def test_stale_while_revalidate(self):
+        cache = self.cache(ttls={"schedule": 60}, max_stale={"schedule": 60})
+        cache.get("schedule", {})
+        self.now += 61
+        self.assertEqual(cache.get("schedule", {}), {"n": 1})
+        self.assertEqual(cache.get("schedule", {}), {"n": 1})
+        self.assertEqual(len(self.pending), 1)  # revalidations are coalesced
+        self.pending.pop()()
+        self.assertEqual(cache.get("schedule", {}), {"n": 2})
+
+    def test_max_stale(self):
+        cache = self.cache(ttls={"schedule": 60}, max_stale={"schedule": 60})
+        cache.get("schedule", {})
+        # a day later the response is too old to show, even meanwhile
+        self.now += 24 * 3600
+        self.assertEqual(cache.get("schedule", {}), {"n": 2})
+        self.assertEqual(self.pending, [])
+
+    def test_never_stale_by_default(self):
+        cache = self.cache(ttls={"schedule": 60}, max_stale={})
+        cache.get("schedule", {"sportId": 1})
+        self.now += 60
+        self.assertEqual(cache.get("schedule", {"sportId": 1}), {"n": 2})
+        self.assertEqual(self.pending, [])
+
+    def test_schedules_not_cached(self):
+        # ScheduleCache keeps them, and each scoreboard refresh fetches
+        self.assertNotIn("schedule", DISK_CACHE_TTLS)
+        cache = self.cache()
+        for n in (1, 2, 3):
+            self.assertEqual(cache.get("schedule", {"sportId": 1}), {"n": n})
+
+    def test_shared_between_instances(self):
+        self.cache().get("person", {"personId": 1})
+        self.assertEqual(self.cache().get("person", {"personId": 1}), {"n": 1})
+        self.assertEqual(len(self.calls), 1)
+
+    def test_evicts_least_recently_used(self):
+        cache = self.cache(max_bytes=40)  # two responses
+        for person_id in (1, 2, 1, 3):
+            self.now += 1
+            cache.get("person", {"personId": person_id})
+        cache.get("person", {"personId": 1})
+        cache.get("person", {"personId": 2})
+        self.assertEqual(len(self.calls), 4)
+
+    def test_unusable_database(self):
+        os.mkdir(self.path)
+        cache = self.cache()
+        self.assertEqual(cache.get("person", {"personId": 1}), {"n": 1})
+        self.assertEqual(cache.get("person", {"personId": 1}), {"n": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+from baseball_live.daemon import (
+    DaemonError,
+    DaemonTransport,
+    FanoutServer,
+    check_socket_dir,
+)
+from baseball_live.feed import FEED_SUBTREES, GameFeed, select, subtree_tree
+from tests.feeds import FakeStatsApi, make_atbat, make_game, make_pitch
+import asyncio
+import copy
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+N_VIEWERS = 12
+
+
+def snapshots(n):
+    """n documents of a game, one pitch more in each."""
+    game = make_game(1, [make_atbat(0, 1)])
+    documents = [game]
+    for i in range(1, n):
+        game = copy.deepcopy(game)
+        game["metaData"]["timeStamp"] = f"20230401_19{i:04d}"
+        game["liveData"]["plays"]["allPlays"][0]["playEvents"].append(
+            make_pitch(i, i + 1, strikes=min(i, 2))
+        )
+        documents.append(game)
+    return documents
+
+
+class TestFanoutServer(unittest.TestCase):
+    def setUp(self):
+        self.api = FakeStatsApi(snapshots(4))
+        self.gets = []
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "daemon.sock")
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever)
+        self.thread.start()
+
+        def get(endpoint, params):
+            if endpoint == "schedule":
+                self.gets.append(params)
+                time.sleep(0.05)
+                if "fail" in params:
+                    raise ValueError("bad request")
+                return {"dates": []}
+            return self.api.get(endpoint, params)
+
+        self.server = FanoutServer(self.path, get, base_interval=0.02)
+        self.on_loop(self.server.start())
+        self.viewers = [DaemonTransport(self.path) for _ in range(N_VIEWERS)]
+
+    def tearDown(self):
+        for viewer in self.viewers:
+            viewer.close()
+        self.on_loop(self.server.close())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+        self.tmp.cleanup()
+
+    def on_loop(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(5)
+
+    def expected(self):
+        return select(
+            self.api.snapshots[self.api.position], subtree_tree(FEED_SUBTREES)
+        )
+
+    def test_viewers_share_polls(self):
+        feeds = [GameFeed(1, viewer.get, FEED_SUBTREES) for viewer in self.viewers]
+        for feed in feeds:
+            feed.update()
+            self.assertEqual(feed.game, self.expected())
+        for _ in range(3):
+            self.api.advance()
+            deadline = time.monotonic() + 5
+            for feed in feeds:
+                while feed.game != self.expected() and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                    feed.update()
+                self.assertEqual(feed.game, self.expected())
+                # the changes came as patches, not whole documents
+                self.assertEqual(feed.full_fetches, 1)
+        # one upstream download of the game for all the viewers
+        self.assertEqual([e for e, _ in self.api.calls].count("game"), 1)
+
+    def test_late_viewer_gets_current_state(self):
+        self.viewers[0].get("game", {"gamePk": 1})
+        self.api.advance(3)
+        deadline = time.monotonic() + 5
+        while self.viewers[0].get("game_diff", {"gamePk": 1}) == []:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+        self.assertEqual(self.viewers[1].get("game", {"gamePk": 1}), self.expected())
+
+    def test_requests_are_shared(self):
+        threads = [
+            threading.Thread(target=viewer.get, args=("schedule", {"sportId": 1}))
+            for viewer in self.viewers
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.gets), 1)
+        with self.assertRaises(DaemonError):
+            self.viewers[0].get("schedule", {"fail": 1})
+
+    def test_only_viewer_endpoints(self):
+        for endpoint, params in (
+            ("game", {"gamePk": 1, "fields": "gameData"}),
+            ("team_leaders", {"teamId": 1}),
+        ):
+            with self.assertRaises(DaemonError):
+                self.viewers[0].get(endpoint, params)
+        self.assertEqual(self.api.calls, [])
+
+    def test_private_socket(self):
+        self.assertEqual(os.stat(self.tmp.name).st_mode & 0o077, 0)
+        # a directory others may enter could hold someone else's socket
+        os.chmod(self.tmp.name, 0o755)
+        with self.assertRaises(PermissionError):
+            DaemonTransport(self.path).get("schedule", {"sportId": 1})
+        with self.assertRaises(PermissionError):
+            check_socket_dir(self.path)
+        os.chmod(self.tmp.name, 0o700)
+        path = os.path.join(self.tmp.name, "private", "daemon.sock")
+        check_socket_dir(path, create=True)
+        self.assertEqual(os.stat(os.path.dirname(path)).st_mode & 0o777, 0o700)
+
+    def test_unsubscribed_games_stop(self):
+        self.viewers[0].get("game", {"gamePk": 1})
+        self.assertEqual(list(self.server.channels), [1])
+        self.viewers[0].close()
+        deadline = time.monotonic() + 5
+        while self.server.channels and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.server.channels, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+from baseball_live.dashboard import MultiGameWatcher
+from baseball_live.fetcher import AsyncFetcher
+from baseball_live.transport import HttpTransport
+from tests.feeds import FakeStatsApiServer, make_full_game
+import asyncio
+import time
+import unittest
+
+N_GAMES = 15
+MAX_CONCURRENT = 4
+
+
+class TestMultiGameWatcher(unittest.TestCase):
+    """Load test against a local fake StatsAPI server."""
+
+    def setUp(self):
+        games = {pk: make_full_game(pk, 80) for pk in range(1, N_GAMES + 1)}
+        self.server = FakeStatsApiServer(games, latency=0.02)
+        self.transport = HttpTransport(
+            base_url=self.server.base_url, pool_size=MAX_CONCURRENT
+        )
+
+    def tearDown(self):
+        self.transport.close()
+        self.server.close()
+
+    def test_fifteen_games(self):
+        async def run():
+            fetcher = AsyncFetcher(max_workers=MAX_CONCURRENT)
+            watcher = MultiGameWatcher(
+                {pk: f"Game {pk}" for pk in range(1, N_GAMES + 1)},
+                fetcher,
+                self.transport.get,
+                max_concurrent=MAX_CONCURRENT,
+                focus_interval=0.1,
+                background_interval=0.5,
+            )
+            watcher.start()
+            # a 50 fps frame loop keeps running while requests are answered,
+            # which it couldn't if the polls held up the event loop
+            frames = busy_frames = 0
+            end = time.monotonic() + 2
+            while time.monotonic() < end:
+                await asyncio.sleep(0.02)
+                frames += 1
+                busy_frames += self.server.in_flight > 0
+            await watcher.stop()
+            fetcher.close()
+            return watcher, frames, busy_frames
+
+        watcher, frames, busy_frames = asyncio.run(run())
+        polls = {
+            pk: sum(watch.scheduler.decisions.values())
+            for pk, watch in watcher.watches.items()
+        }
+        self.assertTrue(all(w.snapshot is not None for w in watcher.watches.values()))
+        self.assertLessEqual(self.server.max_in_flight, MAX_CONCURRENT)
+        self.assertGreater(polls[watcher.focus], max(polls[pk] for pk in range(2, 16)))
+        self.assertGreater(busy_frames, frames // 10)
+        # only the focused game keeps a full game document
+        feeds = [w for w in watcher.watches.values() if w.feed is not None]
+        self.assertEqual([w.gamePk for w in feeds], [watcher.focus])
+
+    def test_move_focus(self):
+        async def run():
+            watcher = MultiGameWatcher({1: "a", 2: "b", 3: "c"}, None)
+            watcher.move_focus(-1)
+            return watcher.focus
+
+        self.assertEqual(asyncio.run(run()), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
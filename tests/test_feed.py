@@ -0,0 +1,146 @@
+from baseball_live.feed import (
+    FEED_SUBTREES,
+    GameFeed,
+    PatchError,
+    apply_patch,
+    select,
+    select_patch,
+    subtree_tree,
+)
+from tests.feeds import FakeStatsApi, make_atbat, make_game, make_pitch
+import copy
+import unittest
+
+
+def snapshots():
+    plays = [make_atbat(0, 3, event="Strikeout"), make_atbat(1, 1)]
+    first = make_game(1, plays, timestamp="20230401_190000")
+    second = copy.deepcopy(first)
+    second["metaData"]["timeStamp"] = "20230401_190010"
+    second["liveData"]["plays"]["allPlays"][1]["playEvents"].append(
+        make_pitch(1, 2, code="CU", call="Called Strike", strikes=1)
+    )
+    second["liveData"]["plays"]["currentPlay"] = second["liveData"]["plays"][
+        "allPlays"
+    ][1]
+    third = copy.deepcopy(second)
+    third["metaData"]["timeStamp"] = "20230401_190020"
+    third["liveData"]["linescore"]["teams"]["home"]["runs"] = 1
+    return [first, second, third]
+
+
+class TestApplyPatch(unittest.TestCase):
+    def test_operations(self):
+        doc = {"a": {"b": [1, 2]}, "c": 1}
+        ops = [
+            {"op": "add", "path": "/a/b/-", "value": 3},
+            {"op": "replace", "path": "/c", "value": 2},
+            {"op": "move", "from": "/c", "path": "/d"},
+            {"op": "copy", "from": "/a/b", "path": "/e"},
+            {"op": "remove", "path": "/a/b/0"},
+            {"op": "test", "path": "/d", "value": 2},
+        ]
+        new = apply_patch(doc, ops)
+        self.assertEqual(new, {"a": {"b": [2, 3]}, "d": 2, "e": [1, 2, 3]})
+        # the source document is untouched
+        self.assertEqual(doc, {"a": {"b": [1, 2]}, "c": 1})
+
+    def test_shares_unchanged_subtrees(self):
+        doc = {"big": {"x": list(range(10))}, "small": {"y": 1}}
+        new = apply_patch(doc, [{"op": "replace", "path": "/small/y", "value": 2}])
+        self.assertIs(new["big"], doc["big"])
+
+    def test_bad_path(self):
+        with self.assertRaises(PatchError):
+            apply_patch({"a": []}, [{"op": "replace", "path": "/a/3", "value": 1}])
+
+
+class TestGameFeed(unittest.TestCase):
+    def setUp(self):
+        self.snapshots = snapshots()
+        self.api = FakeStatsApi(self.snapshots)
+        self.feed = GameFeed(1, get=self.api.get)
+
+    def test_incremental_updates(self):
+        self.feed.update()
+        for _ in range(2):
+            self.api.advance()
+            self.assertTrue(self.feed.update())
+            self.assertEqual(self.feed.game, self.snapshots[self.api.position])
+        self.assertEqual(self.feed.full_fetches, 1)
+        self.assertEqual(self.feed.diff_fetches, 2)
+        self.assertEqual(self.api.calls[-1][1]["startTimecode"], "20230401_190010")
+
+    def test_no_change(self):
+        self.feed.update()
+        self.assertFalse(self.feed.update())
+        self.assertEqual(self.feed.full_fetches, 1)
+
+    def test_full_feed_returned_by_diff(self):
+        self.feed.update()
+        self.api.advance(2)
+        self.api.full_on_diff = True
+        self.assertTrue(self.feed.update())
+        self.assertEqual(self.feed.game, self.snapshots[2])
+
+    def test_falls_back_to_full_fetch(self):
+        self.feed.update()
+        # corrupt the local document so the diff no longer applies
+        self.feed.game = copy.deepcopy(self.feed.game)
+        del self.feed.game["liveData"]["plays"]["allPlays"][1]
+        self.api.advance()
+        self.feed.update()
+        self.assertEqual(self.feed.full_fetches, 2)
+        self.assertEqual(self.feed.game, self.snapshots[1])
+
+    def test_poll(self):
+        live = self.feed.poll()
+        self.assertEqual(live.count, {"balls": 0, "strikes": 0, "outs": 0})
+        self.assertEqual(live.score, (0, 0))
+
+
+class TestSelectedFeed(unittest.TestCase):
+    def setUp(self):
+        self.snapshots = snapshots()
+        for n, game in enumerate(self.snapshots):
+            game["gameData"]["players"] = {"ID10": {"fullName": "Bat Ter"}}
+            game["liveData"]["boxscore"] = {"teams": {"home": {"runs": n}}}
+        self.api = FakeStatsApi(self.snapshots)
+        self.feed = GameFeed(1, self.api.get, FEED_SUBTREES)
+        self.tree = subtree_tree(FEED_SUBTREES)
+
+    def test_keeps_only_subtrees(self):
+        self.feed.update()
+        self.assertEqual(set(self.feed.game), {"metaData", "gameData", "liveData"})
+        self.assertEqual(set(self.feed.game["gameData"]), {"status"})
+        self.assertEqual(set(self.feed.game["liveData"]), {"plays", "linescore"})
+
+    def test_patches_skip_dropped_subtrees(self):
+        self.feed.update()
+        for _ in range(2):
+            self.api.advance()
+            self.assertTrue(self.feed.update())
+            expected = select(self.snapshots[self.api.position], self.tree)
+            self.assertEqual(self.feed.game, expected)
+        self.assertEqual(self.feed.full_fetches, 1)
+
+    def test_select_patch(self):
+        ops = [
+            {"op": "add", "path": "/liveData", "value": {"boxscore": 1, "plays": 2}},
+            {"op": "remove", "path": "/gameData/players/ID10"},
+            {"op": "replace", "path": "/metaData/timeStamp", "value": "x"},
+        ]
+        self.assertEqual(
+            select_patch(ops, self.tree),
+            [
+                {"op": "add", "path": "/liveData", "value": {"plays": 2}},
+                {"op": "replace", "path": "/metaData/timeStamp", "value": "x"},
+            ],
+        )
+        with self.assertRaises(PatchError):
+            move = {"op": "move", "from": "/gameData/players", "path": "/metaData/p"}
+            select_patch([move], self.tree)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+from baseball_live.fetcher import AsyncFetcher
+import asyncio
+import threading
+import time
+import unittest
+
+
+class TestAsyncFetcher(unittest.TestCase):
+    def setUp(self):
+        self.fetcher = AsyncFetcher(timeout=0.5)
+
+    def tearDown(self):
+        self.fetcher.close()
+
+    def test_coalesces_same_key(self):
+        calls = []
+
+        def slow(x):
+            calls.append(x)
+            time.sleep(0.05)
+            return x * 2
+
+        async def run():
+            return await asyncio.gather(
+                self.fetcher.fetch("a", slow, 1), self.fetcher.fetch("a", slow, 1)
+            )
+
+        self.assertEqual(asyncio.run(run()), [2, 2])
+        self.assertEqual(calls, [1])
+
+    def test_does_not_block_event_loop(self):
+        release = threading.Event()
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+            release.set()
+
+        async def run():
+            fetch = asyncio.ensure_future(self.fetcher.fetch("a", release.wait, 1))
+            await ticker()
+            return await fetch
+
+        self.assertTrue(asyncio.run(run()))
+        self.assertEqual(len(ticks), 5)
+
+    def test_timeout(self):
+        release = threading.Event()
+
+        async def run():
+            await self.fetcher.fetch("a", release.wait, 2)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(run())
+        release.set()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+from baseball_live.metrics import Metrics, MetricsExporter
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+
+class TestMetrics(unittest.TestCase):
+    def test_disabled_records_nothing(self):
+        metrics = Metrics()
+        with metrics.timer("frame_seconds"):
+            pass
+        metrics.observe("payload_bytes", 100)
+        metrics.count("requests_total")
+        metrics.set("poll_reason", "live")
+        metrics.frame()
+        self.assertEqual(metrics.summary(), {"fps": 0.0})
+        # the same no-op context manager is handed out every time
+        self.assertIs(metrics.timer("a"), metrics.timer("b"))
+
+    def test_summary(self):
+        metrics = Metrics(enabled=True, window=4)
+        for value in range(1, 11):
+            metrics.observe("fetch_seconds", value)
+        metrics.count("requests_total", 2)
+        metrics.set("poll_interval", 5)
+        summary = metrics.summary()
+        fetch = summary["fetch_seconds"]
+        self.assertEqual((fetch["count"], fetch["sum"], fetch["last"]), (10, 55, 10))
+        # percentiles only cover the window
+        self.assertEqual((fetch["p50"], fetch["p95"]), (9, 10))
+        self.assertEqual(summary["requests_total"], 2)
+        self.assertEqual(summary["poll_interval"], 5)
+
+    def test_prometheus(self):
+        metrics = Metrics(enabled=True)
+        metrics.observe("fetch_seconds", 0.5)
+        metrics.count("requests_total")
+        metrics.set("poll_reason", "live")
+        text = metrics.to_prometheus()
+        self.assertIn('baseball_live_fetch_seconds{quantile="0.5"} 0.5\n', text)
+        self.assertIn("# TYPE baseball_live_requests_total counter\n", text)
+        self.assertIn('baseball_live_poll_reason{value="live"} 1\n', text)
+
+
+class TestMetricsExporter(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.metrics = Metrics(enabled=True)
+        self.metrics.count("requests_total")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_ndjson(self):
+        path = os.path.join(self.dir.name, "metrics.ndjson")
+        exporter = MetricsExporter(path, interval=0.01, metrics=self.metrics)
+
+        async def run():
+            task = asyncio.ensure_future(exporter.run())
+            await asyncio.sleep(0.05)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        asyncio.run(run())
+        with open(path) as f:
+            lines = [json.loads(line) for line in f]
+        self.assertGreaterEqual(len(lines), 2)
+        self.assertEqual(lines[-1]["requests_total"], 1)
+
+    def test_prometheus_file(self):
+        path = os.path.join(self.dir.name, "baseball_live.prom")
+        exporter = MetricsExporter(path, metrics=self.metrics)
+        self.assertEqual(exporter.fmt, "prometheus")
+        exporter.write()
+        exporter.write()
+        with open(path) as f:
+            self.assertEqual(f.read().count("requests_total 1"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+from baseball_live.baseball_live import LiveSnapshot
+from baseball_live.scheduler import (
+    BASE_INTERVAL,
+    BREAK_INTERVAL,
+    DELAYED_INTERVAL,
+    IDLE_AFTER,
+    IDLE_INTERVAL,
+    MAX_BACKOFF,
+    PollScheduler,
+)
+from tests.feeds import make_atbat, make_game
+import unittest
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def snapshot(n_pitches=1, **kwargs):
+    return LiveSnapshot.from_game(1, make_game(1, [make_atbat(0, n_pitches)], **kwargs))
+
+
+class TestPollScheduler(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.scheduler = PollScheduler(clock=self.clock, rng=lambda: 1.0)
+
+    def test_live(self):
+        decision = self.scheduler.success(snapshot())
+        self.assertEqual((decision.interval, decision.reason), (BASE_INTERVAL, "live"))
+
+    def test_idle_after_no_new_pitch(self):
+        self.scheduler.success(snapshot())
+        self.clock.now = IDLE_AFTER
+        self.assertEqual(self.scheduler.success(snapshot()).interval, IDLE_INTERVAL)
+        # a new pitch brings the interval back down
+        self.assertEqual(self.scheduler.success(snapshot(2)).interval, BASE_INTERVAL)
+
+    def test_game_states(self):
+        decision = self.scheduler.success(snapshot(inning_state="Middle"))
+        self.assertEqual(decision.interval, BREAK_INTERVAL)
+        decision = self.scheduler.success(snapshot(detailed_state="Delayed: Rain"))
+        self.assertEqual(decision.interval, DELAYED_INTERVAL)
+        decision = self.scheduler.success(snapshot(state="Final"))
+        self.assertTrue(decision.stop)
+
+    def test_backoff(self):
+        intervals = [self.scheduler.failure().interval for _ in range(8)]
+        self.assertEqual(intervals[:3], [5, 10, 20])
+        self.assertEqual(intervals[-1], MAX_BACKOFF)
+        self.scheduler.success(snapshot())
+        self.assertEqual(self.scheduler.errors, 0)
+
+    def test_jitter(self):
+        scheduler = PollScheduler(rng=lambda: 0.0)
+        self.assertEqual(scheduler.failure().interval, BASE_INTERVAL / 2)
+
+    def test_metrics(self):
+        self.scheduler.success(snapshot())
+        self.scheduler.failure()
+        metrics = self.scheduler.metrics()
+        self.assertEqual(metrics["poll_live"], 1)
+        self.assertEqual(metrics["poll_error"], 1)
+        self.assertEqual(metrics["poll_reason"], "error")
+
+
+if __name__ == "__main__":
+    unittest.main()
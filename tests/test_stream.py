@@ -0,0 +1,173 @@
+from baseball_live.feed import GameFeed
+from baseball_live.stream import DROP, EventSink, GameEvents, stream
+from tests.feeds import FakeStatsApi, make_atbat, make_game, make_pitch
+import asyncio
+import copy
+import io
+import json
+import threading
+import unittest
+
+
+def snapshots():
+    """A half inning: a strikeout, a homer on the second pitch, the end."""
+    first = make_game(1, [make_atbat(0, 3, event="Strikeout"), make_atbat(1, 1)])
+    second = copy.deepcopy(first)
+    second["metaData"]["timeStamp"] = "20230401_190010"
+    plays = second["liveData"]["plays"]["allPlays"]
+    plays[1]["playEvents"].append(make_pitch(1, 2, code="CU", call="In play, run(s)"))
+    plays[1]["about"]["isComplete"] = True
+    plays[1]["result"].update(event="Home Run", awayScore=1, homeScore=0)
+    plays.append(make_atbat(2, 0, inning=1, half="bottom"))
+    second["liveData"]["linescore"]["teams"]["away"]["runs"] = 1
+    third = copy.deepcopy(second)
+    third["metaData"]["timeStamp"] = "20230401_190020"
+    third["gameData"]["status"].update(abstractGameState="Final", detailedState="Final")
+    return [first, second, third]
+
+
+class TestGameEvents(unittest.TestCase):
+    def test_each_event_once(self):
+        api = FakeStatsApi(snapshots())
+        feed = GameFeed(1, api.get)
+        events = GameEvents(1)
+        lines = []
+        for _ in range(3):
+            feed.update()
+            lines += events.update(feed.game)
+            # polling again without a change reports nothing new
+            self.assertEqual(events.update(feed.game), [])
+            api.advance()
+        self.assertEqual(
+            [(e["type"], e["id"]) for e in lines],
+            [
+                ("status", "status-Live-In Progress"),
+                ("inning", "inning-1-top"),
+                ("pitch", "pitch-0-0"),
+                ("pitch", "pitch-0-1"),
+                ("pitch", "pitch-0-2"),
+                ("play", "play-0"),
+                ("pitch", "pitch-1-0"),
+                ("pitch", "pitch-1-1"),
+                ("play", "play-1"),
+                ("score", "score-1-0"),
+                ("inning", "inning-1-bottom"),
+                ("status", "status-Final-Final"),
+            ],
+        )
+        self.assertEqual(lines[7]["pitch_type"], "CU")
+        self.assertEqual(lines[2]["expected_call"], "Ball")
+        self.assertEqual(lines[-1]["timecode"], "20230401_190020")
+
+    def test_full_download(self):
+        # a document downloaded again reports only what is new in it
+        first, second, _ = snapshots()
+        events = GameEvents(1)
+        events.update(first)
+        lines = events.update(copy.deepcopy(second))
+        self.assertEqual(
+            [e["id"] for e in lines],
+            ["pitch-1-1", "play-1", "score-1-0", "inning-1-bottom"],
+        )
+
+    def test_pitch_data_arrives_later(self):
+        first, second, _ = snapshots()
+        last_pitch = second["liveData"]["plays"]["allPlays"][1]["playEvents"][1]
+        early = copy.deepcopy(second)
+        del early["liveData"]["plays"]["allPlays"][2]
+        del early["liveData"]["plays"]["allPlays"][1]["playEvents"][1]["pitchData"]
+        events = GameEvents(1)
+        events.update(first)
+        # the pitch and the play result wait for the pitch's location
+        self.assertEqual([e["id"] for e in events.update(early)], ["score-1-0"])
+        lines = events.update(second)
+        self.assertEqual(
+            [e["id"] for e in lines], ["pitch-1-1", "play-1", "inning-1-bottom"]
+        )
+        self.assertEqual(lines[0]["pX"], last_pitch["pitchData"]["coordinates"]["pX"])
+
+    def test_pitch_data_never_arrives(self):
+        first, second, _ = snapshots()
+        del second["liveData"]["plays"]["allPlays"][1]["playEvents"][1]["pitchData"]
+        events = GameEvents(1)
+        events.update(first)
+        # a later play has begun, so the pitch is reported without it
+        lines = events.update(second)
+        self.assertEqual(
+            [e["id"] for e in lines],
+            ["pitch-1-1", "play-1", "score-1-0", "inning-1-bottom"],
+        )
+        self.assertIsNone(lines[0]["pX"])
+
+
+class SlowReader(io.BytesIO):
+    """Output whose writes wait until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def write(self, data):
+        self.release.wait(5)
+        return super().write(data)
+
+
+class TestEventSink(unittest.TestCase):
+    def run_sink(self, policy):
+        out = SlowReader()
+
+        async def run():
+            sink = EventSink(out, policy, max_queue=4)
+            writer = asyncio.ensure_future(sink.run())
+            await asyncio.sleep(0)  # the first event is taken by the writer
+            for n in range(20):
+                put = asyncio.ensure_future(sink.put({"n": n}))
+                await asyncio.sleep(0.001)
+                if not put.done():
+                    out.release.set()  # blocked: let the reader catch up
+                    await put
+            out.release.set()
+            await sink.join()
+            writer.cancel()
+            sink.close()
+            return sink
+
+        sink = asyncio.run(run())
+        return sink, [json.loads(line) for line in out.getvalue().splitlines()]
+
+    def test_block(self):
+        sink, lines = self.run_sink("block")
+        self.assertEqual(sink.dropped, 0)
+        self.assertEqual([line["n"] for line in lines], list(range(20)))
+
+    def test_drop(self):
+        sink, lines = self.run_sink(DROP)
+        self.assertEqual(sink.dropped, 15)
+        # the first event, then a note of the gap and the newest ones
+        self.assertEqual(
+            lines,
+            [{"n": 0}, {"type": "dropped", "events": 15}]
+            + [{"n": n} for n in range(16, 20)],
+        )
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            EventSink(io.BytesIO(), "wait")
+
+
+class TestStream(unittest.TestCase):
+    def test_until_final(self):
+        api = FakeStatsApi(snapshots())
+        api.position = 2
+        out = io.BytesIO()
+        asyncio.run(stream(out, [1], api.get))
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        # joined after the end: the whole game, then its final status
+        self.assertEqual(len(lines), 11)
+        self.assertEqual(lines[0]["id"], "inning-1-top")
+        self.assertEqual(lines[-1]["game_state"], "Final")
+        self.assertEqual([endpoint for endpoint, _ in api.calls], ["game"])
+
+
+if __name__ == "__main__":
+    unittest.main()
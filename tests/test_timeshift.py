@@ -0,0 +1,45 @@
+from baseball_live.timeshift import TimeShiftBuffer
+import unittest
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTimeShiftBuffer(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.buffer = TimeShiftBuffer(max_age=30, maxlen=100, clock=self.clock)
+        for i in range(10):
+            self.clock.now = i * 5
+            self.buffer.push(i)
+
+    def test_delay(self):
+        self.assertEqual(self.buffer.at(0), 9)
+        self.assertEqual(self.buffer.at(5), 8)
+        self.assertEqual(self.buffer.at(12), 6)
+
+    def test_rewind_past_window(self):
+        # only the last max_age seconds (plus one older entry) are kept
+        self.assertEqual(len(self.buffer), 8)
+        self.assertEqual(self.buffer.at(1000), 2)
+
+    def test_next_change(self):
+        self.clock.now = 46
+        self.assertEqual(self.buffer.next_change(10), 4)
+        self.assertIsNone(self.buffer.next_change(0))
+
+    def test_bounded(self):
+        buffer = TimeShiftBuffer(max_age=1000, maxlen=3, clock=self.clock)
+        for i in range(10):
+            buffer.push(i)
+        self.assertEqual(len(buffer), 3)
+        self.assertIsNone(TimeShiftBuffer().at(5))
+
+
+if __name__ == "__main__":
+    unittest.main()
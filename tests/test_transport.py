@@ -0,0 +1,172 @@
+from baseball_live.baseball_live import BaseballLive, BaseballSchedule, BatterStats
+from baseball_live.feed import GameFeed
+from baseball_live.metrics import METRICS
+from baseball_live.transport import (
+    DNS_TTL,
+    ENDPOINT_TIMEOUTS,
+    HttpTransport,
+    RecordingTransport,
+    ReplayTransport,
+    _dns_cache,
+    forget,
+    resolve,
+)
+from tests.feeds import (
+    PERSON,
+    SCHEDULE,
+    FakeStatsApi,
+    FakeStatsApiServer,
+    make_full_game,
+)
+from tests.test_feed import snapshots
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import tempfile
+import unittest
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRecordReplay(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".cap")
+        os.close(fd)
+        self.snapshots = snapshots()
+        self.api = FakeStatsApi(self.snapshots)
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def record_game(self, close=True):
+        """Records a feed polled every 10 seconds while the game advances."""
+        recorder = RecordingTransport(self.path, self.api.get, clock=self.clock)
+        feed = GameFeed(1, get=recorder.get)
+        feed.poll()
+        for _ in range(2):
+            self.clock.now += 10
+            self.api.advance()
+            feed.poll()
+        if close:
+            recorder.close()
+        return recorder
+
+    def test_as_fast_as_possible(self):
+        self.record_game()
+        replay = ReplayTransport(self.path, speed=None)
+        self.assertEqual(len(replay.entries), 3)
+        feed = GameFeed(1, get=replay.get)
+        timecodes = [feed.poll().snapshot.timecode for _ in range(3)]
+        self.assertEqual(
+            timecodes, [s["metaData"]["timeStamp"] for s in self.snapshots]
+        )
+        self.assertEqual(feed.game, self.snapshots[-1])
+        self.assertTrue(replay.done)
+        replay.close()
+
+    def test_speed(self):
+        self.record_game()
+        clock = FakeClock()
+        replay = ReplayTransport(self.path, speed=10, clock=clock)
+        feed = GameFeed(1, get=replay.get)
+        self.assertEqual(feed.poll().snapshot.score, (0, 0))
+        # nothing recorded after the start yet
+        clock.now = 0.5
+        self.assertFalse(feed.update())
+        # 2.5 real seconds are 25 recorded seconds: both diffs at once
+        clock.now = 2.5
+        self.assertEqual(feed.poll().snapshot.score, (0, 1))
+        self.assertEqual(feed.full_fetches, 1)
+        replay.close()
+
+    def test_unclosed_capture(self):
+        recorder = self.record_game(close=False)
+        recorder._file.flush()
+        replay = ReplayTransport(self.path, speed=None)
+        self.assertEqual(len(replay.entries), 3)
+        self.assertEqual(replay.get("game", {"gamePk": 1}), self.snapshots[0])
+        replay.close()
+        recorder.close()
+
+    def test_schedule_and_stats(self):
+        responses = {"schedule": SCHEDULE, "person": PERSON}
+        recorder = RecordingTransport(
+            self.path, lambda endpoint, params: responses[endpoint]
+        )
+        BaseballSchedule(get=recorder.get)
+        BatterStats(10, get=recorder.get)
+        recorder.close()
+
+        replay = ReplayTransport(self.path)
+        schedule = BaseballSchedule(get=replay.get)
+        self.assertEqual(schedule.id_to_gamepk(1), 1)
+        self.assertEqual(schedule.games_in_progress()[0]["away_name"], "Away")
+        stats = BatterStats(10, get=replay.get)
+        self.assertEqual(stats.full_name(), "Bat Ter")
+        self.assertEqual(stats.get_stats()["OPS"], 0.7)
+        with self.assertRaises(LookupError):
+            BaseballLive(1, get=replay.get)
+        replay.close()
+
+
+class TestHttpTransport(unittest.TestCase):
+    def setUp(self):
+        METRICS.reset()
+        METRICS.enabled = True
+        self.game = make_full_game(1, 60)
+        self.server = FakeStatsApiServer({1: self.game}, failures=2)
+        self.transport = HttpTransport(
+            base_url=self.server.base_url.replace("127.0.0.1", "localhost")
+        )
+
+    def tearDown(self):
+        METRICS.enabled = False
+        METRICS.reset()
+        self.transport.close()
+        self.server.close()
+
+    def test_pooled_compressed_retried(self):
+        # the first request is answered with two 503s before the game
+        for _ in range(5):
+            self.assertEqual(self.transport.get("game", {"gamePk": 1}), self.game)
+        summary = METRICS.summary()
+        self.assertEqual(summary["retries_total"], 2)
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(summary["handshakes_total"], 1)
+        self.assertEqual(
+            summary["payload_bytes"]["last"], len(json.dumps(self.game).encode())
+        )
+        self.assertLess(
+            summary["wire_bytes"]["last"], summary["payload_bytes"]["last"] / 5
+        )
+
+    def test_concurrent_requests(self):
+        self.transport.get("game", {"gamePk": 1})  # past the 503s
+        with ThreadPoolExecutor(8) as pool:
+            list(
+                pool.map(lambda _: self.transport.get("game", {"gamePk": 1}), range(40))
+            )
+        self.assertEqual(self.transport.request_count, 41)
+        # each transport has its own timeouts
+        self.transport.timeouts["game"] = 1
+        self.assertNotEqual(ENDPOINT_TIMEOUTS.get("game"), 1)
+
+    def test_dns_cache(self):
+        forget("localhost", 80)
+        self.assertEqual(resolve("localhost", 80, clock=lambda: 0), "127.0.0.1")
+        # looked up again only once DNS_TTL has passed
+        resolve("localhost", 80, clock=lambda: DNS_TTL - 1)
+        self.assertEqual(_dns_cache[("localhost", 80)][0], 0)
+        resolve("localhost", 80, clock=lambda: DNS_TTL)
+        self.assertEqual(_dns_cache[("localhost", 80)][0], DNS_TTL)
+
+
+if __name__ == "__main__":
+    unittest.main()
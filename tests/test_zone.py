@@ -0,0 +1,63 @@
+from baseball_live.baseball_live import BaseballPitchData, zone_call
+from baseball_live import zone
+from array import array
+import unittest
+
+
+def pitches(locations):
+    """Pitches at (pX, pZ) locations, all to a 1.5-3.5 ft strike zone."""
+    n = len(locations)
+    return BaseballPitchData(
+        array("d", [90.0] * n),
+        array("d", [3.5] * n),
+        array("d", [1.5] * n),
+        array("d", [x for x, _ in locations]),
+        array("d", [z for _, z in locations]),
+        ["FF"] * n,
+    )
+
+
+LOCATIONS = [
+    (0.0, 2.5),  # middle
+    (0.8, 2.5),  # off the edge of the plate
+    (0.0, 3.6),  # just above the zone
+    (1.2, 2.5),  # outside
+    (0.0, 0.5),  # in the dirt
+    (-0.7, 1.5),  # bottom corner
+]
+
+
+class TestZone(unittest.TestCase):
+    def test_classify_matches_zone_call(self):
+        expected = [zone_call(x, z, 3.5, 1.5) for x, z in LOCATIONS]
+        self.assertEqual(expected, ["Strike", "MOE", "MOE", "Ball", "Ball", "Strike"])
+        self.assertEqual(zone.classify(pitches(LOCATIONS)), expected)
+
+    def test_density(self):
+        # two columns over the plate, four rows from 1 zone high to -1
+        grid = zone.density(pitches(LOCATIONS), 4, 2, (-1.0, 1.0), (1.0, -1.0))
+        self.assertEqual(grid, [[0, 0], [0, 2], [1, 0], [0, 1]])
+        self.assertEqual(sum(map(sum, grid)), 4)  # above and outside left out
+
+    @unittest.skipUnless(zone._numpy(), "numpy is not installed")
+    def test_pure_python_fallback_agrees(self):
+        # a lattice over and around the zone, edges included
+        lattice = [(x / 20, z / 20) for x in range(-30, 31) for z in range(-10, 91)]
+        data = pitches(LOCATIONS + lattice)
+        vectorized = (
+            list(zone.classify_codes(data)),
+            zone.density(data, 4, 2, (-1.0, 1.0), (1.0, -1.0)),
+        )
+        saved, zone._numpy = zone._numpy, lambda: None
+        try:
+            fallback = (
+                list(zone.classify_codes(data)),
+                zone.density(data, 4, 2, (-1.0, 1.0), (1.0, -1.0)),
+            )
+        finally:
+            zone._numpy = saved
+        self.assertEqual(vectorized, fallback)
+
+
+if __name__ == "__main__":
+    unittest.main()